@@ -0,0 +1,44 @@
+"""Per-row throughput: scalar ``calculate_turning`` vs ``calculate_turning_batch``.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_batch.py [rows]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(0)
+    vc = rng.uniform(50, 300, rows)
+    ap = rng.uniform(0.5, 5, rows)
+    fn = rng.uniform(0.05, 0.5, rows)
+    kc = rng.uniform(1500, 3000, rows)
+    ec = EngineeringCalculator()
+
+    scalar_rows = min(rows, 200_000)
+    vc_l, ap_l, fn_l, kc_l = (a[:scalar_rows].tolist() for a in (vc, ap, fn, kc))
+    start = time.perf_counter()
+    for i in range(scalar_rows):
+        ec.calculate_turning("Net power", vc_l[i], ap_l[i], fn_l[i], kc_l[i])
+    scalar_per_row = (time.perf_counter() - start) / scalar_rows
+
+    start = time.perf_counter()
+    ec.calculate_turning_batch("Net power", {"Vc": vc, "ap": ap, "fn": fn, "kc": kc})
+    batch_per_row = (time.perf_counter() - start) / rows
+
+    print(f"scalar : {scalar_per_row * 1e9:10.1f} ns/row ({scalar_rows} rows)")
+    print(f"batch  : {batch_per_row * 1e9:10.1f} ns/row ({rows} rows)")
+    print(f"speedup: {scalar_per_row / batch_per_row:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Import-time budget for the headless entry points (``python -X importtime``).
+
+Each module is imported in a fresh interpreter; the cumulative import time
+reported by ``-X importtime`` is compared against its budget and the script
+exits non-zero when a budget is exceeded or a GUI/HTTP dependency sneaks in.
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_import_time.py [repeats]
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Milisaniye cinsinden bütçeler (en iyi ölçüm); yavaş CI makineleri için pay bırakıldı
+BUDGETS_MS: Dict[str, float] = {
+    "machining_formulas.core.engineering_calculator": 60.0,
+    "machining_formulas.llm.tool_executor": 80.0,
+    "machining_formulas.cli": 80.0,
+    "machining_formulas.server": 150.0,
+}
+
+# Başsız modüllerin yüklememesi gereken üst düzey paketler
+FORBIDDEN = ("tkinter", "PIL", "requests", "numpy", "machining_formulas.gui")
+
+
+def measure(module: str) -> Tuple[float, Set[str]]:
+    """Cumulative import time of ``module`` in ms and every module it loaded."""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    total_us = 0
+    loaded: Set[str] = set()
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000.0, loaded
+
+
+def forbidden_imports(loaded: Set[str]) -> Set[str]:
+    return {name for name in loaded if any(name == f or name.startswith(f + ".") for f in FORBIDDEN)}
+
+
+def main() -> int:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(repeats)]
+        best = min(ms for ms, _ in runs)
+        leaked = forbidden_imports(runs[0][1])
+        ok = best <= budget and not leaked
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {module}: {best:.1f} ms (budget {budget:.0f} ms)")
+        if leaked:
+            print(f"     forbidden imports: {', '.join(sorted(leaked))}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""BOM mass pricing: scalar ``calculate_material_mass`` vs ``calculate_material_mass_batch``.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_mass_batch.py [rows]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = np.random.default_rng(0)
+    ec = EngineeringCalculator()
+    shapes = rng.choice(["circle", "rectangle", "tube", "hexagon"], rows)
+    materials = rng.choice(list(ec.material_density), rows)
+    columns = {
+        "radius": rng.uniform(5, 50, rows),
+        "width": rng.uniform(10, 100, rows),
+        "height": rng.uniform(5, 50, rows),
+        "outer_radius": rng.uniform(20, 50, rows),
+        "inner_radius": rng.uniform(5, 19, rows),
+        "length": rng.uniform(100, 3000, rows),
+    }
+
+    row_dims = {
+        "circle": ("radius", "length"),
+        "rectangle": ("width", "height", "length"),
+        "tube": ("outer_radius", "inner_radius", "length"),
+        "hexagon": ("width", "length"),
+    }
+    lists = {name: values.tolist() for name, values in columns.items()}
+    start = time.perf_counter()
+    for i in range(rows):
+        shape = str(shapes[i])
+        ec.calculate_material_mass(
+            shape,
+            ec.get_material_density(str(materials[i])),
+            *(lists[name][i] for name in row_dims[shape]),
+        )
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ec.calculate_material_mass_batch(shapes, columns, materials=materials)
+    batch = time.perf_counter() - start
+
+    print(f"rows   : {rows}")
+    print(f"scalar : {scalar * 1e3:10.1f} ms")
+    print(f"batch  : {batch * 1e3:10.1f} ms")
+    print(f"speedup: {scalar / batch:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
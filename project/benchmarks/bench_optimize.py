@@ -0,0 +1,46 @@
+"""Per-operation latency of the feeds-and-speeds optimizer.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_optimize.py [operations]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from machining_formulas.core.optimize import MachineLimits, optimize
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = np.random.default_rng(0)
+    limits = MachineLimits(max_rpm=4000, max_power=11.0, max_torque=150)
+
+    start = time.perf_counter()
+    for _ in range(operations):
+        optimize(
+            "milling",
+            cutting_speed=(80, 350),
+            feed=(0.03, 0.25),
+            fixed={
+                "DCap": float(rng.uniform(8, 63)),
+                "ZEFF": int(rng.integers(2, 8)),
+                "ap": float(rng.uniform(0.5, 6)),
+                "ae": float(rng.uniform(2, 20)),
+                "kc": float(rng.uniform(1500, 3000)),
+            },
+            limits=limits,
+        )
+    elapsed = time.perf_counter() - start
+
+    print(f"operations: {operations}")
+    print(f"total     : {elapsed:8.3f} s")
+    print(f"per op    : {elapsed / operations * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Scaling of the multi-process batch runner with worker count.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_parallel_batch.py [rows] [max_workers]
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import tempfile
+
+from machining_formulas.parallel import run_parallel_batch
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.csv")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write("category,method,Vc,ap,fn,kc\n")
+            for i in range(rows):
+                handle.write(f"turning,Net power,{80 + i % 240},{1 + i % 5},{0.05 + (i % 40) / 100},2100\n")
+
+        workers = 1
+        baseline = None
+        while workers <= max_workers:
+            report = run_parallel_batch(path, io.StringIO(), fmt="csv", workers=workers)
+            baseline = baseline or report.rows_per_second
+            per_worker = sum(report.worker_rows_per_second.values()) / len(report.worker_rows_per_second)
+            print(
+                f"workers={workers:3d}  {report.rows_per_second:12,.0f} rows/s  "
+                f"speedup={report.rows_per_second / baseline:5.2f}x  per-worker={per_worker:10,.0f} rows/s"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-call cost of parameter metadata lookups, before and after the cached index.
+
+"Before" re-implements the pre-index code paths (definitions_map rebuild,
+unit-string splitting, ``__code__`` introspection) so both can be timed
+side by side.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_param_metadata.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Dict, List
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+from machining_formulas.llm.ollama_utils import build_calculator_tools_definition
+
+
+def legacy_get_calculation_params(
+    calc: EngineeringCalculator, category: str, method: str
+) -> List[Dict[str, str]]:
+    definitions_map = {
+        "turning": calc.turning_definitions,
+        "milling": calc.milling_definitions,
+        "drilling": calc.drilling_definitions,
+    }
+    category_definitions = definitions_map[category]
+    param_units_dict = category_definitions[method].get("units", {})
+    out = []
+    for name, unit_description in param_units_dict.items():
+        if name == "result":
+            continue
+        unit = unit_description.split(" ")[0] if unit_description else ""
+        display = calc.PARAM_TURKISH_NAMES.get(name, name.capitalize())
+        out.append({"name": name, "unit": unit, "display_text_turkish": display})
+    return out
+
+
+def legacy_get_shape_parameters(calc: EngineeringCalculator, shape_key: str) -> List[str]:
+    func = calc.shape_definitions[shape_key]
+    names = list(func.__code__.co_varnames[: func.__code__.co_argcount])
+    if shape_key != "sphere" and "length" in names:
+        names.remove("length")
+    return names
+
+
+def _per_call_ns(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    calc = EngineeringCalculator()
+    n = 200_000
+
+    rows = [
+        (
+            "get_calculation_params",
+            lambda: legacy_get_calculation_params(calc, "milling", "Net power"),
+            lambda: calc.get_calculation_params("milling", "Net power"),
+        ),
+        (
+            "get_param_info",
+            lambda: legacy_get_calculation_params(calc, "milling", "Net power"),
+            lambda: calc.get_param_info("milling", "Net power"),
+        ),
+        (
+            "get_shape_parameters",
+            lambda: legacy_get_shape_parameters(calc, "tube"),
+            lambda: calc.get_shape_parameters("tube"),
+        ),
+        (
+            "get_shape_param_names",
+            lambda: legacy_get_shape_parameters(calc, "tube"),
+            lambda: calc.get_shape_param_names("tube"),
+        ),
+    ]
+
+    print(f"{'call':<24}{'before ns':>12}{'after ns':>12}{'speedup':>10}")
+    for name, before, after in rows:
+        b = _per_call_ns(before, n)
+        a = _per_call_ns(after, n)
+        print(f"{name:<24}{b:>12.1f}{a:>12.1f}{b / a:>9.1f}x")
+
+    tools_us = _per_call_ns(lambda: build_calculator_tools_definition(calc), 2_000) / 1000
+    print(f"\nbuild_calculator_tools_definition: {tools_us:.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Small-request throughput of the local calculation server over keep-alive.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_server.py [clients] [requests_per_client]
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import sys
+import threading
+import time
+
+from machining_formulas.server import CalculationServer
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    server = CalculationServer(("127.0.0.1", 0), workers=clients)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    def client(seed: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        for i in range(per_client):
+            job = {"category": "turning", "method": "Cutting speed", "Dm": 50 + (seed + i) % 100, "n": 800}
+            body = json.dumps(job)
+            conn.request("POST", "/calculate", body=body, headers={"Content-Type": "application/json"})
+            conn.getresponse().read()
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", "/metrics")
+    latency = json.loads(conn.getresponse().read())["latency_ms"]["POST /calculate"]
+    server.shutdown()
+    server.server_close()
+
+    total = clients * per_client
+    print(f"requests : {total} ({clients} keep-alive clients)")
+    print(f"rate     : {total / elapsed:10,.0f} req/s")
+    print(f"server   : p50={latency['p50']:.3f} ms  p99={latency['p99']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-round latency of running a model response's tool calls.
+
+Compares :func:`run_tool_calls` (identical calls once, calling thread) with
+running every call and with a thread pool over the distinct calls. Tool
+calls are microsecond-scale, GIL-bound calculations, so the pool only adds
+thread start-up and hand-off overhead.
+
+Run from the ``project/`` directory:
+
+    PYTHONPATH=src python benchmarks/bench_tool_calls.py [calls] [rounds]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from machining_formulas.llm.tool_executor import ToolExecutor, run_tool_calls
+
+
+def _tool_calls(count: int) -> list:
+    # Gerçek yanıtlardaki gibi: bir kısmı aynı çağrının tekrarı
+    return [
+        {
+            "id": f"call-{i}",
+            "function": {
+                "name": "calculate_turning_cutting_speed",
+                "arguments": {"Dm": 10 + i % 20, "n": 1000},
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def _every_call(executor: ToolExecutor, calls: list) -> None:
+    for call in calls:
+        executor.execute(call["function"]["name"], call["function"]["arguments"])
+
+
+def _thread_pool(executor: ToolExecutor, calls: list, workers: int = 8) -> None:
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda c: executor.execute(c["function"]["name"], c["function"]["arguments"]), calls))
+
+
+def _timed(label: str, rounds: int, run) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}: {elapsed / rounds * 1e3:8.3f} ms/round")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    calls = _tool_calls(count)
+    executor = ToolExecutor()
+    executor.calculator.disable_cache()  # araç sonuç önbelleği karşılaştırmayı bozmasın
+
+    print(f"tool calls: {count}, rounds: {rounds}")
+    _timed("run_tool_calls", rounds, lambda: run_tool_calls(calls, executor.execute))
+    _timed("every call", rounds, lambda: _every_call(executor, calls))
+    _timed("thread pool (8)", rounds, lambda: _thread_pool(executor, calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,46 @@
 Run the V3 GUI:
 
     python -m machining_formulas
+    python -m machining_formulas --profile-startup [startup_profile.json] [--exit-after-startup]
+
+Headless calculations (no Tk/PIL/LLM imports, see ``machining_formulas.cli``):
+
+    python -m machining_formulas calc turning "Cutting speed" 100 500
+    python -m machining_formulas batch jobs.jsonl
 """
 
 from __future__ import annotations
 
-from machining_formulas.gui.v3_gui import main
+import sys
+from typing import Optional, Sequence
+
+_GUI_FLAGS = ("--profile-startup", "--exit-after-startup", "--no-llm-cache")
+
+
+def _is_gui_flag(arg: str) -> bool:
+    return arg.split("=", 1)[0] in _GUI_FLAGS
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    from machining_formulas.cli import COMMANDS, main as cli_main
+
+    if argv and (argv[0] in COMMANDS or argv[0].startswith("-")) and not _is_gui_flag(argv[0]):
+        return cli_main(argv)
+
+    # Profil, GUI modüllerinin içe aktarma süresini de kapsasın
+    from machining_formulas.gui.startup_profile import DISABLED, StartupProfiler
+
+    profiling = any(arg.split("=", 1)[0] == "--profile-startup" for arg in argv)
+    profiler = StartupProfiler() if profiling else DISABLED
+
+    # GUI yalnızca gerektiğinde içe aktarılır (tkinter/PIL/requests)
+    with profiler.phase("imports"):
+        from machining_formulas.gui.v3_gui import main as gui_main
+
+    gui_main(argv, profiler=profiler)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""Headless command-line interface.
+
+Runs calculations without Tk, PIL or any LLM module, so it works on compute
+nodes without a display:
+
+    python -m machining_formulas calc turning "Cutting speed" 100 500
+    python -m machining_formulas mass circle --material Çelik 25 200
+    python -m machining_formulas batch jobs.jsonl -o results.jsonl
+    python -m machining_formulas serve --port 8765
+    cat jobs.csv | python -m machining_formulas batch --format csv
+
+Batch jobs are JSON lines or CSV rows with ``category`` (turning, milling,
+drilling or shapes) and ``method`` (calculation key or shape key), plus either
+an ``args`` list (JSON only) or one field per parameter name
+(``Dm``, ``n``, ``radius``, ``length``, ...). Shape jobs also need ``material``
+or ``density``. An optional ``id`` is echoed back. Jobs are read, evaluated
+and written one at a time, so memory use does not grow with the input size;
+failures are reported per job and make the exit status 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+
+COMMANDS = ("calc", "mass", "batch", "serve")
+
+_CALCULATE = {
+    "turning": EngineeringCalculator.calculate_turning,
+    "milling": EngineeringCalculator.calculate_milling,
+    "drilling": EngineeringCalculator.calculate_drilling,
+}
+
+_OUTPUT_FIELDS = ("id", "value", "units", "error")
+# Excel'in CSV dışa aktarımı BOM ekler; sıralı ve paralel yol aynı kodlamayı kullanır
+_INPUT_ENCODING = "utf-8-sig"
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return float(str(value).replace(",", "."))
+
+
+def _job_args(ec: EngineeringCalculator, category: str, method: str, job: Mapping[str, Any]) -> List[float]:
+    if job.get("args") not in (None, ""):
+        args = job["args"]
+        if not isinstance(args, (list, tuple)):
+            raise ValueError("'args' must be a list")
+        return [_number(a) for a in args]
+
+    formula = ec.formulas.get(category, {}).get(method)
+    if formula is None:
+        raise ValueError(f"Invalid {category} calculation: {method}")
+    missing = [p for p in formula.params if job.get(p) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing parameter(s) for {category} calculation {method}: {', '.join(missing)}")
+    return [_number(job[p]) for p in formula.params]
+
+
+def run_job(ec: EngineeringCalculator, job: Mapping[str, Any]) -> Dict[str, Any]:
+    """Evaluate one job mapping and return ``{"value", "units"}``."""
+    category = str(job.get("category") or "").strip()
+    method = str(job.get("method") or "").strip()
+    if not method:
+        raise ValueError("Job has no 'method'")
+
+    if category in ("shapes", "mass"):
+        args = _job_args(ec, "shapes", method, job)
+        if job.get("density") not in (None, ""):
+            density = _number(job["density"])
+        elif job.get("material"):
+            density = ec.get_material_density(str(job["material"]))
+        else:
+            raise ValueError("Shape jobs need 'material' or 'density'")
+        return {"value": ec.calculate_material_mass(method, density, *args), "units": "g"}
+
+    calculate = _CALCULATE.get(category)
+    if calculate is None:
+        raise ValueError(f"Invalid calculation category key: {category}")
+    return calculate(ec, method, *_job_args(ec, category, method, job))
+
+
+def _read_jsonl(
+    stream: Iterable[str], start: int = 1, *, line_id: Callable[[int], Any] = int
+) -> Iterator[Dict[str, Any]]:
+    """Jobs from JSON lines; the default ``id`` is ``line_id(line number)``."""
+    for lineno, line in enumerate(stream, start=start):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield {"id": line_id(lineno), "__error__": f"Invalid JSON: {exc}"}
+            continue
+        if not isinstance(job, dict):
+            yield {"id": line_id(lineno), "__error__": "Job must be a JSON object"}
+            continue
+        if "id" not in job:
+            job["id"] = line_id(lineno)
+        yield job
+
+
+def _read_csv(
+    stream: Iterable[str],
+    fieldnames: Optional[Sequence[str]] = None,
+    start: int = 1,
+    *,
+    line_id: Callable[[int], Any] = int,
+) -> Iterator[Dict[str, Any]]:
+    """Jobs from CSV rows; the default ``id`` is ``line_id(row number)``."""
+    reader = csv.DictReader(stream, fieldnames=fieldnames)
+    for rowno, row in enumerate(reader, start=start):
+        job: Dict[str, Any] = {k.strip(): v.strip() for k, v in row.items() if k and v is not None}
+        if not job.get("id"):
+            job["id"] = line_id(rowno)
+        yield job
+
+
+def iter_results(ec: EngineeringCalculator, jobs: Iterable[Mapping[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Lazily evaluate ``jobs``; errors become ``{"id", "error"}`` records."""
+    for job in jobs:
+        if "__error__" in job:
+            yield {"id": job["id"], "error": job["__error__"]}
+            continue
+        try:
+            result = run_job(ec, job)
+        except (ValueError, TypeError, ArithmeticError) as exc:
+            yield {"id": job.get("id"), "error": str(exc)}
+        else:
+            yield {"id": job.get("id"), "value": result["value"], "units": result["units"]}
+
+
+def _write_results(results: Iterable[Dict[str, Any]], out: TextIO, fmt: str, header: bool = True) -> int:
+    failures = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=_OUTPUT_FIELDS)
+        if header:
+            writer.writeheader()
+        for record in results:
+            failures += "error" in record
+            writer.writerow(record)
+    else:
+        for record in results:
+            failures += "error" in record
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write("\n")
+    return failures
+
+
+def _detect_format(path: Optional[str], requested: str) -> str:
+    if requested != "auto":
+        return requested
+    return "csv" if path and path.lower().endswith(".csv") else "jsonl"
+
+
+def _cmd_calc(ec: EngineeringCalculator, ns: argparse.Namespace, out: TextIO) -> int:
+    result = run_job(ec, {"category": ns.category, "method": ns.method, "args": ns.args})
+    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return 0
+
+
+def _cmd_mass(ec: EngineeringCalculator, ns: argparse.Namespace, out: TextIO) -> int:
+    job = {
+        "category": "shapes",
+        "method": ns.shape,
+        "args": ns.dims,
+        "material": ns.material,
+        "density": ns.density,
+    }
+    out.write(json.dumps(run_job(ec, job), ensure_ascii=False) + "\n")
+    return 0
+
+
+def _cmd_batch(ec: EngineeringCalculator, ns: argparse.Namespace, out: TextIO) -> int:
+    in_path = None if ns.input in (None, "-") else ns.input
+    fmt = _detect_format(in_path, ns.format)
+    out_path = None if ns.output in (None, "-") else ns.output
+    out_fmt = ns.output_format if ns.output_format != "auto" else _detect_format(out_path, "auto")
+
+    if ns.workers != 1:
+        if not in_path:
+            raise ValueError("--workers needs an input file (stdin cannot be sharded)")
+        return _cmd_batch_parallel(ns, in_path, fmt, out_path, out_fmt, out)
+
+    source = open(in_path, encoding=_INPUT_ENCODING, newline="") if in_path else sys.stdin
+    sink = open(out_path, "w", encoding="utf-8", newline="") if out_path else out
+    try:
+        jobs = _read_csv(source) if fmt == "csv" else _read_jsonl(source)
+        failures = _write_results(iter_results(ec, jobs), sink, out_fmt)
+    finally:
+        if in_path:
+            source.close()
+        if out_path:
+            sink.close()
+    return 1 if failures else 0
+
+
+def _cmd_batch_parallel(
+    ns: argparse.Namespace, in_path: str, fmt: str, out_path: Optional[str], out_fmt: str, out: TextIO
+) -> int:
+    from machining_formulas.parallel import BatchProgress, run_parallel_batch
+
+    def report(p: BatchProgress) -> None:
+        print(
+            f"[{p.shards_done}/{p.shards_total}] {p.rows} satır, {p.failures} hata, "
+            f"{p.rows_per_second:,.0f} satır/s",
+            file=sys.stderr,
+        )
+
+    sink = open(out_path, "w", encoding="utf-8", newline="") if out_path else out
+    try:
+        result = run_parallel_batch(
+            in_path,
+            sink,
+            fmt=fmt,
+            out_fmt=out_fmt,
+            workers=ns.workers or None,
+            progress=None if ns.quiet else report,
+        )
+    finally:
+        if out_path:
+            sink.close()
+    if not ns.quiet:
+        per_worker = ", ".join(f"{rate:,.0f}" for rate in result.worker_rows_per_second.values())
+        print(
+            f"{result.rows} satır / {result.elapsed:.2f} s ({result.rows_per_second:,.0f} satır/s, "
+            f"{result.workers} işçi; işçi başına satır/s: {per_worker})",
+            file=sys.stderr,
+        )
+    return 1 if result.failures else 0
+
+
+def _cmd_serve(ec: EngineeringCalculator, ns: argparse.Namespace, out: TextIO) -> int:
+    from machining_formulas.server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WORKERS, serve
+
+    host, port, workers = ns.host or DEFAULT_HOST, ns.port or DEFAULT_PORT, ns.workers or DEFAULT_WORKERS
+    print(f"http://{host}:{port} ({workers} işçi)", file=sys.stderr)
+    serve(host, port, workers=workers, verbose=ns.verbose)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="machining_formulas",
+        description="Machining formulas (headless). Run without arguments to start the GUI.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    calc = sub.add_parser("calc", help="Single turning/milling/drilling calculation")
+    calc.add_argument("category", choices=sorted(_CALCULATE))
+    calc.add_argument("method", help='Calculation key, e.g. "Cutting speed"')
+    calc.add_argument("args", nargs="*", type=float, help="Parameters in definition order")
+
+    mass = sub.add_parser("mass", help="Material mass of a shape (g)")
+    mass.add_argument("shape", help="Shape key, e.g. circle, tube")
+    group = mass.add_mutually_exclusive_group(required=True)
+    group.add_argument("--material", help="Material name from the density table")
+    group.add_argument("--density", type=float, help="Density in g/cm³")
+    mass.add_argument("dims", nargs="*", type=float, help="Dimensions in mm, in definition order")
+
+    batch = sub.add_parser("batch", help="Stream JSON-lines/CSV jobs")
+    batch.add_argument("input", nargs="?", default="-", help="Job file (default: stdin)")
+    batch.add_argument("-o", "--output", default="-", help="Result file (default: stdout)")
+    batch.add_argument("--format", choices=("auto", "jsonl", "csv"), default="auto", help="Input format")
+    batch.add_argument("--output-format", choices=("auto", "jsonl", "csv"), default="auto")
+    batch.add_argument(
+        "-j", "--workers", type=int, default=1, help="Worker processes for file input (0 = all cores)"
+    )
+    batch.add_argument("-q", "--quiet", action="store_true", help="No progress output on stderr")
+
+    serve = sub.add_parser("serve", help="Local HTTP/JSON calculation server")
+    serve.add_argument("--host", help="Bind address (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, help="Port (default: 8765)")
+    serve.add_argument("--workers", type=int, help="Connection worker threads (default: 16)")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, out: Optional[TextIO] = None) -> int:
+    parser = build_parser()
+    ns, extra = parser.parse_known_args(argv)
+    # "mass circle --material Çelik 25 200": seçenekten sonra gelen boyutlar
+    if extra and ns.command == "mass":
+        try:
+            ns.dims = [*ns.dims, *(float(value) for value in extra)]
+        except ValueError:
+            parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    out = out or sys.stdout
+    ec = EngineeringCalculator()
+    handler = {"calc": _cmd_calc, "mass": _cmd_mass, "batch": _cmd_batch, "serve": _cmd_serve}[ns.command]
+    try:
+        return handler(ec, ns, out)
+    except (ValueError, TypeError, ArithmeticError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        out.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
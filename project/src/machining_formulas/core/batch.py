@@ -0,0 +1,199 @@
+"""Vectorized batch evaluation of the machining formulas.
+
+The scalar ``EngineeringCalculator.calculate_*`` methods return one
+``{"value", "units"}`` dict per call. The helpers here evaluate the very same
+formula callables on NumPy arrays instead, so a whole column of operations is
+computed with one Python call.
+
+NumPy is an optional dependency (``pip install machining-formulas[numeric]``)
+and is only imported by this module; the scalar calculator stays stdlib-only.
+
+Example::
+
+    values, unit = ec.calculate_turning_batch(
+        "Metal removal rate", {"Vc": vc_col, "ap": ap_col, "fn": fn_col}
+    )
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from machining_formulas.core.formulas import FORMULA_REGISTRY, MATERIAL_DENSITY, Formula
+
+
+def _is_column_mapping(obj: Any) -> bool:
+    """Mapping-like containers (dict, DataFrame, structured rows) are treated as columns."""
+    return isinstance(obj, Mapping) or (hasattr(obj, "keys") and hasattr(obj, "__getitem__"))
+
+
+def _collect_arrays(
+    category: str,
+    definition: str,
+    param_names: Sequence[str],
+    args: Sequence[Any],
+    columns: Mapping[str, Any],
+) -> List[np.ndarray]:
+    """Resolve positional arrays or named columns into float arrays in parameter order."""
+    if len(args) == 1 and not columns and _is_column_mapping(args[0]):
+        columns, args = args[0], ()
+
+    if args and columns:
+        raise ValueError(
+            f"Incorrect arguments for {category} calculation {definition}: "
+            "pass either positional arrays or named columns, not both"
+        )
+
+    if columns:
+        missing = [name for name in param_names if name not in columns]
+        if missing:
+            raise ValueError(
+                f"Incorrect arguments for {category} calculation {definition}: "
+                f"missing column(s) {', '.join(missing)}"
+            )
+        raw = [columns[name] for name in param_names]
+    else:
+        if len(args) != len(param_names):
+            raise ValueError(
+                f"Incorrect arguments for {category} calculation {definition}: "
+                f"expected {len(param_names)} arrays ({', '.join(param_names)}), got {len(args)}"
+            )
+        raw = list(args)
+
+    try:
+        arrays = [np.asarray(value, dtype=float) for value in raw]
+        return list(np.broadcast_arrays(*arrays))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(
+            f"Incorrect arguments for {category} calculation {definition}: {exc}"
+        ) from exc
+
+
+def evaluate_formula_batch(
+    formula: Formula,
+    args: Sequence[Any],
+    columns: Mapping[str, Any],
+) -> Tuple[np.ndarray, str]:
+    """Broadcast the inputs and run ``formula`` once as array math.
+
+    Division by zero yields ``inf``/``nan`` for the affected rows instead of
+    aborting the whole batch.
+    """
+    arrays = _collect_arrays(formula.category, formula.key, formula.params, args, columns)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.asarray(formula.func(*arrays), dtype=float)
+    if arrays and values.shape != arrays[0].shape:
+        values = np.broadcast_to(values, arrays[0].shape).copy()
+    return values, formula.result_unit
+
+
+@dataclass(frozen=True)
+class MassBatchResult:
+    """Per-row volumes, densities and masses plus per-material mass totals."""
+
+    volume: np.ndarray  # mm³
+    density: np.ndarray  # g/cm³
+    mass: np.ndarray  # g
+    totals: Dict[str, float]  # g, keyed by material name
+
+
+def _group_indices(keys: Sequence[Any]) -> Tuple[List[str], np.ndarray, List[np.ndarray]]:
+    """Factorize string keys: unique names, per-row codes and each group's row indices.
+
+    Hash-based (first-seen order) rather than ``np.unique``, which would sort
+    the strings.
+    """
+    labels = keys.tolist() if isinstance(keys, np.ndarray) else list(keys)
+    codes_by_name: Dict[str, int] = {}
+    codes = np.fromiter(
+        (codes_by_name.setdefault(str(label), len(codes_by_name)) for label in labels),
+        dtype=np.intp,
+        count=len(labels),
+    )
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes, minlength=len(codes_by_name)))[:-1]
+    return list(codes_by_name), codes, np.split(order, bounds)
+
+
+def _resolve_densities(
+    rows: int,
+    materials: Optional[Sequence[str]],
+    densities: Optional[Any],
+    density_table: Mapping[str, float],
+) -> Tuple[np.ndarray, Optional[List[str]], Optional[np.ndarray]]:
+    """Row densities: explicit ``densities`` win, ``materials`` fill the rest."""
+    if materials is None and densities is None:
+        raise ValueError("Either materials or densities must be given")
+
+    density = np.full(rows, np.nan)
+    if densities is not None:
+        density = np.broadcast_to(np.asarray(densities, dtype=float), (rows,)).copy()
+
+    if materials is None:
+        return density, None, None
+
+    unique, inverse, groups = _group_indices(np.ravel(materials))
+    if inverse.size != rows:
+        raise ValueError(f"Expected {rows} material names, got {inverse.size}")
+    table = np.empty(len(unique))
+    for i, (name, idx) in enumerate(zip(unique, groups)):
+        needed = np.isnan(density[idx]).any()
+        if name in density_table:
+            table[i] = density_table[name]
+        elif needed:
+            raise ValueError(f"Unknown material: {name}")
+        else:
+            table[i] = np.nan
+    density = np.where(np.isnan(density), table[inverse], density)
+    return density, unique, inverse
+
+
+def evaluate_mass_batch(
+    shapes: Sequence[str],
+    columns: Mapping[str, Any],
+    *,
+    materials: Optional[Sequence[str]] = None,
+    densities: Optional[Any] = None,
+    density_table: Mapping[str, float] = MATERIAL_DENSITY,
+) -> MassBatchResult:
+    """Vectorized ``calculate_material_mass`` for bills of materials.
+
+    ``shapes`` holds one shape key per row; ``columns`` maps dimension names
+    (``radius``, ``width``, ``length``, ...) to per-row arrays. Rows are
+    grouped by shape and each group's volume formula runs once as array math,
+    so columns a shape does not use may hold anything (e.g. ``nan``).
+    """
+    unique, _, groups = _group_indices(np.ravel(shapes))
+    rows = sum(len(idx) for idx in groups)
+    shape_formulas = FORMULA_REGISTRY["shapes"]
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name, values in columns.items():
+        try:
+            arrays[name] = np.broadcast_to(np.asarray(values, dtype=float), (rows,))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Incorrect dimension column {name}: {exc}") from exc
+
+    volume = np.empty(rows)
+    for shape, idx in zip(unique, groups):
+        formula = shape_formulas.get(shape)
+        if formula is None:
+            raise ValueError(f"Invalid shape: {shape}")
+        missing = [p for p in formula.params if p not in arrays]
+        if missing:
+            raise ValueError(f"Incorrect arguments for shape {shape}: missing column(s) {', '.join(missing)}")
+        with np.errstate(invalid="ignore", over="ignore"):
+            volume[idx] = formula.func(*(arrays[p][idx] for p in formula.params))
+
+    density, material_names, material_index = _resolve_densities(rows, materials, densities, density_table)
+    mass = volume / 1000.0 * density
+
+    totals: Dict[str, float] = {}
+    if material_names is not None:
+        sums = np.bincount(material_index, weights=mass, minlength=len(material_names))
+        totals = {name: float(total) for name, total in zip(material_names, sums)}
+
+    return MassBatchResult(volume=volume, density=density, mass=mass, totals=totals)
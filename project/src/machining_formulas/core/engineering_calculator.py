@@ -5,235 +5,113 @@ from __future__ import annotations
 # Autor:Hakan KILIÇASLAN 2025
 # flake8: noqa
 
-import math
-from typing import Any, Callable, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from machining_formulas.core.cache import DEFAULT_CACHE_SIZE, CacheStats, ResultCache, make_key
+from machining_formulas.core.formulas import (
+    DRILLING_DEFINITIONS,
+    FORMULA_REGISTRY,
+    MATERIAL_DENSITY,
+    MILLING_DEFINITIONS,
+    PARAM_INDEX,
+    PARAM_TURKISH_NAMES,
+    SHAPE_PARAMETER_INDEX,
+    SHAPE_DEFINITIONS,
+    TURNING_DEFINITIONS,
+    Formula,
+    ParamInfo,
+)
+
+if TYPE_CHECKING:  # NumPy is optional; only the *_batch methods need it.
+    import numpy as np
+
+    from machining_formulas.core.batch import MassBatchResult
 
 
 class EngineeringCalculator:
+    # Formül tabloları modül seviyesinde bir kez derlenir ve tüm örneklerce
+    # paylaşılır (bkz. core/formulas.py); salt okunurdur.
+    formulas: Mapping[str, Mapping[str, Formula]] = FORMULA_REGISTRY
+    shape_definitions: Mapping[str, Callable[..., float]] = SHAPE_DEFINITIONS
+    turning_definitions: Mapping[str, Mapping[str, Any]] = TURNING_DEFINITIONS
+    milling_definitions: Mapping[str, Mapping[str, Any]] = MILLING_DEFINITIONS
+    drilling_definitions: Mapping[str, Mapping[str, Any]] = DRILLING_DEFINITIONS
+
     def __init__(self):
-        # Şekil hacim formülleri (mm cinsinden, hacim mm^3 döner)
-        self.shape_definitions: Dict[str, Callable[..., float]] = {
-            "triangle": lambda width, height, length: ((width * height) / 2) * length,
-            "circle": lambda radius, length: (math.pi * radius**2) * length,
-            "semi-circle": lambda radius, length: (math.pi * radius**2 / 2) * length,
-            "square": lambda width, length: (width**2) * length,
-            "rectangle": lambda width, height, length: (width * height) * length,
-            "parallelogram": lambda width, height, length: (width * height) * length,
-            "rhombus": lambda diagonal1, diagonal2, length: (diagonal1 * diagonal2 / 2)
-            * length,
-            "trapezoid": lambda width1, width2, height, length: (
-                (width1 + width2) / 2 * height
-            )
-            * length,
-            "trapezium": lambda width1, width2, height, length: (
-                (width1 + width2) / 2 * height
-            )
-            * length,
-            "kite": lambda diagonal1, diagonal2, length: (diagonal1 * diagonal2 / 2)
-            * length,
-            "pentagon": lambda width, length: (5 / 4 * width**2 / math.tan(math.pi / 5))
-            * length,
-            "hexagon": lambda width, length: (3 * math.sqrt(3) / 2 * width**2) * length,
-            "octagon": lambda width, length: (2 * (1 + math.sqrt(2)) * width**2)
-            * length,
-            "nonagon": lambda width, length: (
-                9 / 4 * width**2 * (1 / math.tan(math.pi / 9))
-            )
-            * length,
-            "decagon": lambda width, length: (
-                5 / 2 * width**2 * (1 / math.tan(math.pi / 10))
-            )
-            * length,
-            "tube": lambda outer_radius, inner_radius, length: (
-                math.pi * (outer_radius**2 - inner_radius**2)
+        # Malzeme yoğunlukları (g/cm^3) - örnek başına düzenlenebilir kopya
+        self.material_density: Dict[str, float] = dict(MATERIAL_DENSITY)
+        # Opsiyonel sonuç önbelleği (bkz. enable_cache)
+        self._cache: Optional[ResultCache] = None
+
+    # ---- Result cache (opt-in) ----
+
+    def enable_cache(
+        self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: Optional[float] = None
+    ) -> ResultCache:
+        """Memoize ``calculate_*`` and ``calculate_material_mass`` results.
+
+        Bounded to ``maxsize`` entries (LRU eviction); entries expire after
+        ``ttl`` seconds when given. Returns the cache object.
+        """
+        self._cache = ResultCache(maxsize=maxsize, ttl=ttl)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        self._cache = None
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Hit/miss/eviction counters, or ``None`` if caching is disabled."""
+        return self._cache.stats() if self._cache is not None else None
+
+    def invalidate_cache(self, category: Optional[str] = None) -> int:
+        """Drop cached results (all, or one of shapes/turning/milling/drilling).
+
+        Call after changing definitions; mass results are keyed by the density
+        value itself, so editing ``material_density`` never serves stale masses.
+        """
+        if self._cache is None:
+            return 0
+        if category is None:
+            return self._cache.invalidate()
+        return self._cache.invalidate(lambda key: key[0] == category)
+
+    def _cached(self, category: str, method: str, args: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+        if self._cache is None:
+            return compute()
+        key = make_key(category, method, args)
+        if key is None:
+            return compute()
+        return self._cache.get_or_compute(key, compute)
+
+    def _lookup_formula(self, category: str, definition: str) -> Formula:
+        try:
+            return self.formulas[category][definition]
+        except KeyError:
+            raise ValueError(f"Invalid {category} calculation: {definition}")
+
+    def _evaluate(
+        self, category: str, definition: str, args: Sequence[Union[float, int]]
+    ) -> Dict[str, Any]:
+        formula = self._lookup_formula(category, definition)
+        try:
+            value = self._cached(category, definition, tuple(args), lambda: formula.func(*args))
+            return {"value": value, "units": formula.result_unit}
+        except TypeError as e:
+            raise ValueError(
+                f"Incorrect arguments for {category} calculation {definition}: {str(e)}"
             )
-            * length,
-            "sphere": lambda radius: (4 / 3)
-            * math.pi
-            * radius**3,  # Note: No length parameter for sphere
-        }
-        # Malzeme yoğunlukları (g/cm^3)
-        self.material_density: Dict[str, float] = {
-            "Çelik": 7.85,
-            "Alüminyum": 2.70,
-            "Bakır": 8.96,
-            "Pirinç": 8.50,
-            "Dökme Demir": 7.20,
-            "Plastik": 1.20,
-            "Titanyum": 4.51,
-            "Kurşun": 11.34,
-            "Çinko": 7.14,
-            "Nikel": 8.90,
-        }
-        # Tornalama ve frezeleme tanımları
-        self.turning_definitions = {
-            "Cutting speed": {
-                "formula": lambda Dm, n: (Dm * math.pi * n) / 1000,
-                "units": {
-                    "Dm": "mm (machined diameter)",
-                    "n": "rpm (spindle speed)",
-                    "result": "m/min",
-                },
-            },
-            "Spindle speed": {
-                "formula": lambda Vc, Dm: (Vc * 1000) / (math.pi * Dm),
-                "units": {
-                    "Vc": "m/min (cutting speed)",
-                    "Dm": "mm (machined diameter)",
-                    "result": "rpm",
-                },
-            },
-            "Metal removal rate": {
-                "formula": lambda Vc, ap, fn: (Vc * ap * fn),
-                "units": {
-                    "Vc": "m/min (cutting speed)",
-                    "ap": "mm (cutting depth)",
-                    "fn": "mm/rev (feed per revolution)",
-                    "result": "cm³/min",
-                },
-            },
-            "Net power": {
-                "formula": lambda Vc, ap, fn, kc: (Vc * ap * fn * kc) / (60 * 10**3),
-                "units": {
-                    "Vc": "m/min (cutting speed)",
-                    "ap": "mm (cutting depth)",
-                    "fn": "mm/rev (feed per revolution)",
-                    "kc": "N/mm² (specific cutting force)",
-                    "result": "kW",
-                },
-            },
-            "Machining time": {
-                "formula": lambda lm, fn, n: (lm / (fn * n)),
-                "units": {
-                    "lm": "mm (machined length)",
-                    "fn": "mm/rev (feed per revolution)",
-                    "n": "rpm (spindle speed)",
-                    "result": "min",
-                },
-            },
-        }
-        self.milling_definitions = {
-            "Table feed": {
-                "formula": lambda fz, n, ZEFF: (fz * n * ZEFF),
-                "units": {
-                    "fz": "mm (feed per tooth)",
-                    "n": "rpm (spindle speed)",
-                    "ZEFF": "count (effective teeth)",
-                    "result": "mm/min",
-                },
-            },
-            "Cutting speed": {
-                "formula": lambda DCap, n: (math.pi * DCap * n) / 1000,
-                "units": {
-                    "DCap": "mm (cutting diameter)",
-                    "n": "rpm (spindle speed)",
-                    "result": "m/min",
-                },
-            },
-            "Spindle speed": {
-                "formula": lambda Vc, DCap: (Vc * 1000) / (math.pi * DCap),
-                "units": {
-                    "Vc": "m/min (cutting speed)",
-                    "DCap": "mm (cutting diameter)",
-                    "result": "rpm",
-                },
-            },
-            "Feed per tooth": {
-                "formula": lambda Vf, n, ZEFF: (Vf / (n * ZEFF)),
-                "units": {
-                    "Vf": "mm/min (table feed)",
-                    "n": "rpm (spindle speed)",
-                    "ZEFF": "count (effective teeth)",
-                    "result": "mm",
-                },
-            },
-            "Feed per revolution": {
-                "formula": lambda Vf, n: (Vf / n),
-                "units": {
-                    "Vf": "mm/min (table feed)",
-                    "n": "rpm (spindle speed)",
-                    "result": "mm/rev",
-                },
-            },
-            "Metal removal rate": {
-                "formula": lambda Vf, ap, ae: ((ap * ae * Vf) / 1000),
-                "units": {
-                    "Vf": "mm/min (table feed)",
-                    "ap": "mm (axial depth of cut)",
-                    "ae": "mm (radial depth of cut)",
-                    "result": "cm³/min",
-                },
-            },
-            "Net power": {
-                "formula": lambda ae, ap, Vf, kc: (ae * ap * Vf * kc) / (60 * 10**6),
-                "units": {
-                    "ae": "mm (radial depth of cut)",
-                    "ap": "mm (axial depth of cut)",
-                    "Vf": "mm/min (table feed)",
-                    "kc": "N/mm² (specific cutting force)",
-                    "result": "kW",
-                },
-            },
-            "Torque": {
-                "formula": lambda Pc, n: (Pc * 30 * 10**3) / (math.pi * n),
-                "units": {
-                    "Pc": "kW (net power)",
-                    "n": "rpm (spindle speed)",
-                    "result": "Nm",
-                },
-            },
-        }
-        self.drilling_definitions = {
-            "Cutting speed": {
-                "formula": lambda Dc, n: (Dc * math.pi * n) / 1000,
-                "units": {
-                    "Dc": "mm (drill diameter)",
-                    "n": "rpm (spindle speed)",
-                    "result": "m/min",
-                },
-            },
-            "Spindle speed": {
-                "formula": lambda Vc, Dc: (Vc * 1000) / (math.pi * Dc),
-                "units": {
-                    "Vc": "m/min (cutting speed)",
-                    "Dc": "mm (drill diameter)",
-                    "result": "rpm",
-                },
-            },
-            "Feed rate": {
-                "formula": lambda fn, n: (fn * n),
-                "units": {
-                    "fn": "mm/rev (feed per revolution)",
-                    "n": "rpm (spindle speed)",
-                    "result": "mm/min",
-                },
-            },
-            "Metal removal rate": {
-                "formula": lambda Dc, Vf: (math.pi * (Dc**2) * Vf) / 4000,
-                "units": {
-                    "Dc": "mm (drill diameter)",
-                    "Vf": "mm/min (feed rate)",
-                    "result": "cm³/min",
-                },
-            },
-            "Machining time": {
-                "formula": lambda lm, Vf: (lm / Vf),
-                "units": {
-                    "lm": "mm (hole depth)",
-                    "Vf": "mm/min (feed rate)",
-                    "result": "min",
-                },
-            },
-        }
 
     def calculate_material_mass(
         self, shape: str, density: float, *args: Union[float, int]
     ) -> float:
         """Calculate mass of a given shape with specified material density."""
-        try:
+        def compute() -> float:
             volume_mm3 = self.shape_definitions[shape](*args)
             volume_cm3 = volume_mm3 / 1000.0
             return volume_cm3 * density
+
+        try:
+            return self._cached("shapes", shape, (density, *args), compute)
         except KeyError:
             raise ValueError(f"Invalid shape: {shape}")
         except TypeError as e:
@@ -245,55 +123,81 @@ class EngineeringCalculator:
         self, definition: str, *args: Union[float, int]
     ) -> Dict[str, Any]:
         """Calculate turning parameters based on the provided definition."""
-        try:
-            calc_definition = self.turning_definitions[definition]
-            calculated_value = calc_definition["formula"](*args)
-            return {
-                "value": calculated_value,
-                "units": calc_definition["units"]["result"],
-            }
-        except KeyError:
-            raise ValueError(f"Invalid turning calculation: {definition}")
-        except TypeError as e:
-            raise ValueError(
-                f"Incorrect arguments for turning calculation {definition}: {str(e)}"
-            )
+        return self._evaluate("turning", definition, args)
 
     def calculate_milling(
         self, definition: str, *args: Union[float, int]
     ) -> Dict[str, Any]:
         """Calculate milling parameters based on the provided definition."""
-        try:
-            calc_definition = self.milling_definitions[definition]
-            calculated_value = calc_definition["formula"](*args)
-            return {
-                "value": calculated_value,
-                "units": calc_definition["units"]["result"],
-            }
-        except KeyError:
-            raise ValueError(f"Invalid milling calculation: {definition}")
-        except TypeError as e:
-            raise ValueError(
-                f"Incorrect arguments for milling calculation {definition}: {str(e)}"
-            )
+        return self._evaluate("milling", definition, args)
 
     def calculate_drilling(
         self, definition: str, *args: Union[float, int]
     ) -> Dict[str, Any]:
         """Calculate drilling parameters based on the provided definition."""
-        try:
-            calc_definition = self.drilling_definitions[definition]
-            calculated_value = calc_definition["formula"](*args)
-            return {
-                "value": calculated_value,
-                "units": calc_definition["units"]["result"],
-            }
-        except KeyError:
-            raise ValueError(f"Invalid drilling calculation: {definition}")
-        except TypeError as e:
-            raise ValueError(
-                f"Incorrect arguments for drilling calculation {definition}: {str(e)}"
-            )
+        return self._evaluate("drilling", definition, args)
+
+    # ---- Vectorized (NumPy) batch variants ----
+
+    def calculate_turning_batch(
+        self, definition: str, *args: Any, **columns: Any
+    ) -> Tuple["np.ndarray", str]:
+        """Vectorized ``calculate_turning``.
+
+        Accepts positional arrays in parameter order or a column mapping keyed
+        by parameter name (``Vc``, ``ap``, ``fn``, ...). Returns ``(values, unit)``.
+        """
+        from machining_formulas.core.batch import evaluate_formula_batch
+
+        return evaluate_formula_batch(
+            self._lookup_formula("turning", definition), args, columns
+        )
+
+    def calculate_milling_batch(
+        self, definition: str, *args: Any, **columns: Any
+    ) -> Tuple["np.ndarray", str]:
+        """Vectorized ``calculate_milling``; see ``calculate_turning_batch``."""
+        from machining_formulas.core.batch import evaluate_formula_batch
+
+        return evaluate_formula_batch(
+            self._lookup_formula("milling", definition), args, columns
+        )
+
+    def calculate_drilling_batch(
+        self, definition: str, *args: Any, **columns: Any
+    ) -> Tuple["np.ndarray", str]:
+        """Vectorized ``calculate_drilling``; see ``calculate_turning_batch``."""
+        from machining_formulas.core.batch import evaluate_formula_batch
+
+        return evaluate_formula_batch(
+            self._lookup_formula("drilling", definition), args, columns
+        )
+
+    def calculate_material_mass_batch(
+        self,
+        shapes: Sequence[str],
+        columns: Optional[Mapping[str, Any]] = None,
+        *,
+        materials: Optional[Sequence[str]] = None,
+        densities: Optional[Any] = None,
+        **dimensions: Any,
+    ) -> "MassBatchResult":
+        """Vectorized ``calculate_material_mass`` for whole bills of materials.
+
+        Dimensions come as a column mapping or keyword arrays keyed by shape
+        parameter name. Densities are given per row or looked up from
+        ``materials`` in this calculator's density table. Returns per-row
+        ``mass`` (g) and per-material ``totals``.
+        """
+        from machining_formulas.core.batch import evaluate_mass_batch
+
+        return evaluate_mass_batch(
+            shapes,
+            {**(columns or {}), **dimensions},
+            materials=materials,
+            densities=densities,
+            density_table=self.material_density,
+        )
 
     def get_available_calculations(self) -> Dict[str, List[str]]:
         """Return a list of supported calculation keys."""
@@ -333,80 +237,39 @@ class EngineeringCalculator:
             "sphere": "Küre",
         }
 
-    PARAM_TURKISH_NAMES: Dict[str, str] = {
-        "Dm": "İşlenen Çap",
-        "n": "İş Mili Devri",
-        "Vc": "Kesme Hızı",
-        "ap": "Kesme Derinliği",
-        "fn": "Devir Başına İlerleme",
-        "kc": "Özgül Kesme Kuvveti",
-        "lm": "İşlenecek Uzunluk",
-        "fz": "Diş Başına İlerleme (fz)",
-        "ZEFF": "Efektif Diş Sayısı",
-        "DCap": "Kesme Çapı (Takım)",
-        "Vf": "Tabla İlerlemesi (Vf)",
-        "ae": "Yanal Kesme Derinliği",
-        "Pc": "Net Güç (Pc)",
-        "z": "Diş Sayısı (z)",
-        "Dc": "Matkap Çapı",
-        "radius": "Yarıçap",
-        "width": "Genişlik",
-        "height": "Yükseklik",
-        "outer_radius": "Dış Yarıçap",
-        "inner_radius": "İç Yarıçap",
-        "diagonal1": "Köşegen 1",
-        "diagonal2": "Köşegen 2",
-        "length": "Uzunluk",
-        "width1": "Genişlik 1 (Taban)",
-        "width2": "Genişlik 2 (Tavan)",
-    }
+    PARAM_TURKISH_NAMES: Dict[str, str] = PARAM_TURKISH_NAMES
 
-    def get_calculation_params(
+    def get_param_info(
         self, calc_category_key: str, calc_method_key: str
-    ) -> List[Dict[str, str]]:
-        """Return parameter metadata list for GUI/tooling."""
-        definitions_map = {
-            "turning": self.turning_definitions,
-            "milling": self.milling_definitions,
-            "drilling": self.drilling_definitions,
-        }
-
-        if calc_category_key not in definitions_map:
-            raise ValueError(f"Invalid calculation category key: {calc_category_key}")
+    ) -> Tuple[ParamInfo, ...]:
+        """Return cached, immutable parameter metadata for a calculation.
 
-        category_definitions = definitions_map[calc_category_key]
-
-        if calc_method_key not in category_definitions:
-            raise ValueError(
-                f"Invalid calculation method key '{calc_method_key}' for category '{calc_category_key}'"
-            )
-
-        param_units_dict = category_definitions[calc_method_key].get("units", {})
-
-        param_details_list = []
-        for param_name, unit_description in param_units_dict.items():
-            if param_name == "result":
-                continue
-
-            unit = unit_description.split(" ")[0] if unit_description else ""
+        Served from an index precomputed at import, keyed by (category, method).
+        """
+        try:
+            return PARAM_INDEX[(calc_category_key, calc_method_key)]
+        except KeyError:
+            pass
 
-            display_text = self.PARAM_TURKISH_NAMES.get(param_name, param_name.capitalize())
+        if calc_category_key not in ("turning", "milling", "drilling"):
+            raise ValueError(f"Invalid calculation category key: {calc_category_key}")
+        raise ValueError(
+            f"Invalid calculation method key '{calc_method_key}' for category '{calc_category_key}'"
+        )
 
-            param_details_list.append(
-                {"name": param_name, "unit": unit, "display_text_turkish": display_text}
-            )
+    def get_calculation_params(
+        self, calc_category_key: str, calc_method_key: str
+    ) -> List[Dict[str, str]]:
+        """Return parameter metadata list for GUI/tooling."""
+        return [p.as_dict() for p in self.get_param_info(calc_category_key, calc_method_key)]
 
-        return param_details_list
+    def get_shape_param_names(self, shape_key: str) -> Tuple[str, ...]:
+        """Cached tuple form of ``get_shape_parameters``."""
+        try:
+            return SHAPE_PARAMETER_INDEX[shape_key]
+        except KeyError:
+            raise ValueError(f"Invalid shape key: {shape_key}")
 
     def get_shape_parameters(self, shape_key: str) -> List[str]:
         """Return shape dimension parameter names (excluding length for extrusions)."""
-        if shape_key not in self.shape_definitions:
-            raise ValueError(f"Invalid shape key: {shape_key}")
-
-        func: Callable[..., float] = self.shape_definitions[shape_key]
-        param_names = list(func.__code__.co_varnames[: func.__code__.co_argcount])
-
-        if shape_key != "sphere" and "length" in param_names:
-            param_names.remove("length")
-
-        return param_names
+        return list(self.get_shape_param_names(shape_key))
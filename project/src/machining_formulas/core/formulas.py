@@ -0,0 +1,430 @@
+"""Shared, precompiled formula registry.
+
+Formula tables are declared once here and compiled at import time into
+immutable :class:`Formula` objects. Every ``EngineeringCalculator`` (and every
+GUI/tool-calling helper that creates one) shares the same registry, so building
+a calculator no longer re-creates lambdas and nested dicts.
+
+Example::
+
+    formula = FORMULA_REGISTRY["turning"]["Cutting speed"]
+    formula.params        # ("Dm", "n")
+    formula.func(100, 500)
+"""
+
+# -*- coding : utf-8 -*-
+# Autor:Hakan KILIÇASLAN 2025
+# flake8: noqa
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Formula:
+    """One compiled formula: bound callable + precomputed parameter metadata."""
+
+    category: str
+    key: str
+    func: Callable[..., Any]
+    params: Tuple[str, ...]
+    param_units: Tuple[str, ...]
+    result_unit: str
+    symbol: str = ""
+
+    @property
+    def units(self) -> Mapping[str, str]:
+        """Legacy ``{"param": "unit (desc)", ..., "result": unit}`` view."""
+        return MappingProxyType({**dict(zip(self.params, self.param_units)), "result": self.result_unit})
+
+    def __call__(self, *args: Any) -> Any:
+        return self.func(*args)
+
+
+@dataclass(frozen=True, slots=True)
+class ParamInfo:
+    """Precomputed, hashable parameter metadata used by the GUI and tool schemas."""
+
+    name: str
+    unit: str
+    display_text_turkish: str
+
+    def as_dict(self) -> Dict[str, str]:
+        """Legacy ``get_calculation_params`` entry."""
+        return {"name": self.name, "unit": self.unit, "display_text_turkish": self.display_text_turkish}
+
+
+# Şekil hacim formülleri (mm cinsinden, hacim mm^3 döner)
+_SHAPE_SPECS: Dict[str, Callable[..., float]] = {
+    "triangle": lambda width, height, length: ((width * height) / 2) * length,
+    "circle": lambda radius, length: (math.pi * radius**2) * length,
+    "semi-circle": lambda radius, length: (math.pi * radius**2 / 2) * length,
+    "square": lambda width, length: (width**2) * length,
+    "rectangle": lambda width, height, length: (width * height) * length,
+    "parallelogram": lambda width, height, length: (width * height) * length,
+    "rhombus": lambda diagonal1, diagonal2, length: (diagonal1 * diagonal2 / 2)
+    * length,
+    "trapezoid": lambda width1, width2, height, length: (
+        (width1 + width2) / 2 * height
+    )
+    * length,
+    "trapezium": lambda width1, width2, height, length: (
+        (width1 + width2) / 2 * height
+    )
+    * length,
+    "kite": lambda diagonal1, diagonal2, length: (diagonal1 * diagonal2 / 2)
+    * length,
+    "pentagon": lambda width, length: (5 / 4 * width**2 / math.tan(math.pi / 5))
+    * length,
+    "hexagon": lambda width, length: (3 * math.sqrt(3) / 2 * width**2) * length,
+    "octagon": lambda width, length: (2 * (1 + math.sqrt(2)) * width**2)
+    * length,
+    "nonagon": lambda width, length: (
+        9 / 4 * width**2 * (1 / math.tan(math.pi / 9))
+    )
+    * length,
+    "decagon": lambda width, length: (
+        5 / 2 * width**2 * (1 / math.tan(math.pi / 10))
+    )
+    * length,
+    "tube": lambda outer_radius, inner_radius, length: (
+        math.pi * (outer_radius**2 - inner_radius**2)
+    )
+    * length,
+    "sphere": lambda radius: (4 / 3)
+    * math.pi
+    * radius**3,  # Note: No length parameter for sphere
+}
+
+# Malzeme yoğunlukları (g/cm^3)
+_MATERIAL_DENSITY_SPECS: Dict[str, float] = {
+    "Çelik": 7.85,
+    "Alüminyum": 2.70,
+    "Bakır": 8.96,
+    "Pirinç": 8.50,
+    "Dökme Demir": 7.20,
+    "Plastik": 1.20,
+    "Titanyum": 4.51,
+    "Kurşun": 11.34,
+    "Çinko": 7.14,
+    "Nikel": 8.90,
+}
+
+# Tornalama ve frezeleme tanımları
+_TURNING_SPECS: Dict[str, Dict[str, Any]] = {
+    "Cutting speed": {
+        "formula": lambda Dm, n: (Dm * math.pi * n) / 1000,
+        "units": {
+            "Dm": "mm (machined diameter)",
+            "n": "rpm (spindle speed)",
+            "result": "m/min",
+        },
+    },
+    "Spindle speed": {
+        "formula": lambda Vc, Dm: (Vc * 1000) / (math.pi * Dm),
+        "units": {
+            "Vc": "m/min (cutting speed)",
+            "Dm": "mm (machined diameter)",
+            "result": "rpm",
+        },
+    },
+    "Metal removal rate": {
+        "formula": lambda Vc, ap, fn: (Vc * ap * fn),
+        "units": {
+            "Vc": "m/min (cutting speed)",
+            "ap": "mm (cutting depth)",
+            "fn": "mm/rev (feed per revolution)",
+            "result": "cm³/min",
+        },
+    },
+    "Net power": {
+        "formula": lambda Vc, ap, fn, kc: (Vc * ap * fn * kc) / (60 * 10**3),
+        "units": {
+            "Vc": "m/min (cutting speed)",
+            "ap": "mm (cutting depth)",
+            "fn": "mm/rev (feed per revolution)",
+            "kc": "N/mm² (specific cutting force)",
+            "result": "kW",
+        },
+    },
+    "Machining time": {
+        "formula": lambda lm, fn, n: (lm / (fn * n)),
+        "units": {
+            "lm": "mm (machined length)",
+            "fn": "mm/rev (feed per revolution)",
+            "n": "rpm (spindle speed)",
+            "result": "min",
+        },
+    },
+}
+
+_MILLING_SPECS: Dict[str, Dict[str, Any]] = {
+    "Table feed": {
+        "formula": lambda fz, n, ZEFF: (fz * n * ZEFF),
+        "units": {
+            "fz": "mm (feed per tooth)",
+            "n": "rpm (spindle speed)",
+            "ZEFF": "count (effective teeth)",
+            "result": "mm/min",
+        },
+    },
+    "Cutting speed": {
+        "formula": lambda DCap, n: (math.pi * DCap * n) / 1000,
+        "units": {
+            "DCap": "mm (cutting diameter)",
+            "n": "rpm (spindle speed)",
+            "result": "m/min",
+        },
+    },
+    "Spindle speed": {
+        "formula": lambda Vc, DCap: (Vc * 1000) / (math.pi * DCap),
+        "units": {
+            "Vc": "m/min (cutting speed)",
+            "DCap": "mm (cutting diameter)",
+            "result": "rpm",
+        },
+    },
+    "Feed per tooth": {
+        "formula": lambda Vf, n, ZEFF: (Vf / (n * ZEFF)),
+        "units": {
+            "Vf": "mm/min (table feed)",
+            "n": "rpm (spindle speed)",
+            "ZEFF": "count (effective teeth)",
+            "result": "mm",
+        },
+    },
+    "Feed per revolution": {
+        "formula": lambda Vf, n: (Vf / n),
+        "units": {
+            "Vf": "mm/min (table feed)",
+            "n": "rpm (spindle speed)",
+            "result": "mm/rev",
+        },
+    },
+    "Metal removal rate": {
+        "formula": lambda Vf, ap, ae: ((ap * ae * Vf) / 1000),
+        "units": {
+            "Vf": "mm/min (table feed)",
+            "ap": "mm (axial depth of cut)",
+            "ae": "mm (radial depth of cut)",
+            "result": "cm³/min",
+        },
+    },
+    "Net power": {
+        "formula": lambda ae, ap, Vf, kc: (ae * ap * Vf * kc) / (60 * 10**6),
+        "units": {
+            "ae": "mm (radial depth of cut)",
+            "ap": "mm (axial depth of cut)",
+            "Vf": "mm/min (table feed)",
+            "kc": "N/mm² (specific cutting force)",
+            "result": "kW",
+        },
+    },
+    "Torque": {
+        "formula": lambda Pc, n: (Pc * 30 * 10**3) / (math.pi * n),
+        "units": {
+            "Pc": "kW (net power)",
+            "n": "rpm (spindle speed)",
+            "result": "Nm",
+        },
+    },
+}
+
+_DRILLING_SPECS: Dict[str, Dict[str, Any]] = {
+    "Cutting speed": {
+        "formula": lambda Dc, n: (Dc * math.pi * n) / 1000,
+        "units": {
+            "Dc": "mm (drill diameter)",
+            "n": "rpm (spindle speed)",
+            "result": "m/min",
+        },
+    },
+    "Spindle speed": {
+        "formula": lambda Vc, Dc: (Vc * 1000) / (math.pi * Dc),
+        "units": {
+            "Vc": "m/min (cutting speed)",
+            "Dc": "mm (drill diameter)",
+            "result": "rpm",
+        },
+    },
+    "Feed rate": {
+        "formula": lambda fn, n: (fn * n),
+        "units": {
+            "fn": "mm/rev (feed per revolution)",
+            "n": "rpm (spindle speed)",
+            "result": "mm/min",
+        },
+    },
+    "Metal removal rate": {
+        "formula": lambda Dc, Vf: (math.pi * (Dc**2) * Vf) / 4000,
+        "units": {
+            "Dc": "mm (drill diameter)",
+            "Vf": "mm/min (feed rate)",
+            "result": "cm³/min",
+        },
+    },
+    "Machining time": {
+        "formula": lambda lm, Vf: (lm / Vf),
+        "units": {
+            "lm": "mm (hole depth)",
+            "Vf": "mm/min (feed rate)",
+            "result": "min",
+        },
+    },
+}
+
+
+# Şekil formüllerinin hacim birimi (calculate_material_mass cm³'e çevirir)
+SHAPE_VOLUME_UNIT = "mm³"
+
+# Her formülün ürettiği büyüklüğün sembolü; diğer formüllerin parametre adlarıyla
+# aynıdır (ör. 'Net power' -> Pc, 'Torque' formülünün girdisi). Bağımlılık grafiği
+# (core/graph.py) bu eşleşmeden kurulur.
+RESULT_SYMBOLS: Dict[str, str] = {
+    "Cutting speed": "Vc",
+    "Spindle speed": "n",
+    "Metal removal rate": "Q",
+    "Net power": "Pc",
+    "Machining time": "Tc",
+    "Table feed": "Vf",
+    "Feed per tooth": "fz",
+    "Feed per revolution": "fn",
+    "Torque": "Mc",
+    "Feed rate": "Vf",
+}
+
+
+def _compile_shape(key: str, func: Callable[..., float]) -> Formula:
+    code = func.__code__
+    params = tuple(code.co_varnames[: code.co_argcount])
+    return Formula(
+        category="shapes",
+        key=key,
+        func=func,
+        params=params,
+        param_units=tuple("mm" for _ in params),
+        result_unit=SHAPE_VOLUME_UNIT,
+        symbol="V",
+    )
+
+
+def _compile_definition(category: str, key: str, spec: Dict[str, Any]) -> Formula:
+    units: Dict[str, str] = spec["units"]
+    func: Callable[..., Any] = spec["formula"]
+    params = tuple(name for name in units if name != "result")
+
+    code = func.__code__
+    signature = tuple(code.co_varnames[: code.co_argcount])
+    if signature != params:  # Tablo hatalarını import anında yakala
+        raise ValueError(
+            f"{category} formula {key!r}: lambda parameters {signature} do not match units {params}"
+        )
+
+    return Formula(
+        category=category,
+        key=key,
+        func=func,
+        params=params,
+        param_units=tuple(units[name] for name in params),
+        result_unit=units["result"],
+        symbol=RESULT_SYMBOLS[key],
+    )
+
+
+def _freeze(formulas: Dict[str, Formula]) -> Mapping[str, Formula]:
+    return MappingProxyType(formulas)
+
+
+FORMULA_REGISTRY: Mapping[str, Mapping[str, Formula]] = MappingProxyType(
+    {
+        "shapes": _freeze({key: _compile_shape(key, func) for key, func in _SHAPE_SPECS.items()}),
+        "turning": _freeze(
+            {key: _compile_definition("turning", key, spec) for key, spec in _TURNING_SPECS.items()}
+        ),
+        "milling": _freeze(
+            {key: _compile_definition("milling", key, spec) for key, spec in _MILLING_SPECS.items()}
+        ),
+        "drilling": _freeze(
+            {key: _compile_definition("drilling", key, spec) for key, spec in _DRILLING_SPECS.items()}
+        ),
+    }
+)
+
+MATERIAL_DENSITY: Mapping[str, float] = MappingProxyType(dict(_MATERIAL_DENSITY_SPECS))
+
+
+def _legacy_view(category: str) -> Mapping[str, Mapping[str, Any]]:
+    """Read-only ``{"formula": ..., "units": {...}}`` tables kept for existing callers."""
+    return MappingProxyType(
+        {
+            key: MappingProxyType({"formula": formula.func, "units": formula.units})
+            for key, formula in FORMULA_REGISTRY[category].items()
+        }
+    )
+
+
+# Parametre adlarının Türkçe karşılıkları (GUI etiketleri ve tool açıklamaları)
+PARAM_TURKISH_NAMES: Dict[str, str] = {
+    "Dm": "İşlenen Çap",
+    "n": "İş Mili Devri",
+    "Vc": "Kesme Hızı",
+    "ap": "Kesme Derinliği",
+    "fn": "Devir Başına İlerleme",
+    "kc": "Özgül Kesme Kuvveti",
+    "lm": "İşlenecek Uzunluk",
+    "fz": "Diş Başına İlerleme (fz)",
+    "ZEFF": "Efektif Diş Sayısı",
+    "DCap": "Kesme Çapı (Takım)",
+    "Vf": "Tabla İlerlemesi (Vf)",
+    "ae": "Yanal Kesme Derinliği",
+    "Pc": "Net Güç (Pc)",
+    "z": "Diş Sayısı (z)",
+    "Dc": "Matkap Çapı",
+    "radius": "Yarıçap",
+    "width": "Genişlik",
+    "height": "Yükseklik",
+    "outer_radius": "Dış Yarıçap",
+    "inner_radius": "İç Yarıçap",
+    "diagonal1": "Köşegen 1",
+    "diagonal2": "Köşegen 2",
+    "length": "Uzunluk",
+    "width1": "Genişlik 1 (Taban)",
+    "width2": "Genişlik 2 (Tavan)",
+}
+
+
+def _param_info(name: str, unit_description: str) -> ParamInfo:
+    unit = unit_description.split(" ")[0] if unit_description else ""
+    display_text = PARAM_TURKISH_NAMES.get(name, name.capitalize())
+    return ParamInfo(name=name, unit=unit, display_text_turkish=display_text)
+
+
+# (kategori, yöntem) -> parametre meta bilgisi; import anında bir kez hesaplanır
+PARAM_INDEX: Mapping[Tuple[str, str], Tuple[ParamInfo, ...]] = MappingProxyType(
+    {
+        (category, key): tuple(
+            _param_info(name, unit) for name, unit in zip(formula.params, formula.param_units)
+        )
+        for category in ("turning", "milling", "drilling")
+        for key, formula in FORMULA_REGISTRY[category].items()
+    }
+)
+
+# Şekil boyut parametreleri (ekstrüzyonlarda 'length' hariç)
+SHAPE_PARAMETER_INDEX: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {
+        key: formula.params if key == "sphere" else tuple(p for p in formula.params if p != "length")
+        for key, formula in FORMULA_REGISTRY["shapes"].items()
+    }
+)
+
+SHAPE_DEFINITIONS: Mapping[str, Callable[..., float]] = MappingProxyType(
+    {key: formula.func for key, formula in FORMULA_REGISTRY["shapes"].items()}
+)
+TURNING_DEFINITIONS = _legacy_view("turning")
+MILLING_DEFINITIONS = _legacy_view("milling")
+DRILLING_DEFINITIONS = _legacy_view("drilling")
@@ -0,0 +1,158 @@
+"""Formula dependency graph for chained machining quantities.
+
+Every registry formula produces one symbol (``Net power`` -> ``Pc``,
+``Table feed`` -> ``Vf``, ...) and consumes the symbols named by its
+parameters. Linking the two gives a graph where, for example, ``Pc`` feeds
+``Torque`` and ``Vf`` feeds ``Feed per tooth``. Given any set of known inputs,
+:meth:`FormulaGraph.evaluate` computes every derivable quantity in one pass,
+sharing intermediates, instead of hand-wiring several ``calculate_*`` calls.
+
+Formulas are plain arithmetic, so values may be scalars or NumPy arrays
+(broadcast element-wise).
+
+Example::
+
+    result = evaluate_chain("milling", Vc=200, DCap=20, fz=0.1, ZEFF=4, ap=2, ae=10, kc=2000)
+    result.values["Mc"], result.units["Mc"]   # torque in Nm
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from machining_formulas.core.formulas import FORMULA_REGISTRY, Formula
+
+
+@dataclass(frozen=True)
+class ChainResult:
+    """Known inputs plus every derived quantity, keyed by symbol."""
+
+    values: Dict[str, Any]
+    units: Dict[str, str]
+    steps: Tuple[str, ...]
+
+    def derived(self) -> Dict[str, Any]:
+        """Only the quantities computed by the graph (in evaluation order)."""
+        return {symbol: self.values[symbol] for symbol in self.steps}
+
+
+class FormulaGraph:
+    """Forward-chaining evaluator over a set of formulas."""
+
+    def __init__(self, formulas: Iterable[Formula]):
+        self.formulas: Tuple[Formula, ...] = tuple(formulas)
+        self.producers: Dict[str, Tuple[Formula, ...]] = {}
+        units: Dict[str, str] = {}
+
+        for formula in self.formulas:
+            if not formula.symbol:
+                raise ValueError(f"Formula {formula.key!r} has no result symbol")
+            self.producers[formula.symbol] = self.producers.get(formula.symbol, ()) + (formula,)
+            units.setdefault(formula.symbol, formula.result_unit)
+            for name, description in zip(formula.params, formula.param_units):
+                units.setdefault(name, description.split(" ")[0] if description else "")
+
+        self.units: Dict[str, str] = units
+        self.symbols: FrozenSet[str] = frozenset(units)
+        self._plan_cache: Dict[Tuple[FrozenSet[str], Optional[FrozenSet[str]]], Tuple[Formula, ...]] = {}
+
+    @classmethod
+    def for_category(cls, category: str) -> "FormulaGraph":
+        """Shared graph for one registry category (turning, milling, drilling)."""
+        return _category_graph(category)
+
+    def plan(
+        self,
+        known: Iterable[str],
+        targets: Optional[Iterable[str]] = None,
+    ) -> Tuple[Formula, ...]:
+        """Return the formulas to run, in order, for the given known symbols.
+
+        Without ``targets`` every derivable symbol is planned; with ``targets``
+        the plan is pruned to what those symbols need. Plans are cached per
+        (known, targets) set.
+        """
+        known_set = frozenset(known)
+        target_set = frozenset(targets) if targets is not None else None
+        cache_key = (known_set, target_set)
+        cached = self._plan_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        available: Set[str] = set(known_set)
+        steps: List[Formula] = []
+        progress = True
+        while progress:
+            progress = False
+            for formula in self.formulas:
+                if formula.symbol in available:
+                    continue
+                if all(p in available for p in formula.params):
+                    steps.append(formula)
+                    available.add(formula.symbol)
+                    progress = True
+
+        if target_set is not None:
+            missing = sorted(target_set - available)
+            if missing:
+                raise ValueError(
+                    f"Cannot derive {', '.join(missing)} from {', '.join(sorted(known_set)) or 'nothing'}"
+                )
+            steps = self._prune(steps, target_set - known_set)
+
+        plan = tuple(steps)
+        self._plan_cache[cache_key] = plan
+        return plan
+
+    @staticmethod
+    def _prune(steps: List[Formula], targets: Set[str]) -> List[Formula]:
+        needed = set(targets)
+        kept: List[Formula] = []
+        for formula in reversed(steps):
+            if formula.symbol in needed:
+                kept.append(formula)
+                needed.update(formula.params)
+        kept.reverse()
+        return kept
+
+    def evaluate(
+        self,
+        known: Mapping[str, Any],
+        targets: Optional[Iterable[str]] = None,
+    ) -> ChainResult:
+        """Compute all derivable (or only ``targets``) quantities from ``known``."""
+        unknown = sorted(set(known) - self.symbols)
+        if unknown:
+            raise ValueError(f"Unknown quantity: {', '.join(unknown)}")
+
+        values: Dict[str, Any] = dict(known)
+        steps = self.plan(values.keys(), targets)
+        for formula in steps:
+            try:
+                values[formula.symbol] = formula.func(*(values[p] for p in formula.params))
+            except ZeroDivisionError as exc:
+                raise ValueError(f"Calculation error for {formula.category} {formula.key}: {exc}") from exc
+
+        return ChainResult(
+            values=values,
+            units={symbol: self.units.get(symbol, "") for symbol in values},
+            steps=tuple(f.symbol for f in steps),
+        )
+
+
+@lru_cache(maxsize=None)
+def _category_graph(category: str) -> FormulaGraph:
+    if category not in ("turning", "milling", "drilling"):
+        raise ValueError(f"Invalid calculation category key: {category}")
+    return FormulaGraph(FORMULA_REGISTRY[category].values())
+
+
+def evaluate_chain(
+    category: str,
+    targets: Optional[Iterable[str]] = None,
+    **known: Any,
+) -> ChainResult:
+    """Evaluate the category graph from keyword inputs (scalars or arrays)."""
+    return FormulaGraph.for_category(category).evaluate(known, targets)
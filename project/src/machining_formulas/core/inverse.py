@@ -0,0 +1,215 @@
+"""Inverse solver: solve any formula (or formula chain) for one unknown, in bulk.
+
+Almost every machining formula is a power law in each of its parameters
+(``Tc = lm / (fn * n)``, ``Pc = Vc * ap * fn * kc / 60000``). For those the
+inverse is derived analytically: the solver probes the formula at three
+values of the unknown, reads off the exponent ``e`` and, once the power law is
+verified, returns ``x = (target / f(1)) ** (1 / e)`` element-wise. Elements
+that are not power laws (e.g. ``tube`` volume in ``inner_radius``) fall back to
+a vectorized bracketing (bisection) root finder.
+
+Requires NumPy (``pip install machining-formulas[numeric]``).
+
+Example::
+
+    # Which fn gives these machining times at lm=120 mm, n=800 rpm?
+    fn, unit = solve_for("turning", "Machining time", "fn", target=[0.5, 1.0, 2.0], lm=120, n=800)
+
+    # Which n makes milling net power hit 5 kW (through Vf -> Pc)?
+    n, unit = solve_chain("milling", "Pc", "n", target=5, fz=0.1, ZEFF=4, ap=2, ae=10, kc=2000)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from machining_formulas.core.formulas import FORMULA_REGISTRY
+from machining_formulas.core.graph import FormulaGraph
+
+DEFAULT_BRACKET: Tuple[float, float] = (1e-9, 1e9)
+
+# Güç yasası doğrulaması için göreli tolerans
+_POWER_LAW_RTOL = 1e-9
+
+
+def _power_law_inverse(
+    func: Callable[[np.ndarray], np.ndarray],
+    target: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Analytic inverse where ``func`` is a power law in the unknown.
+
+    Returns ``(solution, solved_mask)``; unsolved elements are ``nan``.
+    """
+    shape = target.shape
+    f1 = np.broadcast_to(func(np.ones(shape)), shape)
+    f2 = np.broadcast_to(func(np.full(shape, 2.0)), shape)
+    f3 = np.broadcast_to(func(np.full(shape, 3.0)), shape)
+
+    ratio = f2 / f1
+    usable = np.isfinite(f1) & np.isfinite(ratio) & (f1 != 0) & (ratio > 0)
+    exponent = np.where(usable, np.log2(np.where(usable, ratio, 1.0)), 0.0)
+    predicted = f1 * np.power(3.0, exponent)
+    verified = usable & (exponent != 0) & np.isclose(f3, predicted, rtol=_POWER_LAW_RTOL, atol=0.0)
+
+    base = np.where(verified, target / np.where(verified, f1, 1.0), np.nan)
+    safe_exponent = np.where(verified, exponent, 1.0)
+    solution = np.where(verified & (base > 0), np.power(np.abs(base), 1.0 / safe_exponent), np.nan)
+    return solution, verified & np.isfinite(solution)
+
+
+def _bisect(
+    func: Callable[[np.ndarray], np.ndarray],
+    target: np.ndarray,
+    bracket: Tuple[float, float],
+    tol: float,
+    max_iter: int,
+) -> np.ndarray:
+    """Vectorized bisection on ``func(x) - target`` over ``bracket``.
+
+    Uses geometric midpoints for positive brackets so wide (many-decade)
+    ranges converge in a few dozen iterations. Elements without a sign change
+    over the bracket are returned as ``nan``.
+    """
+    lo_value, hi_value = (float(bracket[0]), float(bracket[1]))
+    if not lo_value < hi_value:
+        raise ValueError(f"Invalid bracket: {bracket}")
+
+    shape = target.shape
+    lo = np.full(shape, lo_value)
+    hi = np.full(shape, hi_value)
+    g_lo = np.broadcast_to(func(lo), shape) - target
+    g_hi = np.broadcast_to(func(hi), shape) - target
+    valid = np.isfinite(g_lo) & np.isfinite(g_hi) & (np.sign(g_lo) != np.sign(g_hi))
+    geometric = lo_value > 0
+
+    for _ in range(max_iter):
+        mid = np.sqrt(lo * hi) if geometric else (lo + hi) / 2.0
+        g_mid = np.broadcast_to(func(mid), shape) - target
+        same_side = np.sign(g_mid) == np.sign(g_lo)
+        lo = np.where(same_side, mid, lo)
+        g_lo = np.where(same_side, g_mid, g_lo)
+        hi = np.where(same_side, hi, mid)
+        if np.all(~valid | (np.abs(hi - lo) <= tol * np.maximum(np.abs(hi), 1e-300))):
+            break
+
+    result = np.sqrt(lo * hi) if geometric else (lo + hi) / 2.0
+    return np.where(valid, result, np.nan)
+
+
+def solve(
+    func: Callable[[np.ndarray], Any],
+    target: Any,
+    *,
+    bracket: Optional[Tuple[float, float]] = None,
+    tol: float = 1e-12,
+    max_iter: int = 200,
+    method: str = "auto",
+) -> np.ndarray:
+    """Solve ``func(x) == target`` element-wise for ``x``.
+
+    ``method`` is ``"auto"`` (analytic where possible, bisection otherwise),
+    ``"analytic"`` or ``"numeric"``. Unsolvable elements are ``nan``.
+    """
+    if method not in ("auto", "analytic", "numeric"):
+        raise ValueError(f"Invalid solve method: {method}")
+
+    target_arr = np.asarray(target, dtype=float)
+
+    def wrapped(x: np.ndarray) -> np.ndarray:
+        return np.asarray(func(x), dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if method == "numeric":
+            return _bisect(wrapped, target_arr, bracket or DEFAULT_BRACKET, tol, max_iter)
+
+        solution, solved = _power_law_inverse(wrapped, target_arr)
+        if method == "analytic" or bool(np.all(solved)):
+            return solution
+
+        fallback = _bisect(wrapped, target_arr, bracket or DEFAULT_BRACKET, tol, max_iter)
+        return np.where(solved, solution, fallback)
+
+
+def _broadcast_shape(target: Any, known: dict) -> Tuple[int, ...]:
+    return np.broadcast_shapes(np.shape(target), *(np.shape(v) for v in known.values()))
+
+
+def solve_for(
+    category: str,
+    method_key: str,
+    unknown: str,
+    target: Any,
+    *,
+    bracket: Optional[Tuple[float, float]] = None,
+    tol: float = 1e-12,
+    max_iter: int = 200,
+    method: str = "auto",
+    **known: Any,
+) -> Tuple[np.ndarray, str]:
+    """Solve one registry formula for ``unknown`` given ``target`` results.
+
+    Returns ``(values, unit_of_unknown)``; targets and known inputs broadcast.
+    """
+    try:
+        formula = FORMULA_REGISTRY[category][method_key]
+    except KeyError:
+        raise ValueError(f"Invalid {category} calculation: {method_key}")
+
+    if unknown not in formula.params:
+        raise ValueError(f"'{unknown}' is not a parameter of {category} calculation {method_key}")
+    missing = [p for p in formula.params if p != unknown and p not in known]
+    if missing:
+        raise ValueError(f"Missing parameter(s) for {category} calculation {method_key}: {', '.join(missing)}")
+    extra = sorted(set(known) - set(formula.params))
+    if extra:
+        raise ValueError(
+            f"Unexpected parameter(s) for {category} calculation {method_key}: {', '.join(extra)}"
+        )
+
+    shape = _broadcast_shape(target, known)
+    fixed = {name: np.broadcast_to(np.asarray(value, dtype=float), shape) for name, value in known.items()}
+    target_arr = np.broadcast_to(np.asarray(target, dtype=float), shape)
+
+    def func(x: np.ndarray) -> Any:
+        env = dict(fixed)
+        env[unknown] = x
+        return formula.func(*(env[p] for p in formula.params))
+
+    values = solve(func, target_arr, bracket=bracket, tol=tol, max_iter=max_iter, method=method)
+    unit = formula.param_units[formula.params.index(unknown)].split(" ")[0]
+    return values, unit
+
+
+def solve_chain(
+    category: str,
+    output: str,
+    unknown: str,
+    target: Any,
+    *,
+    bracket: Optional[Tuple[float, float]] = None,
+    tol: float = 1e-12,
+    max_iter: int = 200,
+    method: str = "auto",
+    **known: Any,
+) -> Tuple[np.ndarray, str]:
+    """Solve for ``unknown`` so the graph-derived ``output`` symbol hits ``target``.
+
+    Uses :class:`FormulaGraph`, so the unknown may sit several formulas
+    upstream of the output (e.g. ``n`` -> ``Vf`` -> ``Pc``).
+    """
+    graph = FormulaGraph.for_category(category)
+    if unknown in known:
+        raise ValueError(f"'{unknown}' is both unknown and given")
+    graph.plan(set(known) | {unknown}, {output})  # raises if output is not derivable
+
+    shape = _broadcast_shape(target, known)
+    fixed = {name: np.broadcast_to(np.asarray(value, dtype=float), shape) for name, value in known.items()}
+    target_arr = np.broadcast_to(np.asarray(target, dtype=float), shape)
+
+    def func(x: np.ndarray) -> Any:
+        return graph.evaluate({**fixed, unknown: x}, (output,)).values[output]
+
+    values = solve(func, target_arr, bracket=bracket, tol=tol, max_iter=max_iter, method=method)
+    return values, graph.units.get(unknown, "")
@@ -0,0 +1,217 @@
+"""Constraint-aware feeds-and-speeds optimizer for turning and milling.
+
+The decision variables are cutting speed ``Vc`` and the tool feed (``fn`` for
+turning, ``fz`` for milling). Every candidate is evaluated as array math
+through the formula dependency graph (``n``, ``Vf``, ``Pc``, ``Mc``, ...), so
+one round scores a whole ``grid x grid`` candidate set in a single pass.
+Candidates breaking a machine limit (max rpm, spindle power, torque) are
+masked out, the best feasible point is kept and the search zooms into its
+neighbourhood for a few refinement rounds.
+
+Requires NumPy (``pip install machining-formulas[numeric]``).
+
+Example::
+
+    result = optimize(
+        "turning",
+        "Metal removal rate",
+        cutting_speed=(80, 320),
+        feed=(0.05, 0.5),
+        fixed={"Dm": 60, "ap": 2, "kc": 2100},
+        limits=MachineLimits(max_rpm=3000, max_power=7.5, max_torque=120),
+    )
+    result.inputs["Vc"], result.inputs["fn"], result.value  # cm³/min
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from machining_formulas.core.formulas import FORMULA_REGISTRY, RESULT_SYMBOLS
+from machining_formulas.core.graph import FormulaGraph
+
+DEFAULT_GRID = 48
+DEFAULT_REFINE = 4
+
+# Bu hedefler küçültülür; diğerleri büyütülür.
+_MINIMIZED_OBJECTIVES = frozenset({"Machining time"})
+
+_FEED_SYMBOL: Mapping[str, str] = {"turning": "fn", "milling": "fz"}
+
+# Bağlayıcı kabul edilen sınır yakınlığı (göreli)
+_BINDING_RTOL = 1e-2
+
+
+@dataclass(frozen=True)
+class MachineLimits:
+    """Machine and tool limits; ``None`` means unconstrained."""
+
+    max_rpm: Optional[float] = None
+    min_rpm: Optional[float] = None
+    max_power: Optional[float] = None  # kW (Net power)
+    max_torque: Optional[float] = None  # Nm (Torque)
+
+    def upper_bounds(self) -> Dict[str, float]:
+        """Upper limits keyed by graph symbol."""
+        bounds = {"n": self.max_rpm, "Pc": self.max_power, "Mc": self.max_torque}
+        return {symbol: float(value) for symbol, value in bounds.items() if value is not None}
+
+
+@dataclass(frozen=True)
+class OptimizationResult:
+    """Best feasible operating point (``feasible`` is False if none was found)."""
+
+    category: str
+    objective: str
+    feasible: bool
+    value: float
+    unit: str
+    inputs: Dict[str, float]
+    values: Dict[str, float] = field(default_factory=dict)
+    units: Dict[str, str] = field(default_factory=dict)
+    binding: Tuple[str, ...] = ()
+
+
+@lru_cache(maxsize=None)
+def _optimizer_graph(category: str) -> FormulaGraph:
+    formulas = list(FORMULA_REGISTRY[category].values())
+    if "Torque" not in FORMULA_REGISTRY[category]:
+        # Tornalamada tork tanımı yok; Mc = Pc * 30000 / (pi * n) her iki işlemde aynıdır.
+        formulas.append(FORMULA_REGISTRY["milling"]["Torque"])
+    return FormulaGraph(formulas)
+
+
+def _validate_range(name: str, bounds: Tuple[float, float]) -> Tuple[float, float]:
+    lo, hi = float(bounds[0]), float(bounds[1])
+    if not 0 < lo <= hi:
+        raise ValueError(f"Invalid {name} range: {bounds}")
+    return lo, hi
+
+
+def _score(
+    graph: FormulaGraph,
+    known: Dict[str, Any],
+    targets: Tuple[str, ...],
+    objective_symbol: str,
+    minimize: bool,
+    limits: MachineLimits,
+) -> np.ndarray:
+    """Evaluate all candidates; infeasible ones score ``-inf``."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        values = graph.evaluate(known, targets).values
+        objective = np.asarray(values[objective_symbol], dtype=float)
+        shape = np.broadcast_shapes(objective.shape, *(np.shape(values[s]) for s in targets))
+        feasible = np.isfinite(np.broadcast_to(objective, shape))
+        for symbol, limit in limits.upper_bounds().items():
+            feasible = feasible & (np.asarray(values[symbol]) <= limit)
+        if limits.min_rpm is not None:
+            feasible = feasible & (np.asarray(values["n"]) >= float(limits.min_rpm))
+        score = np.where(feasible, -objective if minimize else objective, -np.inf)
+    return np.broadcast_to(score, shape)
+
+
+def optimize(
+    category: str,
+    objective: str = "Metal removal rate",
+    *,
+    cutting_speed: Tuple[float, float],
+    feed: Tuple[float, float],
+    fixed: Mapping[str, float],
+    limits: Optional[MachineLimits] = None,
+    grid: int = DEFAULT_GRID,
+    refine: int = DEFAULT_REFINE,
+) -> OptimizationResult:
+    """Find ``Vc`` and feed that optimize ``objective`` within ``limits``.
+
+    ``objective`` is a registry key of ``category`` (``Metal removal rate`` is
+    maximized, ``Machining time`` minimized). ``fixed`` carries the operation
+    data the formulas need (``Dm``/``DCap``, ``ap``, ``ae``, ``ZEFF``, ``kc``,
+    ``lm``).
+    """
+    if category not in _FEED_SYMBOL:
+        raise ValueError(f"Invalid optimization category key: {category}")
+    if objective not in FORMULA_REGISTRY[category]:
+        raise ValueError(f"Invalid {category} calculation: {objective}")
+    if grid < 3:
+        raise ValueError("grid must be at least 3")
+    if refine < 0:
+        raise ValueError("refine must not be negative")
+
+    limits = limits or MachineLimits()
+    feed_symbol = _FEED_SYMBOL[category]
+    overlap = sorted({"Vc", feed_symbol} & set(fixed))
+    if overlap:
+        raise ValueError(f"Decision variable(s) given as fixed values: {', '.join(overlap)}")
+
+    vc_lo, vc_hi = _validate_range("cutting speed", cutting_speed)
+    feed_lo, feed_hi = _validate_range("feed", feed)
+
+    graph = _optimizer_graph(category)
+    objective_symbol = RESULT_SYMBOLS[objective]
+    minimize = objective in _MINIMIZED_OBJECTIVES
+    constrained = set(limits.upper_bounds()) | ({"n"} if limits.min_rpm is not None else set())
+    targets = tuple(sorted({objective_symbol} | constrained))
+    fixed_values = {name: float(value) for name, value in fixed.items()}
+    # Eksik girdiler için erken ve açık hata
+    graph.plan(set(fixed_values) | {"Vc", feed_symbol}, targets)
+
+    best_score = -np.inf
+    best: Optional[Tuple[float, float]] = None
+    for _ in range(refine + 1):
+        vc_axis = np.linspace(vc_lo, vc_hi, grid)
+        feed_axis = np.linspace(feed_lo, feed_hi, grid)
+        known = {**fixed_values, "Vc": vc_axis[:, None], feed_symbol: feed_axis[None, :]}
+        score = np.broadcast_to(
+            _score(graph, known, targets, objective_symbol, minimize, limits), (grid, grid)
+        )
+
+        flat = int(np.argmax(score))
+        i, j = divmod(flat, grid)
+        if score[i, j] > best_score:
+            best_score = float(score[i, j])
+            best = (float(vc_axis[i]), float(feed_axis[j]))
+        if best is None:
+            break
+
+        # Aranan bölgeyi en iyi adayın komşu hücrelerine daralt
+        ci = int(np.abs(vc_axis - best[0]).argmin())
+        cj = int(np.abs(feed_axis - best[1]).argmin())
+        vc_lo, vc_hi = float(vc_axis[max(ci - 1, 0)]), float(vc_axis[min(ci + 1, grid - 1)])
+        feed_lo, feed_hi = float(feed_axis[max(cj - 1, 0)]), float(feed_axis[min(cj + 1, grid - 1)])
+
+    unit = graph.units.get(objective_symbol, "")
+    if best is None:
+        return OptimizationResult(
+            category=category,
+            objective=objective,
+            feasible=False,
+            value=float("nan"),
+            unit=unit,
+            inputs={"Vc": float("nan"), feed_symbol: float("nan")},
+        )
+
+    point = {**fixed_values, "Vc": best[0], feed_symbol: best[1]}
+    chain = graph.evaluate(point)
+    values = {symbol: float(value) for symbol, value in chain.values.items()}
+    binding: List[str] = []
+    for symbol, limit in limits.upper_bounds().items():
+        if values[symbol] >= limit * (1 - _BINDING_RTOL):
+            binding.append(symbol)
+    if limits.min_rpm is not None and values["n"] <= float(limits.min_rpm) * (1 + _BINDING_RTOL):
+        binding.append("n_min")
+
+    return OptimizationResult(
+        category=category,
+        objective=objective,
+        feasible=True,
+        value=values[objective_symbol],
+        unit=unit,
+        inputs={"Vc": best[0], feed_symbol: best[1]},
+        values=values,
+        units=dict(chain.units),
+        binding=tuple(binding),
+    )
@@ -0,0 +1,197 @@
+"""Parameter sweep (grid) evaluation over the formula registry.
+
+Evaluates a chosen set of outputs (e.g. ``Metal removal rate``, ``Net power``)
+over the cartesian product of per-parameter value ranges. Inputs that are
+neither axes nor fixed values are derived through the formula dependency
+graph (e.g. ``n`` from ``Vc`` and ``Dm``). Grid points are
+never materialized as Python tuples: each chunk derives its axis values from
+a flat index range with integer arithmetic, so memory stays bounded by
+``chunk_size`` plus the (optional) output arrays.
+
+Requires NumPy (``pip install machining-formulas[numeric]``).
+
+Example::
+
+    result = sweep(
+        "turning",
+        ["Metal removal rate", "Net power"],
+        {"Vc": np.linspace(80, 320, 200), "fn": np.linspace(0.05, 0.5, 200), "ap": np.linspace(0.5, 5, 50)},
+        fixed={"kc": 2100},
+    )
+    result.outputs["Net power"].shape  # (200, 200, 50)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from machining_formulas.core.formulas import FORMULA_REGISTRY, Formula
+from machining_formulas.core.graph import FormulaGraph
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+@dataclass(frozen=True)
+class SweepChunk:
+    """One evaluated slice ``[start, stop)`` of the flattened (C-order) grid."""
+
+    start: int
+    stop: int
+    inputs: Mapping[str, np.ndarray]
+    outputs: Mapping[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Full-grid outputs; each array has one dimension per axis, in axis order."""
+
+    category: str
+    axes: Mapping[str, np.ndarray]
+    outputs: Mapping[str, np.ndarray]
+    units: Mapping[str, str]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(values) for values in self.axes.values())
+
+
+@dataclass(frozen=True)
+class _SweepPlan:
+    category: str
+    axis_names: Tuple[str, ...]
+    axis_values: Tuple[np.ndarray, ...]
+    strides: Tuple[int, ...]
+    fixed: Mapping[str, float]
+    intermediates: Tuple[Formula, ...]
+    formulas: Tuple[Formula, ...]
+    total: int
+
+
+def _plan(
+    category: str,
+    outputs: Sequence[str],
+    axes: Mapping[str, Any],
+    fixed: Optional[Mapping[str, float]],
+    chunk_size: int,
+) -> _SweepPlan:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if category not in ("turning", "milling", "drilling"):
+        raise ValueError(f"Invalid calculation category key: {category}")
+    if not outputs:
+        raise ValueError("At least one output must be requested")
+    if not axes:
+        raise ValueError("At least one sweep axis is required")
+
+    category_formulas = FORMULA_REGISTRY[category]
+    formulas: List[Formula] = []
+    for key in outputs:
+        if key not in category_formulas:
+            raise ValueError(f"Invalid {category} calculation: {key}")
+        formulas.append(category_formulas[key])
+
+    fixed = dict(fixed or {})
+    overlap = set(fixed) & set(axes)
+    if overlap:
+        raise ValueError(f"Parameters given both as axis and fixed value: {', '.join(sorted(overlap))}")
+
+    axis_names = tuple(axes)
+    axis_values: List[np.ndarray] = []
+    for name in axis_names:
+        values = np.asarray(axes[name], dtype=float).ravel()
+        if values.size == 0:
+            raise ValueError(f"Sweep axis '{name}' is empty")
+        axis_values.append(values)
+
+    # Girdiler doğrudan eksen/sabit değilse bağımlılık grafiğinden türetilir
+    # (ör. Vc x Dm eksenlerinden 'Machining time' için n).
+    known = set(axis_names) | set(fixed)
+    needed = {p for formula in formulas for p in formula.params} - known
+    try:
+        intermediates = FormulaGraph.for_category(category).plan(known, needed)
+    except ValueError as exc:
+        raise ValueError(f"{exc}; add them as sweep axes or fixed values") from exc
+
+    strides: List[int] = []
+    stride = 1
+    for values in reversed(axis_values):
+        strides.append(stride)
+        stride *= len(values)
+    strides.reverse()
+
+    return _SweepPlan(
+        category=category,
+        axis_names=axis_names,
+        axis_values=tuple(axis_values),
+        strides=tuple(strides),
+        fixed={name: float(value) for name, value in fixed.items()},
+        intermediates=intermediates,
+        formulas=tuple(formulas),
+        total=stride,
+    )
+
+
+def _evaluate_chunk(plan: _SweepPlan, start: int, stop: int, dtype: Any) -> SweepChunk:
+    flat = np.arange(start, stop, dtype=np.int64)
+    inputs: Dict[str, np.ndarray] = {}
+    for name, values, stride in zip(plan.axis_names, plan.axis_values, plan.strides):
+        inputs[name] = values[(flat // stride) % len(values)]
+
+    env: Dict[str, Any] = {**plan.fixed, **inputs}
+    outputs: Dict[str, np.ndarray] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for formula in plan.intermediates:
+            env[formula.symbol] = formula.func(*(env[p] for p in formula.params))
+        for formula in plan.formulas:
+            value = formula.func(*(env[p] for p in formula.params))
+            outputs[formula.key] = np.broadcast_to(np.asarray(value, dtype=dtype), flat.shape)
+    return SweepChunk(start=start, stop=stop, inputs=inputs, outputs=outputs)
+
+
+def iter_sweep(
+    category: str,
+    outputs: Sequence[str],
+    axes: Mapping[str, Any],
+    fixed: Optional[Mapping[str, float]] = None,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: Any = np.float64,
+) -> Iterator[SweepChunk]:
+    """Yield the grid in bounded-size chunks (for reductions over huge grids)."""
+    plan = _plan(category, outputs, axes, fixed, chunk_size)
+    for start in range(0, plan.total, chunk_size):
+        yield _evaluate_chunk(plan, start, min(start + chunk_size, plan.total), dtype)
+
+
+def sweep(
+    category: str,
+    outputs: Sequence[str],
+    axes: Mapping[str, Any],
+    fixed: Optional[Mapping[str, float]] = None,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: Any = np.float64,
+) -> SweepResult:
+    """Evaluate ``outputs`` over the full grid and return compact N-d arrays.
+
+    Pass ``dtype=np.float32`` to halve the output memory on very large grids.
+    """
+    plan = _plan(category, outputs, axes, fixed, chunk_size)
+    shape = tuple(len(values) for values in plan.axis_values)
+    flat_outputs = {f.key: np.empty(plan.total, dtype=dtype) for f in plan.formulas}
+
+    for start in range(0, plan.total, chunk_size):
+        chunk = _evaluate_chunk(plan, start, min(start + chunk_size, plan.total), dtype)
+        for key, values in chunk.outputs.items():
+            flat_outputs[key][chunk.start:chunk.stop] = values
+
+    registry = FORMULA_REGISTRY[category]
+    return SweepResult(
+        category=category,
+        axes=dict(zip(plan.axis_names, plan.axis_values)),
+        outputs={key: values.reshape(shape) for key, values in flat_outputs.items()},
+        units={key: registry[key].result_unit for key in flat_outputs},
+    )
@@ -11,37 +11,50 @@ Not: Tam GUI özellikleri hedeflenmiyor; odak `handle_tool_calls()`.
 
 from __future__ import annotations
 
-import json
-import re
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-
-import requests
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple, Union
 
 from machining_formulas.core.engineering_calculator import EngineeringCalculator
-from machining_formulas.llm.material_utils import (
-    prepare_material_mass_arguments,
-)
-from machining_formulas.llm.ollama_utils import (
-    candidate_chat_urls,
-    prepare_legacy_chat_payload,
+from machining_formulas.llm.endpoint_cache import get_endpoint_cache, negotiated_chat_urls
+from machining_formulas.llm.hedging import HedgePolicy, ahedged_first, hedged_first
+from machining_formulas.llm.http_pool import get_default_pool
+from machining_formulas.llm.ollama_utils import prepare_legacy_chat_payload
+from machining_formulas.llm.response_cache import LLMResponseCache, get_response_cache
+from machining_formulas.llm.streaming import ChatStream, StreamStats
+from machining_formulas.llm.tool_executor import (
+    ToolRunResult,
+    build_partial_answer,
+    build_silent_model_summary,
+    collect_missing_params,
+    execute_tool,
+    format_value_with_unit,
+    parse_tool_arguments,
+    resolve_method_key,
+    run_calc_with_metadata,
+    run_tool_calls,
+    slugify,
 )
 
 
-def _slugify(text: str) -> str:
-    """Convert a calculation key like 'Cutting speed' -> 'cutting_speed'."""
-    lowered = text.strip().lower()
-    lowered = re.sub(r"[^a-z0-9]+", "_", lowered)
-    lowered = re.sub(r"_+", "_", lowered).strip("_")
-    return lowered
+# Araç döngüsü, G/Ç içermeyen (sans-IO) bir üreteç olarak yazılır: her model
+# çağrısında (url_candidates, payload, headers) verir ve (response_json, used_url,
+# used_legacy) alır. Senkron ve asyncio sürücüleri aynı akışı paylaşır.
+# İsteğe bağlı 4. öğe: zaman bütçesinden kalan süre (istek zaman aşımını sınırlar).
+_ChatRequest = Union[
+    Tuple[List[str], Dict[str, Any], Dict[str, str]],
+    Tuple[List[str], Dict[str, Any], Dict[str, str], Optional[float]],
+]
+_ChatReply = Tuple[Any, str, bool]
+_ChatFlow = Generator[_ChatRequest, _ChatReply, Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+
 
+DEFAULT_TOOL_TIME_BUDGET = 180.0
 
-@dataclass(slots=True)
-class _ToolRunResult:
-    tool_name: str
-    value: Optional[float]
-    unit: str
-    content: str
+# Geriye dönük uyumluluk için eski özel adlar
+_slugify = slugify
+_ToolRunResult = ToolRunResult
 
 
 class AdvancedCalculator:
@@ -56,24 +69,179 @@ class AdvancedCalculator:
         self.history: List[Dict[str, Any]] = []
         self.current_chat_url: Optional[str] = None
         self._last_tool_run_details: Optional[Dict[str, Any]] = None
+        # Araç turu sınırı ve tüm araç döngüsü için duvar saati bütçesi (saniye)
         self._tool_loop_limit: int = 4
+        self.tool_time_budget: Optional[float] = DEFAULT_TOOL_TIME_BUDGET
         self.debug_show_raw_model_responses: bool = False
         self.force_legacy_chat: bool = False
-        self._calculator = EngineeringCalculator()
+        # None: adaylar sırayla denenir; HedgePolicy: yavaş aday beklenmeden sıradaki ateşlenir
+        self.hedge: Optional[HedgePolicy] = None
+        self.last_hedge_winner: Optional[Dict[str, Any]] = None
+        # Ayarlıysa yanıt akış (stream) olarak alınır ve her metin parçasıyla çağrılır
+        # (çalışan iş parçacığından; GUI bunu Tk iş parçacığına kendisi taşımalı)
+        self.stream_callback: Optional[Callable[[str], None]] = None
+        self.last_stream_stats: Optional[StreamStats] = None
+        # Yanıt önbelleği: None ise süreç geneli (enable_response_cache) kullanılır
+        self.response_cache: Optional[LLMResponseCache] = None
+        self.bypass_response_cache: bool = False
+        self.refresh_response_cache: bool = False
+        self.last_response_cached: bool = False
+        self._calculator = self._new_calculator()
+
+    def fork(self) -> "AdvancedCalculator":
+        """New assistant with these settings and the same tool result cache.
+
+        Per-call state (``stream_callback``, ``last_*``, history) is not shared,
+        so concurrent background tasks each use their own fork.
+        """
+        other = AdvancedCalculator()
+        for name in (
+            "_tool_loop_limit",
+            "tool_time_budget",
+            "debug_show_raw_model_responses",
+            "force_legacy_chat",
+            "hedge",
+            "response_cache",
+            "bypass_response_cache",
+            "refresh_response_cache",
+        ):
+            if hasattr(self, name):
+                setattr(other, name, getattr(self, name))
+        # EngineeringCalculator önbelleği kilitli; iş parçacıkları arasında paylaşılabilir
+        other._calculator = self._get_calculator()
+        return other
+
+    @staticmethod
+    def _new_calculator() -> EngineeringCalculator:
+        # Aynı araç çağrıları (ör. workspace yeniden analizi) önbellekten döner.
+        calculator = EngineeringCalculator()
+        calculator.enable_cache()
+        return calculator
 
     def _get_calculator(self) -> EngineeringCalculator:
         if (
             not hasattr(self, "_calculator")
             or self._calculator is None  # type: ignore[attr-defined]
         ):
-            self._calculator = EngineeringCalculator()  # type: ignore[attr-defined]
+            self._calculator = self._new_calculator()  # type: ignore[attr-defined]
         return self._calculator  # type: ignore[return-value]
 
     # ---- Networking hooks (tests monkeypatch these) ----
 
     def _candidate_chat_urls(self, url: str) -> List[str]:
-        # Prefer /v1 first (tools), but allow forcing legacy order via flag.
-        return candidate_chat_urls(url, force_legacy_first=bool(getattr(self, "force_legacy_chat", False)))
+        # Prefer /v1 first (tools), but allow forcing legacy order via flag; otherwise
+        # the shared negotiation cache puts the flavor that last worked for the host first.
+        return negotiated_chat_urls(url, force_legacy_first=bool(getattr(self, "force_legacy_chat", False)))
+
+    def _post_chat_once(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout: float,
+        on_token: Optional[Callable[[str], None]] = None,
+        *,
+        cancel: Optional[threading.Event] = None,
+        on_stats: Optional[Callable[[StreamStats], None]] = None,
+    ) -> Any:
+        """One POST to ``url``; returns the parsed JSON or raises ``ValueError``.
+
+        With ``on_token`` or ``cancel`` the answer is streamed and the returned
+        JSON is the equivalent non-streaming body; its timings go to ``on_stats``.
+        Once ``cancel`` is set the response is closed at the next chunk (Ollama
+        then stops generating) and ``ValueError`` is raised.
+        """
+        import requests  # ağır bağımlılık; yalnızca ilk istekte yüklenir
+
+        if cancel is not None and cancel.is_set():
+            raise ValueError("İstek iptal edildi (başka aday kazandı)")
+        streamed = on_token is not None or cancel is not None
+        send_payload = prepare_legacy_chat_payload(payload) if "/api/chat" in url else payload
+        if streamed:
+            send_payload = {**send_payload, "stream": True}
+        started = time.perf_counter()
+        try:
+            resp = get_default_pool().post(
+                url,
+                json=send_payload,
+                headers=headers,
+                timeout=timeout,
+                **({"stream": True} if streamed else {}),
+            )
+            # Ollama: non-200 should fall back to next candidate
+            if resp.status_code != 200:
+                resp.close()
+                raise ValueError(f"HTTP {resp.status_code}: {resp.text}")
+            if streamed:
+                stream = ChatStream(
+                    resp.iter_lines(decode_unicode=True), started=started, on_close=resp.close, cancel=cancel
+                )
+                data = stream.consume(on_token)
+                if stream.cancelled:
+                    raise ValueError("İstek iptal edildi (başka aday kazandı)")
+                if on_stats is not None:
+                    on_stats(stream.stats)
+                return data
+        except requests.exceptions.Timeout as t_err:
+            raise ValueError(
+                f"Zaman aşımı (Ollama sunucusu {timeout} saniye içinde yanıt vermedi): {t_err}"
+            ) from t_err
+        except requests.exceptions.RequestException as req_err:
+            raise ValueError(f"Bağlantı Hatası (Ollama sunucusuna ulaşılamadı): {req_err}") from req_err
+        try:
+            return resp.json()
+        except ValueError as json_err:
+            raise ValueError(f"JSON Ayrıştırma Hatası (Geçersiz Yanıt): {json_err}") from json_err
+
+    async def _apost_chat_once(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout: float,
+    ) -> Any:
+        """Async ``_post_chat_once`` on the non-blocking transport."""
+        from machining_formulas.llm.async_http import get_default_client
+
+        client = getattr(self, "async_client", None) or get_default_client()
+        send_payload = prepare_legacy_chat_payload(payload) if "/api/chat" in url else payload
+        try:
+            resp = await client.post_json(url, send_payload, headers=headers, timeout=timeout)
+        except asyncio.TimeoutError as t_err:
+            raise ValueError(
+                f"Zaman aşımı (Ollama sunucusu {timeout} saniye içinde yanıt vermedi): {t_err}"
+            ) from t_err
+        except OSError as req_err:
+            raise ValueError(f"Bağlantı Hatası (Ollama sunucusuna ulaşılamadı): {req_err}") from req_err
+        if resp.status_code != 200:
+            raise ValueError(f"HTTP {resp.status_code}: {resp.text}")
+        try:
+            return resp.json()
+        except ValueError as json_err:
+            raise ValueError(f"JSON Ayrıştırma Hatası (Geçersiz Yanıt): {json_err}") from json_err
+
+    def _hedge_targets(
+        self, url_candidates: List[str], payload: Dict[str, Any]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """``(url, payload)`` attempts: first candidate, extra hosts/models, remaining candidates.
+
+        Alternates race right after the first URL because a slow host is
+        usually slow on both endpoint flavors; a fast failure still moves on
+        to the next flavor immediately.
+        """
+        policy: Optional[HedgePolicy] = getattr(self, "hedge", None)
+        if policy is None or not url_candidates:
+            return [(url, payload) for url in url_candidates]
+        targets = [(url_candidates[0], payload)]
+        for host in policy.extra_hosts:
+            # Diğer host'ta yalnızca o an tercih edilen endpoint türü yarışır
+            host_urls = self._candidate_chat_urls(host)
+            if host_urls and host_urls[0] not in url_candidates:
+                targets.append((host_urls[0], payload))
+        for model in policy.extra_models:
+            if model != payload.get("model"):
+                targets.append((url_candidates[0], {**payload, "model": model}))
+        return targets + [(url, payload) for url in url_candidates[1:]]
 
     def _post_chat_with_legacy_support(
         self,
@@ -84,37 +252,224 @@ class AdvancedCalculator:
     ) -> Tuple[Any, str, bool]:
         """Try candidate URLs until one succeeds.
 
-        Returns: (response_obj, used_url, used_legacy)
+        Returns: (response_json, used_url, used_legacy)
+        - response_json is the body parsed once (no second ``.json()`` later).
         - used_legacy=True means /api/chat payload compatibility applied.
+
+        With ``self.hedge`` set (a ``HedgePolicy``), a slow candidate does not
+        block the next one: it is fired after ``hedge.delay`` seconds and the
+        first valid response wins (see ``llm.hedging``).
+
+        With ``self.stream_callback`` set, responses are streamed; when hedging,
+        only the first attempt that produces text feeds the callback.
         """
-        last_error: Optional[Exception] = None
+        endpoints = get_endpoint_cache()
+        targets = self._hedge_targets(url_candidates, payload)
+        policy: Optional[HedgePolicy] = getattr(self, "hedge", None)
+        self.last_hedge_winner = None
+        stream_callback: Optional[Callable[[str], None]] = getattr(self, "stream_callback", None)
+        stream_owner: List[int] = []
+        owner_lock = threading.Lock()
+
+        def token_sink(index: int) -> Dict[str, Any]:
+            if stream_callback is None:
+                return {}
+            if policy is None:
+                return {"on_token": stream_callback}
+
+            def on_token(token: str) -> None:
+                # Yarışan denemelerin metinleri karışmasın: ilk akan deneme sahiplenir
+                with owner_lock:
+                    if not stream_owner:
+                        stream_owner.append(index)
+                    if stream_owner[0] != index:
+                        return
+                stream_callback(token)
+
+            return {"on_token": on_token}
+
+        # Yalnızca kazanan denemenin akış istatistikleri yayımlanır
+        attempt_stats: Dict[int, StreamStats] = {}
+
+        def attempt(
+            index: int, url: str, body: Dict[str, Any], cancel: Optional[threading.Event] = None
+        ) -> Any:
+            try:
+                data = self._post_chat_once(
+                    url,
+                    body,
+                    headers,
+                    timeout,
+                    **token_sink(index),
+                    cancel=cancel,
+                    on_stats=lambda stats: attempt_stats.__setitem__(index, stats),
+                )
+            except Exception:
+                # Başarısız deneme: bu host için o endpoint türü bir süre sona alınır
+                endpoints.record(url, False)
+                raise
+            endpoints.record(url, True)
+            return data
+
+        try:
+            if policy is not None and targets:
+                index, data = hedged_first(
+                    [
+                        lambda cancel, i=i, u=url, b=body: attempt(i, u, b, cancel)
+                        for i, (url, body) in enumerate(targets)
+                    ],
+                    delay=policy.delay,
+                    max_parallel=policy.max_parallel,
+                )
+                self.last_stream_stats = attempt_stats.get(index)
+                return self._hedge_result(targets, index, data)
+            last_error: Optional[Exception] = None
+            for i, (url, body) in enumerate(targets):
+                try:
+                    data = attempt(i, url, body)
+                    self.last_stream_stats = attempt_stats.get(i)
+                    return data, url, "/api/chat" in url
+                except Exception as exc:  # noqa: BLE001
+                    last_error = exc
+            if last_error:
+                raise last_error
+        except Exception as exc:
+            raise ValueError(f"Ollama isteği başarısız: {exc}") from exc
+        raise ValueError("Ollama isteği başarısız: uygun endpoint bulunamadı")
 
-        for url in url_candidates:
-            used_legacy = "/api/chat" in url
+    async def _apost_chat_with_legacy_support(
+        self,
+        url_candidates: List[str],
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        timeout: float = 60,
+    ) -> Tuple[Any, str, bool]:
+        """Async ``_post_chat_with_legacy_support``; hedged losers are cancelled."""
+        endpoints = get_endpoint_cache()
+        targets = self._hedge_targets(url_candidates, payload)
+        policy: Optional[HedgePolicy] = getattr(self, "hedge", None)
+        self.last_hedge_winner = None
+
+        async def attempt(url: str, body: Dict[str, Any]) -> Any:
             try:
-                send_payload = prepare_legacy_chat_payload(payload) if used_legacy else payload
-                resp = requests.post(url, json=send_payload, headers=headers, timeout=timeout)
-                # Ollama: non-200 should fall back to next candidate
-                if resp.status_code == 200:
-                    try:
-                        # Test if JSON parsing works
-                        resp.json()
-                        return resp, url, used_legacy
-                    except ValueError as json_err:
-                        last_error = ValueError(f"JSON Ayrıştırma Hatası (Geçersiz Yanıt): {json_err}")
-                else:
-                    last_error = ValueError(f"HTTP {resp.status_code}: {resp.text}")
-            except requests.exceptions.Timeout as t_err:
-                last_error = ValueError(f"Zaman aşımı (Ollama sunucusu {timeout} saniye içinde yanıt vermedi): {t_err}")
-            except requests.exceptions.RequestException as req_err:
-                last_error = ValueError(f"Bağlantı Hatası (Ollama sunucusuna ulaşılamadı): {req_err}")
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-
-        if last_error:
-            raise ValueError(f"Ollama isteği başarısız: {last_error}") from last_error
+                data = await self._apost_chat_once(url, body, headers, timeout)
+            except Exception:
+                endpoints.record(url, False)
+                raise
+            endpoints.record(url, True)
+            return data
+
+        try:
+            if policy is not None and targets:
+                index, data = await ahedged_first(
+                    [lambda u=url, b=body: attempt(u, b) for url, body in targets],
+                    delay=policy.delay,
+                    max_parallel=policy.max_parallel,
+                )
+                return self._hedge_result(targets, index, data)
+            last_error: Optional[Exception] = None
+            for url, body in targets:
+                try:
+                    return await attempt(url, body), url, "/api/chat" in url
+                except Exception as exc:  # noqa: BLE001
+                    last_error = exc
+            if last_error:
+                raise last_error
+        except Exception as exc:
+            raise ValueError(f"Ollama isteği başarısız: {exc}") from exc
         raise ValueError("Ollama isteği başarısız: uygun endpoint bulunamadı")
 
+    def _hedge_result(
+        self, targets: List[Tuple[str, Dict[str, Any]]], index: int, data: Any
+    ) -> Tuple[Any, str, bool]:
+        url, body = targets[index]
+        # Hangi aday kazandı (durum çubuğu / hata ayıklama için)
+        self.last_hedge_winner = {"attempt": index, "url": url, "model": body.get("model")}
+        return data, url, "/api/chat" in url
+
+    # ---- Flow drivers ----
+
+    @staticmethod
+    def _request_timeout(request: _ChatRequest, timeout: float) -> Tuple[_ChatRequest, float]:
+        # Akış, kalan zaman bütçesini isteğe 4. öğe olarak ekleyebilir
+        if len(request) > 3:
+            url_candidates, payload, headers, cap = request  # type: ignore[misc]
+            return (url_candidates, payload, headers), (min(timeout, cap) if cap is not None else timeout)
+        return request, timeout
+
+    def _response_cache(self) -> Optional[LLMResponseCache]:
+        if getattr(self, "bypass_response_cache", False):
+            return None
+        # ``or`` kullanılamaz: boş önbellek __len__ nedeniyle yanlış (falsy) sayılır
+        cache = getattr(self, "response_cache", None)
+        return cache if cache is not None else get_response_cache()
+
+    def _cached_reply(self, request: _ChatRequest) -> Optional[_ChatReply]:
+        """Reply for ``request`` from the response cache (streamed to ``stream_callback`` as one piece)."""
+        self.last_response_cached = False
+        cache = self._response_cache()
+        if cache is None or getattr(self, "refresh_response_cache", False):
+            return None
+        url_candidates, payload, _headers = request
+        hit = cache.lookup(
+            payload.get("model", ""), payload.get("messages", []), payload.get("tools"), url_candidates
+        )
+        if hit is None:
+            return None
+        data, url = hit
+        self.last_response_cached = True
+        stream_callback = getattr(self, "stream_callback", None)
+        text = str(self._extract_assistant_message(data).get("content") or "")
+        if stream_callback is not None and text:
+            stream_callback(text)
+        return data, url, "/api/chat" in url
+
+    def _remember_reply(self, request: _ChatRequest, reply: _ChatReply) -> None:
+        cache = self._response_cache()
+        data, url, _used_legacy = reply
+        if cache is None or not isinstance(data, dict):
+            return
+        _urls, payload, _headers = request
+        # Yarışı ek bir model kazandıysa yanıt o modelin anahtarına yazılır
+        winner = getattr(self, "last_hedge_winner", None) or {}
+        model = winner.get("model") or payload.get("model", "")
+        cache.store(model, payload.get("messages", []), payload.get("tools"), url, data)
+
+    def _run_flow(self, flow: _ChatFlow, timeout: float) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        try:
+            request = next(flow)
+            while True:
+                args, request_timeout = self._request_timeout(request, timeout)
+                reply = self._cached_reply(args)
+                if reply is None:
+                    try:
+                        reply = self._post_chat_with_legacy_support(*args, timeout=request_timeout)
+                    except Exception as exc:
+                        # Akış, bütçe dolmuşsa hatayı kısmi yanıta çevirebilir
+                        request = flow.throw(exc)
+                        continue
+                    self._remember_reply(args, reply)
+                request = flow.send(reply)
+        except StopIteration as stop:
+            return stop.value
+
+    async def _arun_flow(self, flow: _ChatFlow, timeout: float) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        try:
+            request = next(flow)
+            while True:
+                args, request_timeout = self._request_timeout(request, timeout)
+                reply = self._cached_reply(args)
+                if reply is None:
+                    try:
+                        reply = await self._apost_chat_with_legacy_support(*args, timeout=request_timeout)
+                    except Exception as exc:
+                        request = flow.throw(exc)
+                        continue
+                    self._remember_reply(args, reply)
+                request = flow.send(reply)
+        except StopIteration as stop:
+            return stop.value
+
     def chat_with_tools(
         self,
         chat_url: str,
@@ -124,7 +479,43 @@ class AdvancedCalculator:
         *,
         timeout: int = 60,
     ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
-        """Send a tool-enabled chat request; if tool_calls come back, execute them once."""
+        """Send a tool-enabled chat request; tool_calls are executed for up to
+        ``_tool_loop_limit`` rounds within ``tool_time_budget`` seconds."""
+        return self._run_flow(self._chat_flow(chat_url, model, messages_history, tools_definition), timeout)
+
+    async def achat_with_tools(
+        self,
+        chat_url: str,
+        model: str,
+        messages_history: List[Dict[str, Any]],
+        tools_definition: List[Dict[str, Any]],
+        *,
+        timeout: float = 60,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Async ``chat_with_tools``: does not block the event loop, cancellable.
+
+        ``timeout`` applies per HTTP request; concurrency is capped by the
+        shared async client (or ``self.async_client`` when set).
+        """
+        flow = self._chat_flow(chat_url, model, messages_history, tools_definition)
+        return await self._arun_flow(flow, timeout)
+
+    def _deadline(self) -> Optional[float]:
+        budget = getattr(self, "tool_time_budget", None)
+        return time.perf_counter() + budget if budget else None
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+
+    def _chat_flow(
+        self,
+        chat_url: str,
+        model: str,
+        messages_history: List[Dict[str, Any]],
+        tools_definition: List[Dict[str, Any]],
+    ) -> _ChatFlow:
+        deadline = self._deadline()
         url_candidates = self._candidate_chat_urls(chat_url)
 
         payload: Dict[str, Any] = {
@@ -135,25 +526,25 @@ class AdvancedCalculator:
         }
         headers = {"Content-Type": "application/json"}
 
-        response, used_url, _used_legacy = self._post_chat_with_legacy_support(
-            url_candidates,
-            payload,
-            headers,
-            timeout=timeout,
-        )
+        started = time.perf_counter()
+        response, used_url, _used_legacy = yield (url_candidates, payload, headers, self._remaining(deadline))
+        first_model_ms = (time.perf_counter() - started) * 1000.0
         self.current_chat_url = used_url
 
         assistant_message = self._extract_assistant_message(response)
         tool_calls = assistant_message.get("tool_calls") or []
 
         if tool_calls:
-            return self.handle_tool_calls(
-                used_url,
-                model,
-                list(messages_history),
-                tool_calls,
-                tools_definition,
-                timeout=timeout,
+            return (
+                yield from self._tool_calls_flow(
+                    used_url,
+                    model,
+                    list(messages_history),
+                    tool_calls,
+                    tools_definition,
+                    deadline=deadline,
+                    first_model_ms=first_model_ms,
+                )
             )
 
         updated_history = list(messages_history) + [assistant_message]
@@ -173,87 +564,160 @@ class AdvancedCalculator:
     ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """Execute tool calls, append tool outputs, then ask the model for follow-up.
 
-        `messages_history` listesi MUTATE edilmez.
+        Follow-ups that request more tools run further rounds (see
+        ``_tool_calls_flow``). `messages_history` listesi MUTATE edilmez.
         """
+        flow = self._tool_calls_flow(
+            chat_url, model, messages_history, tool_calls, _tools_definition, deadline=self._deadline()
+        )
+        return self._run_flow(flow, timeout)
 
+    async def ahandle_tool_calls(
+        self,
+        chat_url: str,
+        model: str,
+        messages_history: List[Dict[str, Any]],
+        tool_calls: List[Dict[str, Any]],
+        _tools_definition: List[Dict[str, Any]],
+        *,
+        timeout: float = 60,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Async ``handle_tool_calls``."""
+        flow = self._tool_calls_flow(
+            chat_url, model, messages_history, tool_calls, _tools_definition, deadline=self._deadline()
+        )
+        return await self._arun_flow(flow, timeout)
+
+    def _tool_calls_flow(
+        self,
+        chat_url: str,
+        model: str,
+        messages_history: List[Dict[str, Any]],
+        tool_calls: List[Dict[str, Any]],
+        tools_definition: Optional[List[Dict[str, Any]]] = None,
+        *,
+        deadline: Optional[float] = None,
+        first_model_ms: Optional[float] = None,
+    ) -> _ChatFlow:
+        """Run tool rounds until the model answers in text.
+
+        Stops after ``_tool_loop_limit`` rounds or when ``deadline`` passes;
+        then the answer is built from the tool results gathered so far. Each
+        round's latency lands in ``_last_tool_run_details["rounds"]``.
+        """
         if hasattr(self, "_candidate_chat_urls"):
             url_candidates = self._candidate_chat_urls(chat_url)
         else:
             url_candidates = [chat_url]
+        headers = {"Content-Type": "application/json"}
+        round_limit = max(int(getattr(self, "_tool_loop_limit", 4) or 1), 1)
 
-        assistant_tool_call_msg: Dict[str, Any] = {
-            "role": "assistant",
-            "content": "",
-            "tool_calls": tool_calls,
-        }
-
-        tool_messages: List[Dict[str, Any]] = []
+        conversation: List[Dict[str, Any]] = list(messages_history)
         results: List[_ToolRunResult] = []
         errors: List[str] = []
+        rounds: List[Dict[str, Any]] = []
+        stopped = "completed"
+        model_text = ""
+        assistant_message: Optional[Dict[str, Any]] = None
 
-        for call in tool_calls:
-            tool_call_id = call.get("id")
-            fn = (call.get("function") or {}).get("name")
-            raw_args = (call.get("function") or {}).get("arguments", {})
-
-            try:
-                arguments = self._parse_tool_arguments(raw_args)
-                tool_result = self._execute_tool(fn, arguments, messages_history)
-                results.append(tool_result)
-                content = tool_result.content
-            except Exception as exc:  # noqa: BLE001 - tool execution should be resilient
-                msg = str(exc)
-                errors.append(msg)
-                content = f"HATA: {msg}"
-
-            tool_msg: Dict[str, Any] = {
-                "role": "tool",
-                "tool_call_id": tool_call_id,
-                "content": content,
+        for round_no in range(1, round_limit + 1):
+            assistant_tool_call_msg: Dict[str, Any] = {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": tool_calls,
             }
-            tool_messages.append(tool_msg)
-
-            # Global history'ye de tool sonucunu yaz (testler bunu bekliyor)
-            if getattr(self, "history", None) is None:
-                self.history = []  # type: ignore[assignment]
-            self.history.append(tool_msg)
-
-        # Model follow-up çağrısı
-        messages_for_model = (
-            list(messages_history) + [assistant_tool_call_msg] + tool_messages
-        )
-        payload = {
-            "model": model,
-            "messages": messages_for_model,
-            "stream": False,
-        }
-
-        headers = {"Content-Type": "application/json"}
+            round_info: Dict[str, Any] = {"round": round_no, "tool_calls": len(tool_calls)}
+            if round_no == 1 and first_model_ms is not None:
+                round_info["request_ms"] = first_model_ms
+            rounds.append(round_info)
+
+            # Aynı çağrılar bir kez çalışır; sonuçlar çağrı sırasıyla döner
+            tools_started = time.perf_counter()
+            outcomes = run_tool_calls(
+                tool_calls,
+                lambda fn, raw_args: self._execute_tool(
+                    fn, self._parse_tool_arguments(raw_args), conversation
+                ),
+            )
+            round_info["tools_ms"] = (time.perf_counter() - tools_started) * 1000.0
 
-        response, used_url, _used_legacy = self._post_chat_with_legacy_support(
-            url_candidates,
-            payload,
-            headers,
-            timeout=timeout,
-        )
+            tool_messages: List[Dict[str, Any]] = []
+            for outcome in outcomes:
+                if outcome.result is not None:
+                    results.append(outcome.result)
+                else:
+                    errors.append(str(outcome.error))
 
-        self.current_chat_url = used_url
+                tool_msg: Dict[str, Any] = {
+                    "role": "tool",
+                    "tool_call_id": outcome.tool_call_id,
+                    "content": outcome.content,
+                }
+                tool_messages.append(tool_msg)
+
+                # Global history'ye de tool sonucunu yaz (testler bunu bekliyor)
+                if getattr(self, "history", None) is None:
+                    self.history = []  # type: ignore[assignment]
+                self.history.append(tool_msg)
+            conversation += [assistant_tool_call_msg] + tool_messages
+
+            remaining = self._remaining(deadline)
+            if remaining is not None and remaining <= 0:
+                stopped = "time_budget"
+                break
+
+            # Model follow-up çağrısı; son turda araç sunulmaz (model metinle yanıtlamalı)
+            payload: Dict[str, Any] = {
+                "model": model,
+                "messages": list(conversation),
+                "stream": False,
+            }
+            if tools_definition and round_no < round_limit:
+                payload["tools"] = tools_definition
 
-        assistant_message = self._extract_assistant_message(response)
+            model_started = time.perf_counter()
+            try:
+                response, used_url, _used_legacy = yield (url_candidates, payload, headers, remaining)
+            except Exception:
+                round_info["model_ms"] = (time.perf_counter() - model_started) * 1000.0
+                if deadline is None or self._remaining(deadline) > 0:
+                    raise
+                stopped = "time_budget"  # istek bütçe dolduğu için kesildi
+                break
+            round_info["model_ms"] = (time.perf_counter() - model_started) * 1000.0
+            self.current_chat_url = used_url
+
+            assistant_message = self._extract_assistant_message(response)
+            tool_calls = assistant_message.get("tool_calls") or []
+            if not tool_calls:
+                break
+            model_text = str(assistant_message.get("content") or "")
+            assistant_message = None
+            if round_no == round_limit:
+                stopped = "round_limit"
+            else:
+                if hasattr(self, "_candidate_chat_urls"):
+                    url_candidates = self._candidate_chat_urls(used_url)
+                else:
+                    url_candidates = [used_url]
 
-        # Model sessizse (content boş) - özet üret
-        if not str(assistant_message.get("content", "")).strip():
+        if stopped != "completed":
+            if stopped == "time_budget":
+                reason = "Zaman bütçesi doldu"
+            else:
+                reason = f"Araç turu sınırına ({round_limit}) ulaşıldı"
+            assistant_message = {
+                "role": "assistant",
+                "content": self._build_partial_answer(results, errors, reason, model_text),
+            }
+        elif assistant_message is None or not str(assistant_message.get("content", "")).strip():
+            # Model sessizse (content boş) - özet üret
             assistant_message = {
                 "role": "assistant",
                 "content": self._build_silent_model_summary(results, errors),
             }
 
-        updated_history = (
-            list(messages_history)
-            + [assistant_tool_call_msg]
-            + tool_messages
-            + [assistant_message]
-        )
+        updated_history = conversation + [assistant_message]
 
         self._last_tool_run_details = {
             "results": [
@@ -266,19 +730,16 @@ class AdvancedCalculator:
                 for r in results
             ],
             "errors": errors,
+            "rounds": rounds,
+            "stopped": stopped,
         }
 
         return assistant_message, updated_history
 
+    # ---- Tool execution (headless logic lives in llm.tool_executor) ----
+
     def _parse_tool_arguments(self, raw_args: Any) -> Dict[str, Any]:
-        if isinstance(raw_args, dict):
-            return raw_args
-        if isinstance(raw_args, str):
-            raw_args = raw_args.strip()
-            if not raw_args:
-                return {}
-            return json.loads(raw_args)
-        return {}
+        return parse_tool_arguments(raw_args)
 
     def _execute_tool(
         self,
@@ -286,97 +747,14 @@ class AdvancedCalculator:
         arguments: Dict[str, Any],
         messages_history: Optional[Iterable[Dict[str, Any]]],
     ) -> _ToolRunResult:
-        if not tool_name:
-            raise ValueError("Tool adı boş")
-
-        calc = self._get_calculator()
-
-        if tool_name == "calculate_material_mass":
-            params = prepare_material_mass_arguments(calc, arguments, messages_history)
-            mass_g = calc.calculate_material_mass(
-                params.shape_key,
-                params.density,
-                *(params.dimensions + [params.length]),
-            )
-            content = f"{mass_g:.2f} g"
-            return _ToolRunResult(
-                tool_name=tool_name,
-                value=float(mass_g),
-                unit="g",
-                content=content,
-            )
-
-        if tool_name.startswith("calculate_turning_"):
-            method_slug = tool_name.removeprefix("calculate_turning_")
-            method_key = self._resolve_method_key(
-                calc.turning_definitions.keys(),
-                method_slug,
-            )
-            value, unit = self._run_calc_with_metadata(
-                calc,
-                "turning",
-                method_key,
-                arguments,
-            )
-            content = self._format_value_with_unit(value, unit)
-            return _ToolRunResult(
-                tool_name=tool_name,
-                value=value,
-                unit=unit,
-                content=content,
-            )
-
-        if tool_name.startswith("calculate_milling_"):
-            method_slug = tool_name.removeprefix("calculate_milling_")
-            method_key = self._resolve_method_key(
-                calc.milling_definitions.keys(),
-                method_slug,
-            )
-            value, unit = self._run_calc_with_metadata(
-                calc,
-                "milling",
-                method_key,
-                arguments,
-            )
-            content = self._format_value_with_unit(value, unit)
-            return _ToolRunResult(
-                tool_name=tool_name,
-                value=value,
-                unit=unit,
-                content=content,
-            )
-
-        if tool_name.startswith("calculate_drilling_"):
-            method_slug = tool_name.removeprefix("calculate_drilling_")
-            method_key = self._resolve_method_key(
-                calc.drilling_definitions.keys(),
-                method_slug,
-            )
-            value, unit = self._run_calc_with_metadata(
-                calc,
-                "drilling",
-                method_key,
-                arguments,
-            )
-            content = self._format_value_with_unit(value, unit)
-            return _ToolRunResult(
-                tool_name=tool_name,
-                value=value,
-                unit=unit,
-                content=content,
-            )
-
-        raise ValueError(f"Bilinmeyen tool: {tool_name}")
+        return execute_tool(self._get_calculator(), tool_name, arguments, messages_history)
 
     def _resolve_method_key(
         self,
         method_keys: Iterable[str],
         slug: str,
     ) -> str:
-        lookup = {_slugify(k): k for k in method_keys}
-        if slug not in lookup:
-            raise ValueError(f"Geçersiz hesap anahtarı: {slug}")
-        return lookup[slug]
+        return resolve_method_key(method_keys, slug)
 
     def _run_calc_with_metadata(
         self,
@@ -385,37 +763,13 @@ class AdvancedCalculator:
         method_key: str,
         arguments: Dict[str, Any],
     ) -> Tuple[float, str]:
-        param_meta = calc.get_calculation_params(category, method_key)
-        args: List[float] = []
-
-        for p in param_meta:
-            name = p["name"]
-            if name not in arguments:
-                raise ValueError(f"'{name}' parametresi eksik")
-            try:
-                args.append(float(arguments[name]))
-            except (TypeError, ValueError) as exc:
-                raise ValueError(f"'{name}' sayısal olmalıdır") from exc
-
-        if category == "turning":
-            result = calc.calculate_turning(method_key, *args)
-        elif category == "milling":
-            result = calc.calculate_milling(method_key, *args)
-        elif category == "drilling":
-            result = calc.calculate_drilling(method_key, *args)
-        else:
-            raise ValueError(f"Desteklenmeyen kategori: {category}")
-
-        return float(result["value"]), str(result.get("units", ""))
+        return run_calc_with_metadata(calc, category, method_key, arguments)
 
     def _format_value_with_unit(self, value: float, unit: str) -> str:
-        # Testler 2 ondalık bekliyor (ör: 157.08)
-        unit = unit.strip()
-        if unit:
-            return f"{value:.2f} {unit}"
-        return f"{value:.2f}"
+        return format_value_with_unit(value, unit)
 
     def _extract_assistant_message(self, response: Any) -> Dict[str, Any]:
+        # Taşıma katmanı gövdeyi bir kez ayrıştırıp dict verir; yanıt nesneleri de kabul edilir
         payload = response.json() if hasattr(response, "json") else response
         if isinstance(payload, dict):
             if "message" in payload and isinstance(payload["message"], dict):
@@ -426,44 +780,21 @@ class AdvancedCalculator:
                     return msg
         return {"role": "assistant", "content": ""}
 
-    def _build_silent_model_summary(
+    def _build_partial_answer(
         self,
         results: List[_ToolRunResult],
         errors: List[str],
+        reason: str,
+        model_text: str = "",
     ) -> str:
-        if errors:
-            missing = self._collect_missing_params(errors)
-            missing_text = ", ".join(missing) if missing else "(bilinmiyor)"
-            return (
-                "Model yanıt vermedi. Araç çağrısında hata oluştu; "
-                f"eksik parametreleri kontrol edin: {missing_text}."
-            )
+        return build_partial_answer(results, errors, reason, model_text)
 
-        # Başarılı: özellikle kütle aracında g ve kg birlikte göster
-        lines: List[str] = ["Araç sonuçları başarıyla alındı:"]
-        for r in results:
-            if r.unit == "g" and r.value is not None:
-                kg = r.value / 1000.0
-                lines.append(f"- {r.content} ({kg:.3f} kg)")
-            else:
-                lines.append(f"- {r.content}")
-        return "\n".join(lines)
+    def _build_silent_model_summary(
+        self,
+        results: List[_ToolRunResult],
+        errors: List[str],
+    ) -> str:
+        return build_silent_model_summary(results, errors)
 
     def _collect_missing_params(self, errors: List[str]) -> List[str]:
-        missing: List[str] = []
-        for e in errors:
-            for pattern in (
-                r"'([^']+)' parametresi eksik",
-                r"'([^']+)'\s*\(mm\)\s*parametresi eksik",
-            ):
-                for match in re.finditer(pattern, e):
-                    missing.append(match.group(1))
-        # unique preserving order
-        seen = set()
-        out: List[str] = []
-        for m in missing:
-            if m in seen:
-                continue
-            seen.add(m)
-            out.append(m)
-        return out
+        return collect_missing_params(errors)
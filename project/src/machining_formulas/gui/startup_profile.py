@@ -0,0 +1,104 @@
+"""Startup-time profiler for the V3 GUI (``--profile-startup``).
+
+Records nested, named phases (imports, style setup, each tab, image decode,
+...) and point-in-time marks (first paint, first idle) relative to one
+origin, and writes them as a JSON report. Stdlib only, no Tk dependency.
+When disabled every call is a no-op, so the GUI can keep the hooks in its
+normal startup path.
+
+Example::
+
+    profiler = StartupProfiler()
+    with profiler.phase("styles"):
+        setup_styles()
+    profiler.mark("first_paint")
+    profiler.write("startup_profile.json")
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+DEFAULT_REPORT_PATH = "startup_profile.json"
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    start_ms: float
+    duration_ms: float
+    depth: int
+    parent: Optional[str]
+
+
+class StartupProfiler:
+    """Collects phase durations and marks in milliseconds since ``origin``."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+        origin: Optional[float] = None,
+    ):
+        self.enabled = enabled
+        self._clock = clock
+        self.origin = clock() if origin is None else origin
+        self.phases: List[PhaseTiming] = []
+        self.marks: Dict[str, float] = {}
+        self._stack: List[str] = []
+
+    def _now_ms(self) -> float:
+        return (self._clock() - self.origin) * 1000.0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; phases may nest."""
+        if not self.enabled:
+            yield
+            return
+        parent = self._stack[-1] if self._stack else None
+        record = PhaseTiming(name, self._now_ms(), 0.0, len(self._stack), parent)
+        self.phases.append(record)  # başlangıç sırasına göre raporlanır
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            record.duration_ms = self._now_ms() - record.start_ms
+
+    def record(self, name: str, seconds: float, start: Optional[float] = None) -> None:
+        """Add a phase measured elsewhere (``start`` on the profiler clock)."""
+        if not self.enabled:
+            return
+        start_ms = (start - self.origin) * 1000.0 if start is not None else self._now_ms() - seconds * 1000.0
+        parent = self._stack[-1] if self._stack else None
+        self.phases.append(PhaseTiming(name, start_ms, seconds * 1000.0, len(self._stack), parent))
+
+    def mark(self, name: str) -> None:
+        """Record the first time ``name`` happens."""
+        if self.enabled and name not in self.marks:
+            self.marks[name] = self._now_ms()
+
+    def report(self) -> Dict[str, Any]:
+        top_level = [p for p in self.phases if p.depth == 0]
+        return {
+            "total_ms": self._now_ms() if self.enabled else 0.0,
+            "top_level_ms": sum(p.duration_ms for p in top_level),
+            "phases": [asdict(p) for p in self.phases],
+            "marks": dict(self.marks),
+        }
+
+    def write(self, path: str | Path = DEFAULT_REPORT_PATH) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+# GUI kancaları profil kapalıyken bunu kullanır
+DISABLED = StartupProfiler(enabled=False)
@@ -0,0 +1,166 @@
+"""Background tasks for the Tk GUI (model calls off the main thread).
+
+Blocking work (Ollama requests with 10–120 s timeouts) runs on daemon worker
+threads; results come back through a ``queue.Queue`` that the Tk loop polls
+with ``root.after``, so every callback runs on the Tk thread and the UI stays
+responsive. Tk widgets must never be touched from the worker function.
+
+A task may also report progress (e.g. streamed text): ``submit(...,
+on_progress=cb)`` passes a thread-safe ``report`` callable to the worker, and
+``cb`` receives the latest reported value on the next poll (intermediate
+values reported within one poll interval are coalesced).
+
+Cancelling a task discards its result: the HTTP request itself cannot be
+interrupted, but its thread is a daemon and its callbacks never run.
+
+Example::
+
+    runner = TaskRunner(root, on_change=show_progress)
+    runner.submit("Modeller yenileniyor", get_available_models, url, on_done=apply_models)
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_POLL_MS = 100
+
+
+@dataclass
+class BackgroundTask:
+    id: int
+    name: str
+    started: float
+    on_done: Optional[Callable[[Any], None]] = None
+    on_error: Optional[Callable[[BaseException], None]] = None
+    on_progress: Optional[Callable[[Any], None]] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+
+class TaskRunner:
+    """Runs callables on worker threads and delivers results on the Tk thread."""
+
+    def __init__(
+        self,
+        root: Any,
+        *,
+        poll_ms: int = DEFAULT_POLL_MS,
+        on_change: Optional[Callable[[List[BackgroundTask]], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_change = on_change
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._results: "queue.Queue[Tuple[BackgroundTask, bool, Any]]" = queue.Queue()
+        self._active: Dict[int, BackgroundTask] = {}
+        self._progress: Dict[int, Any] = {}
+        self._progress_lock = threading.Lock()
+        self._polling = False
+
+    @property
+    def active(self) -> List[BackgroundTask]:
+        return list(self._active.values())
+
+    def is_running(self, name: str) -> bool:
+        return any(task.name == name for task in self._active.values())
+
+    def elapsed(self, task: BackgroundTask) -> float:
+        return self._clock() - task.started
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        on_progress: Optional[Callable[[Any], None]] = None,
+        **kwargs: Any,
+    ) -> BackgroundTask:
+        """Run ``func(*args, **kwargs)`` in the background; callbacks run on the Tk thread.
+
+        With ``on_progress``, ``func`` is also given ``report=`` (callable from the worker).
+        """
+        task = BackgroundTask(next(self._ids), name, self._clock(), on_done, on_error, on_progress)
+        self._active[task.id] = task
+        if on_progress is not None:
+            kwargs["report"] = lambda value: self._report(task, value)
+
+        def work() -> None:
+            try:
+                value = func(*args, **kwargs)
+            except BaseException as exc:  # noqa: BLE001 - hata Tk iş parçacığına taşınır
+                self._results.put((task, False, exc))
+            else:
+                self._results.put((task, True, value))
+
+        threading.Thread(target=work, name=f"mf-task-{task.id}", daemon=True).start()
+        self._notify()
+        self._schedule()
+        return task
+
+    def _report(self, task: BackgroundTask, value: Any) -> None:
+        if task.cancelled:
+            return
+        with self._progress_lock:
+            self._progress[task.id] = value  # yalnızca en son değer teslim edilir
+
+    def cancel(self, task: Optional[BackgroundTask] = None) -> List[BackgroundTask]:
+        """Cancel ``task`` (or every active task); returns the cancelled tasks."""
+        targets = [task] if task is not None else self.active
+        cancelled = []
+        for t in targets:
+            if self._active.pop(t.id, None) is not None:
+                t.cancel_event.set()
+                cancelled.append(t)
+        if cancelled:
+            self._notify()
+        return cancelled
+
+    def poll(self) -> None:
+        """Deliver finished results (called from the Tk loop)."""
+        self._polling = False
+        try:
+            with self._progress_lock:
+                progress, self._progress = self._progress, {}
+            for task_id, value in progress.items():
+                task = self._active.get(task_id)
+                if task is not None and task.on_progress is not None:
+                    task.on_progress(value)
+            while True:
+                try:
+                    task, ok, value = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if self._active.pop(task.id, None) is None:
+                    continue  # iptal edildi: sonuç yok sayılır
+                callback = task.on_done if ok else task.on_error
+                if callback is not None:
+                    callback(value)
+                elif not ok:
+                    raise value  # Tk'nin report_callback_exception'ına gider
+        finally:
+            # Bir geri çağırma hata verse bile kalan sonuçlar teslim edilsin
+            self._notify()
+            if self._active or not self._results.empty():
+                self._schedule()
+
+    def _schedule(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self.poll)
+
+    def _notify(self) -> None:
+        if self.on_change is not None:
+            self.on_change(self.active)
@@ -0,0 +1,147 @@
+"""Pre-resized header/popup images cached on disk and in memory.
+
+The first launch decodes each PNG with Pillow, LANCZOS-resizes it to the
+requested size and stores the result under the user cache directory, keyed
+by source path, size, mtime and requested size. Later launches load the
+small PNG straight into ``tk.PhotoImage`` (no Pillow import, no resize), and
+repeated hovers reuse the in-memory ``PhotoImage``.
+
+Example::
+
+    thumbnails = ThumbnailCache()
+    header = thumbnails.photo(path, height=HEADER_HEIGHT)
+    popup = thumbnails.photo(path, box=POPUP_MAX_SIZE)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import tempfile
+import tkinter as tk
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+HEADER_HEIGHT = 120
+POPUP_MAX_SIZE = 480
+
+# Yeniden boyutlandırma mantığı değişirse artırın (eski küçük resimler geçersiz olur)
+CACHE_VERSION = 1
+
+CACHE_DIR_ENV = "MACHINING_FORMULAS_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory for thumbnails (``$MACHINING_FORMULAS_CACHE_DIR`` overrides)."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "machining_formulas" / "thumbnails"
+
+
+def target_size(
+    width: int,
+    height: int,
+    *,
+    fit_height: Optional[int] = None,
+    box: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Aspect-preserving size: exactly ``fit_height`` tall, or fitted into a ``box`` square."""
+    if fit_height is not None:
+        return max(int(width * fit_height / height), 1), fit_height
+    if box is not None:
+        ratio = min(box / width, box / height)
+        return max(int(width * ratio), 1), max(int(height * ratio), 1)
+    raise ValueError("Either fit_height or box must be given")
+
+
+def _spec_tag(height: Optional[int], box: Optional[int]) -> str:
+    if height is not None:
+        return f"h{height}"
+    if box is not None:
+        return f"box{box}"
+    raise ValueError("Either height or box must be given")
+
+
+class ThumbnailCache:
+    """Disk + ``PhotoImage`` cache of resized images."""
+
+    def __init__(self, cache_dir: Optional[str | Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self._photos: Dict[Tuple[str, str], Any] = {}
+        # Pillow ile yapılan çözme/yeniden boyutlandırma sayısı (ölçüm ve test için)
+        self.renders = 0
+
+    def thumbnail(
+        self, source: str | Path, *, height: Optional[int] = None, box: Optional[int] = None
+    ) -> Path:
+        """Path of the resized PNG for ``source``; rendered on a cache miss."""
+        source = Path(source)
+        tag = _spec_tag(height, box)
+        stat = source.stat()
+        raw = f"{CACHE_VERSION}|{source.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{tag}"
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+        name = f"{source.stem}-{tag}-{digest}.png"
+
+        target = self.cache_dir / name
+        if target.exists():
+            return target
+        try:
+            self._render(source, target, height, box)
+        except OSError:
+            # Önbellek dizini yazılamıyorsa geçici dizine düş
+            target = Path(tempfile.gettempdir()) / "machining_formulas-thumbnails" / name
+            if not target.exists():
+                self._render(source, target, height, box)
+        return target
+
+    def _render(self, source: Path, target: Path, height: Optional[int], box: Optional[int]) -> None:
+        from PIL import Image
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as image:
+            size = target_size(*image.size, fit_height=height, box=box)
+            resized = image.resize(size, Image.Resampling.LANCZOS)
+        self.renders += 1
+
+        # Atomik yazım: yarım dosya başka bir süreç tarafından okunmasın
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                resized.save(handle, format="PNG")
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        # Aynı görselin aynı boyuttaki eski sürümlerini temizle
+        for stale in target.parent.glob(f"{source.stem}-{_spec_tag(height, box)}-*.png"):
+            if stale != target:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def photo(self, source: str | Path, *, height: Optional[int] = None, box: Optional[int] = None) -> Any:
+        """Cached ``PhotoImage`` of the resized image (needs a Tk root)."""
+        key = (str(source), _spec_tag(height, box))
+        photo = self._photos.get(key)
+        if photo is None:
+            path = self.thumbnail(source, height=height, box=box)
+            try:
+                photo = tk.PhotoImage(file=str(path))
+            except tk.TclError:
+                # PNG desteği olmayan eski Tk sürümleri
+                from PIL import Image, ImageTk
+
+                with Image.open(path) as image:
+                    photo = ImageTk.PhotoImage(image)
+            self._photos[key] = photo
+        return photo
@@ -2,7 +2,7 @@
 
 Bu modül Tkinter tabanlı V3 arayüzünü sağlar.
 - Tornalama/Frezeleme: dropdown -> seçime göre dinamik parametre formu
-- Her sekmenin üstünde PNG header (Pillow yok, tk.PhotoImage)
+- Her sekmenin üstünde PNG header (diskte önbelleklenmiş küçük resim, tk.PhotoImage)
 - Çalışma alanı: WorkspaceBuffer + WorkspaceEditor
 """
 
@@ -12,40 +12,69 @@ Bu modül Tkinter tabanlı V3 arayüzünü sağlar.
 
 from __future__ import annotations
 
+import argparse
 import json
 import re
+import sqlite3
+import sys
 import tkinter as tk
+from contextlib import contextmanager
 from pathlib import Path
 from tkinter import filedialog, messagebox
 from tkinter import ttk
-from typing import Any, Dict, List, Optional
-from PIL import Image, ImageTk
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence
 
 from machining_formulas.assets import asset_path
 from machining_formulas.core.engineering_calculator import EngineeringCalculator
 from machining_formulas.gui.advanced_calculator import AdvancedCalculator
 from machining_formulas.gui.execute_mode import ExecuteModeMixin
+from machining_formulas.gui.startup_profile import DEFAULT_REPORT_PATH, DISABLED, StartupProfiler
+from machining_formulas.gui.task_runner import BackgroundTask, TaskRunner
+from machining_formulas.gui.thumbnail_cache import HEADER_HEIGHT, POPUP_MAX_SIZE, ThumbnailCache
 from machining_formulas.llm.ollama_utils import build_calculator_tools_definition, normalize_chat_url
 from machining_formulas.llm.ollama_utils_v2 import (
     get_available_models,
     single_chat_request,
     test_connection,
 )
+from machining_formulas.llm.response_cache import enable_response_cache
 from machining_formulas.workspace.workspace_buffer import WorkspaceBuffer
 from machining_formulas.workspace.workspace_editor import WorkspaceEditor
 
+if TYPE_CHECKING:
+    from PIL import ImageTk
+
 
 DEFAULT_WINDOW_SIZE: tuple[int, int] = (1400, 900)
 SUPPORTED_PROMPT_ATTACHMENT_EXTENSIONS: set[str] = {".txt", ".md", ".py", ".c", ".cpp"}
 
 # Global instance
 ec = EngineeringCalculator()
+ec.enable_cache()
 
 
 class V3Calculator(ExecuteModeMixin):
     """V3 Calculator with workspace buffer interface."""
 
-    def __init__(self, root: tk.Tk, tooltips: Dict[str, str]):
+    # Başlangıç profili kapalıyken tüm kancalar no-op
+    _profiler: StartupProfiler = DISABLED
+    _on_startup_complete: Optional[Callable[[], None]] = None
+    # Arka plan iş yürütücüsü; yoksa (testler) işler eşzamanlı çalışır
+    _task_runner: Optional[TaskRunner] = None
+    # Model önerileri akış olarak alınır ve öneri panelinde parça parça gösterilir
+    _stream_model_responses: bool = True
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        tooltips: Dict[str, str],
+        *,
+        profiler: Optional[StartupProfiler] = None,
+        on_startup_complete: Optional[Callable[[], None]] = None,
+    ):
+        if profiler is not None:
+            self._profiler = profiler
+        self._on_startup_complete = on_startup_complete
         self.root = root
         self.root.withdraw()  # macOS ve diger platformlarda baslangictaki kucuk/konumsuz pencereyi gizle
         self.tooltips = tooltips
@@ -55,6 +84,8 @@ class V3Calculator(ExecuteModeMixin):
 
         # Keep references to PhotoImage instances
         self._header_images: Dict[str, ImageTk.PhotoImage | tk.PhotoImage] = {}
+        # Önceden boyutlandırılmış başlık/popup görselleri (disk + bellek)
+        self._thumbnails = ThumbnailCache()
 
         # State containers for dynamic calculation UIs (turning/milling)
         self._dynamic_calc_state: Dict[str, dict] = {}
@@ -72,13 +103,19 @@ class V3Calculator(ExecuteModeMixin):
         self.ollama_models: List[str] = []
 
         # Cache frequently used data for performance
-        self._initialize_cached_data()
+        with self._profiler.phase("cached_data"):
+            self._initialize_cached_data()
 
         # Setup UI
-        self.setup_ui()
+        with self._profiler.phase("setup_ui"):
+            self.setup_ui()
+
+        # Model çağrıları Tk ana iş parçacığını bloklamasın
+        self._task_runner = TaskRunner(self.root, on_change=self._on_background_tasks_changed)
 
         # Force UI update before geometry calculations
-        self.root.update_idletasks()
+        with self._profiler.phase("update_idletasks"):
+            self.root.update_idletasks()
         self._apply_default_geometry()
 
         # Initialize model connection asynchronously to prevent startup UI freezing
@@ -110,16 +147,20 @@ class V3Calculator(ExecuteModeMixin):
         self.root.title("🔧 Mühendislik Hesaplayıcı V3 - Çalışma Alanı")
 
         # Configure styles first (before creating widgets)
-        self._setup_styles()
+        with self._profiler.phase("styles"):
+            self._setup_styles()
 
         # Create main layout first
-        self._create_main_layout()
+        with self._profiler.phase("main_layout"):
+            self._create_main_layout()
 
         # Create menu bar
-        self._create_menu_bar()
+        with self._profiler.phase("menu_bar"):
+            self._create_menu_bar()
 
         # Create status bar
-        self._create_status_bar()
+        with self._profiler.phase("status_bar"):
+            self._create_status_bar()
 
         # Configure focus and keyboard handling after widgets are created
         self.root.focus_set()
@@ -222,10 +263,13 @@ class V3Calculator(ExecuteModeMixin):
         self.paned_window = ttk.PanedWindow(main_container, orient="horizontal")
         self.paned_window.pack(fill="both", expand=True, padx=5, pady=5)
 
-        self._create_calculation_panel()
-        self._create_workspace_panel()
+        with self._profiler.phase("calculation_panel"):
+            self._create_calculation_panel()
+        with self._profiler.phase("workspace_panel"):
+            self._create_workspace_panel()
 
-        self.paned_window.update_idletasks()
+        with self._profiler.phase("layout_idletasks"):
+            self.paned_window.update_idletasks()
 
     def _create_calculation_panel(self):
         """Create calculation tools panel."""
@@ -274,20 +318,47 @@ class V3Calculator(ExecuteModeMixin):
         self._create_calculation_categories(calc_frame)
 
     def _create_calculation_categories(self, parent):
-        """Create calculation categories and tools."""
+        """Create calculation categories and tools.
+
+        Sekme içerikleri (görsel başlık + dinamik form) ilk seçildiklerinde
+        kurulur; başlangıçta yalnızca görünen sekme inşa edilir.
+        """
         self.calc_notebook = ttk.Notebook(parent)
         self.calc_notebook.pack(fill="both", expand=True, padx=5, pady=5)
 
-        self._create_turning_tab()
-        self._create_milling_tab()
-        self._create_material_tab()
-        self._create_drilling_tab()
+        # Notebook sekme kimliği (widget yolu) -> henüz çağrılmamış kurucu
+        self._pending_tab_builders: Dict[str, Callable[[ttk.Frame], None]] = {}
+        for text, build in (
+            ("Tornalama", self._create_turning_tab),
+            ("Frezeleme", self._create_milling_tab),
+            ("Malzeme", self._create_material_tab),
+            ("Delme", self._create_drilling_tab),
+        ):
+            frame = ttk.Frame(self.calc_notebook, style="Calc.TFrame")
+            self.calc_notebook.add(frame, text=text)
+            self._pending_tab_builders[str(frame)] = build
 
-    def _create_turning_tab(self):
-        """Create turning calculations tab."""
-        turning_frame = ttk.Frame(self.calc_notebook, style="Calc.TFrame")
-        self.calc_notebook.add(turning_frame, text="Tornalama")
+        self.calc_notebook.bind("<<NotebookTabChanged>>", self._on_calc_tab_changed, add="+")
+        self._ensure_calc_tab_built(self.calc_notebook.select())
 
+    def _on_calc_tab_changed(self, event=None):
+        """Build the newly selected tab on first visit (mouse, Ctrl+1..4, traversal)."""
+        self._ensure_calc_tab_built(self.calc_notebook.select())
+
+    def _ensure_calc_tab_built(self, tab_id: str) -> bool:
+        """Build the tab ``tab_id`` if it is still pending; True if it was built now."""
+        build = self._pending_tab_builders.pop(str(tab_id), None)
+        if build is None:
+            return False
+        frame = self.calc_notebook.nametowidget(str(tab_id))
+        with self._profiler.phase(build.__name__):
+            build(frame)
+        # Odak yönetimi (1 sn sonra kurulur) sonradan eklenen widget'ları da kapsasın
+        self._enable_widget_focus(frame)
+        return True
+
+    def _create_turning_tab(self, turning_frame: ttk.Frame):
+        """Create turning calculations tab."""
         self._add_tab_header(
             turning_frame, image_filename="turning.png", fallback_text="Tornalama"
         )
@@ -299,11 +370,8 @@ class V3Calculator(ExecuteModeMixin):
             state_key="turning",
         )
 
-    def _create_milling_tab(self):
+    def _create_milling_tab(self, milling_frame: ttk.Frame):
         """Create milling calculations tab."""
-        milling_frame = ttk.Frame(self.calc_notebook, style="Calc.TFrame")
-        self.calc_notebook.add(milling_frame, text="Frezeleme")
-
         self._add_tab_header(
             milling_frame, image_filename="milling.png", fallback_text="Frezeleme"
         )
@@ -315,11 +383,8 @@ class V3Calculator(ExecuteModeMixin):
             state_key="milling",
         )
 
-    def _create_material_tab(self):
+    def _create_material_tab(self, material_frame: ttk.Frame):
         """Create material calculations tab."""
-        material_frame = ttk.Frame(self.calc_notebook, style="Calc.TFrame")
-        self.calc_notebook.add(material_frame, text="Malzeme")
-
         self._add_tab_header(
             material_frame, image_filename="material.png", fallback_text="Malzeme"
         )
@@ -384,11 +449,8 @@ class V3Calculator(ExecuteModeMixin):
             pady=2
         )
 
-    def _create_drilling_tab(self):
+    def _create_drilling_tab(self, drilling_frame: ttk.Frame):
         """Create drilling calculations tab."""
-        drilling_frame = ttk.Frame(self.calc_notebook, style="Calc.TFrame")
-        self.calc_notebook.add(drilling_frame, text="Delme")
-
         self._add_tab_header(
             drilling_frame, image_filename="drilling.png", fallback_text="Delme"
         )
@@ -409,20 +471,19 @@ class V3Calculator(ExecuteModeMixin):
         header_frame = ttk.Frame(parent, style="Calc.TFrame")
         header_frame.pack(fill="x", padx=5, pady=(5, 0))
 
-        canvas = tk.Canvas(header_frame, height=120, highlightthickness=0, bg="white", cursor="hand2")
+        canvas = tk.Canvas(
+            header_frame, height=HEADER_HEIGHT, highlightthickness=0, bg="white", cursor="hand2"
+        )
         canvas.pack(fill="x", expand=False)
 
         image_path = self._assets_image_path(image_filename)
         if image_path.exists():
             try:
-                pil_img = Image.open(image_path)
-                # Resize image to fit height=120 while keeping aspect ratio
-                h_size = 120
-                w_percent = h_size / pil_img.size[1]
-                w_size = int(pil_img.size[0] * w_percent)
-                pil_img_resized = pil_img.resize((w_size, h_size), Image.Resampling.LANCZOS)
-                
-                photo = ImageTk.PhotoImage(pil_img_resized)
+                with self._profiler.phase(f"image_decode:{image_filename}"):
+                    # İlk açılışta Pillow ile 120 px yüksekliğe küçültülüp diske yazılır;
+                    # sonraki açılışlarda hazır küçük PNG doğrudan yüklenir
+                    photo = self._thumbnails.photo(image_path, height=HEADER_HEIGHT)
+                w_size = photo.width()
                 self._header_images[str(image_path)] = photo
 
                 canvas.update_idletasks()
@@ -450,16 +511,9 @@ class V3Calculator(ExecuteModeMixin):
                             pass
                     
                     try:
-                        # Orijinal gorseli yukle ve maksimum 480x480 olacak sekilde en-boy oranini koruyarak olcekle
-                        pil_img_large = Image.open(image_path)
-                        max_size = 480
-                        w_l, h_l = pil_img_large.size
-                        ratio = min(max_size / w_l, max_size / h_l)
-                        new_w = int(w_l * ratio)
-                        new_h = int(h_l * ratio)
-                        pil_img_large_resized = pil_img_large.resize((new_w, new_h), Image.Resampling.LANCZOS)
-                        
-                        photo_large = ImageTk.PhotoImage(pil_img_large_resized)
+                        # Maksimum 480x480 (en-boy oranı korunur); önbellekten, tekrar çözülmez
+                        photo_large = self._thumbnails.photo(image_path, box=POPUP_MAX_SIZE)
+                        new_w, new_h = photo_large.width(), photo_large.height()
                         
                         # Sadece gorsel ve baslik barindiran çerçevesiz (borderless) premium pencere
                         popup = tk.Toplevel(self.root)
@@ -519,7 +573,7 @@ class V3Calculator(ExecuteModeMixin):
                 setattr(canvas, "on_leave", on_leave)
                 return
             except Exception as e:
-                print(f"Error loading image {image_filename} with Pillow: {e}")
+                print(f"Error loading image {image_filename}: {e}")
 
         canvas.create_rectangle(0, 0, 5000, 120, fill="#f5f7fb", outline="")
         canvas.create_text(
@@ -611,7 +665,7 @@ class V3Calculator(ExecuteModeMixin):
             return
 
         try:
-            param_details = ec.get_calculation_params(state["category"], method_key)
+            param_details = ec.get_param_info(state["category"], method_key)
         except Exception as exc:
             ttk.Label(params_frame, text=f"Parametreler yüklenemedi: {exc}", foreground="red").pack(
                 padx=10, pady=10
@@ -626,18 +680,18 @@ class V3Calculator(ExecuteModeMixin):
             row = ttk.Frame(params_frame, style="Calc.TFrame")
             row.pack(fill="x", pady=2, padx=5)
 
-            label_text = p.get("display_text_turkish") or p["name"]
+            label_text = p.display_text_turkish or p.name
             ttk.Label(row, text=f"{label_text}:", width=22).pack(side="left")
 
             entry = ttk.Entry(row, width=15)
             entry.pack(side="left", padx=(5, 0))
             entry.bind("<Return>", lambda _e, sk=state_key: self._dynamic_calc_calculate(sk))
 
-            unit = p.get("unit", "")
+            unit = p.unit
             if unit:
                 ttk.Label(row, text=unit).pack(side="left", padx=(5, 0))
 
-            state["param_entries"][p["name"]] = entry
+            state["param_entries"][p.name] = entry
 
     def _dynamic_calc_calculate(self, state_key: str) -> None:
         """Calculate the selected dynamic calculation using core parameter metadata."""
@@ -651,12 +705,12 @@ class V3Calculator(ExecuteModeMixin):
             return
 
         try:
-            param_details = ec.get_calculation_params(state["category"], method_key)
+            param_details = ec.get_param_info(state["category"], method_key)
             args: List[float] = []
             params_dict: Dict[str, float] = {}
 
             for p in param_details:
-                name = p["name"]
+                name = p.name
                 entry = state["param_entries"].get(name)
                 if entry is None:
                     raise ValueError(f"Eksik parametre alanı: {name}")
@@ -847,8 +901,13 @@ class V3Calculator(ExecuteModeMixin):
         self.status_var = tk.StringVar()
         self.status_var.set("Hazır")
 
-        status_label = ttk.Label(self.status_frame, textvariable=self.status_var, relief="sunken")
-        status_label.pack(fill="x", padx=2, pady=2)
+        self._status_label = ttk.Label(self.status_frame, textvariable=self.status_var, relief="sunken")
+        self._status_label.pack(fill="x", padx=2, pady=2)
+
+        # Yalnızca arka planda bir model çağrısı sürerken görünür
+        self._cancel_button = ttk.Button(
+            self.status_frame, text="✖ İptal", width=8, command=self._cancel_background_tasks
+        )
 
     def _update_mass_params(self, event=None):
         """Update mass calculation parameters based on shape."""
@@ -919,7 +978,7 @@ class V3Calculator(ExecuteModeMixin):
             shape_key = self.current_shape_key
             density = float(self.mass_density.get())
 
-            param_names = ec.get_shape_parameters(shape_key)
+            param_names = ec.get_shape_param_names(shape_key)
             param_values = []
 
             for param_name in param_names:
@@ -981,6 +1040,16 @@ class V3Calculator(ExecuteModeMixin):
             messagebox.showwarning("Uyarı", "Lütfen önce model URL'sini ve model seçin.")
             return
 
+        def on_tool_error(e: BaseException) -> None:
+            self.workspace_editor.clear_streaming_text()
+            messagebox.showerror("Hata", f"Tool yanıtı alınamadı: {str(e)}")
+            self.update_status_bar("Tool yanıtı başarısız")
+
+        def on_suggestion_error(e: BaseException) -> None:
+            self.workspace_editor.clear_streaming_text()
+            messagebox.showerror("Hata", f"Model önerisi alınamadı: {str(e)}")
+            self.update_status_bar("Model önerisi başarısız")
+
         # Eğer metin bir hesap sorusu gibi görünüyorsa: tools ile yanıtla
         if self._should_use_tools_for_text(context):
             try:
@@ -1013,35 +1082,52 @@ class V3Calculator(ExecuteModeMixin):
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": context},
                 ]
+                # Görev başına kopya: akış geri çağrısı ve son istek istatistikleri
+                # aynı anda çalışan diğer model görevleriyle karışmasın
+                assistant = self._tool_assistant.fork()
+                model_name = self.current_model_name
+
+                def ask_with_tools(report: Optional[Callable[[str], None]] = None) -> str:
+                    # Arka plan iş parçacığı: Tk widget'larına dokunulmaz
+                    with self._streaming_to(assistant, report):
+                        assistant_msg, _updated = assistant.chat_with_tools(
+                            chat_url,
+                            model_name,
+                            messages,
+                            tools_def,
+                            timeout=60,
+                        )
 
-                assistant_msg, _updated = self._tool_assistant.chat_with_tools(
-                    chat_url,
-                    self.current_model_name,
-                    messages,
-                    tools_def,
-                    timeout=60,
+                    answer = str(assistant_msg.get("content", "")).strip() or "(boş yanıt)"
+
+                    # Bazı modeller tools varken bile doğrudan (ve bazen yanlış birimle)
+                    # yanıt verebiliyor.
+                    # Bu durumda sık sorulan kalıplar için yerel/araç tabanlı fallback uygula.
+                    fallback = self._try_local_tool_fallback(context, messages, answer)
+                    return fallback or answer
+
+                def on_answer(answer: str) -> None:
+                    # Workspace'e ekle (append şeklinde)
+                    self.workspace_editor.clear_streaming_text()
+                    current_content = self.workspace_editor.get_current_content()
+                    separator = "\n\n" if current_content.strip() else ""
+                    suffix = f"{separator}Soru: {context}\nYanıt: {answer}\n"
+                    self.workspace_buffer.suggest_edit(len(current_content), len(current_content), suffix)
+                    self.workspace_editor._show_suggestions()
+
+                    self.update_status_bar("Tool yanıtı eklendi" + self._stream_timing_suffix(assistant))
+
+                self._run_in_background(
+                    "Hesaplama (tool) yanıtı hazırlanıyor",
+                    ask_with_tools,
+                    on_done=on_answer,
+                    on_error=on_tool_error,
+                    on_progress=self._show_streaming_text if self._stream_model_responses else None,
                 )
-
-                answer = str(assistant_msg.get("content", "")).strip() or "(boş yanıt)"
-
-                # Bazı modeller tools varken bile doğrudan (ve bazen yanlış birimle) yanıt verebiliyor.
-                # Bu durumda sık sorulan kalıplar için yerel/araç tabanlı fallback uygula.
-                fallback = self._try_local_tool_fallback(context, messages, answer)
-                if fallback:
-                    answer = fallback
-
-                # Workspace'e ekle (append şeklinde)
-                current_content = self.workspace_editor.get_current_content()
-                suffix = ("\n\n" if current_content.strip() else "") + f"Soru: {context}\nYanıt: {answer}\n"
-                self.workspace_buffer.suggest_edit(len(current_content), len(current_content), suffix)
-                self.workspace_editor._show_suggestions()
-
-                self.update_status_bar("Tool yanıtı eklendi")
                 return
 
             except Exception as e:
-                messagebox.showerror("Hata", f"Tool yanıtı alınamadı: {str(e)}")
-                self.update_status_bar("Tool yanıtı başarısız")
+                on_tool_error(e)
                 return
 
         # Aksi halde: mevcut davranış (metni iyileştir)
@@ -1071,25 +1157,34 @@ class V3Calculator(ExecuteModeMixin):
                 {"role": "user", "content": prompt},
             ]
 
-            assistant_msg, _updated = self._tool_assistant.chat_with_tools(
+            assistant = self._tool_assistant.fork()
+
+            def on_suggestion(assistant_msg: Dict[str, Any]) -> None:
+                response = str(assistant_msg.get("content", "")).strip() or context
+
+                self.workspace_editor.clear_streaming_text()
+                current_content = self.workspace_editor.get_current_content()
+                self.workspace_buffer.suggest_edit(0, len(current_content), response)
+
+                self.workspace_editor._show_suggestions()
+                self.update_status_bar("Model önerisi eklendi" + self._stream_timing_suffix(assistant))
+
+            self._run_in_background(
+                "Model önerisi isteniyor",
+                self._chat_with_tools_message,
+                assistant,
                 chat_url,
                 self.current_model_name,
                 messages,
                 tools_def,
-                timeout=120,
+                120,
+                on_done=on_suggestion,
+                on_error=on_suggestion_error,
+                on_progress=self._show_streaming_text if self._stream_model_responses else None,
             )
 
-            response = str(assistant_msg.get("content", "")).strip() or context
-
-            current_content = self.workspace_editor.get_current_content()
-            self.workspace_buffer.suggest_edit(0, len(current_content), response)
-
-            self.workspace_editor._show_suggestions()
-            self.update_status_bar("Model önerisi eklendi")
-
         except Exception as e:
-            messagebox.showerror("Hata", f"Model önerisi alınamadı: {str(e)}")
-            self.update_status_bar("Model önerisi başarısız")
+            on_suggestion_error(e)
 
     def _try_local_tool_fallback(
         self,
@@ -1203,6 +1298,10 @@ class V3Calculator(ExecuteModeMixin):
             messagebox.showwarning("Uyarı", "Lütfen önce model URL'sini ve model seçin.")
             return
 
+        def on_analysis_error(e: BaseException) -> None:
+            messagebox.showerror("Hata", f"Analiz sırasında hata: {str(e)}")
+            self.update_status_bar("Analiz başarısız")
+
         try:
             self.update_status_bar("Çalışma alanı (tool destekli) analiz ediliyor...")
 
@@ -1239,22 +1338,91 @@ class V3Calculator(ExecuteModeMixin):
                 {"role": "user", "content": user_prompt},
             ]
 
-            assistant_msg, _updated = self._tool_assistant.chat_with_tools(
+            def on_analysis(assistant_msg: Dict[str, Any]) -> None:
+                response = (
+                    str(assistant_msg.get("content", "")).strip()
+                    or "Analiz sonucunda modelden geçerli bir yanıt alınamadı."
+                )
+
+                self._show_analysis_result(response)
+                self.update_status_bar("Analiz tamamlandı")
+
+            self._run_in_background(
+                "Çalışma alanı analiz ediliyor",
+                self._chat_with_tools_message,
+                self._tool_assistant.fork(),
                 chat_url,
                 self.current_model_name,
                 messages,
                 tools_def,
-                timeout=120,
+                120,
+                on_done=on_analysis,
+                on_error=on_analysis_error,
             )
 
-            response = str(assistant_msg.get("content", "")).strip() or "Analiz sonucunda modelden geçerli bir yanıt alınamadı."
+        except Exception as e:
+            on_analysis_error(e)
+
+    @staticmethod
+    def _chat_with_tools_message(
+        assistant: AdvancedCalculator,
+        chat_url: str,
+        model_name: str,
+        messages: List[Dict[str, Any]],
+        tools_def: List[Dict[str, Any]],
+        timeout: int,
+        report: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Blocking tool-chat round trip (runs on a worker thread)."""
+        with V3Calculator._streaming_to(assistant, report):
+            assistant_msg, _updated = assistant.chat_with_tools(
+                chat_url,
+                model_name,
+                messages,
+                tools_def,
+                timeout=timeout,
+            )
+        return assistant_msg
 
-            self._show_analysis_result(response)
-            self.update_status_bar("Analiz tamamlandı")
+    @staticmethod
+    @contextmanager
+    def _streaming_to(
+        assistant: AdvancedCalculator, report: Optional[Callable[[str], None]]
+    ) -> Iterator[None]:
+        """Stream ``assistant``'s answer, reporting the text received so far (worker thread).
 
-        except Exception as e:
-            messagebox.showerror("Hata", f"Analiz sırasında hata: {str(e)}")
-            self.update_status_bar("Analiz başarısız")
+        ``assistant`` must belong to this task alone (see ``AdvancedCalculator.fork``).
+        """
+        if report is None:
+            yield
+            return
+        parts: List[str] = []
+
+        def on_token(token: str) -> None:
+            parts.append(token)
+            report("".join(parts))
+
+        assistant.stream_callback = on_token
+        try:
+            yield
+        finally:
+            assistant.stream_callback = None
+
+    def _show_streaming_text(self, text: str) -> None:
+        """Render partial model output in the suggestions panel (Tk thread)."""
+        self.workspace_editor.show_streaming_text(text)
+
+    @staticmethod
+    def _stream_timing_suffix(assistant: AdvancedCalculator) -> str:
+        if getattr(assistant, "last_response_cached", False):
+            cache = assistant._response_cache()
+            rate = f", isabet oranı %{cache.stats().hit_rate * 100:.0f}" if cache is not None else ""
+            return f" (önbellekten{rate})"
+        stats = getattr(assistant, "last_stream_stats", None)
+        if stats is None or stats.total_ms is None:
+            return ""
+        ttft = f"ilk parça {stats.ttft_ms:.0f} ms, " if stats.ttft_ms is not None else ""
+        return f" ({ttft}toplam {stats.total_ms / 1000:.1f} sn)"
 
     def _show_analysis_result(self, result_text: str):
         """Show analysis result in a beautiful scrollable dialog."""
@@ -1366,25 +1534,35 @@ class V3Calculator(ExecuteModeMixin):
             text_area.configure(state=tk.DISABLED)
             dialog.update()
 
+            def on_refreshed(new_response: Any) -> None:
+                if text_area.winfo_exists():  # diyalog bu arada kapatılmış olabilir
+                    self._populate_analysis_text(text_area, str(new_response))
+                self.update_status_bar("Yeniden analiz tamamlandı")
+
+            def on_refresh_error(ex: BaseException) -> None:
+                if text_area.winfo_exists():
+                    text_area.configure(state=tk.NORMAL)
+                    text_area.insert(
+                        tk.END, f"\n❌ Yeniden analiz sırasında hata oluştu:\n{str(ex)}", "bold"
+                    )
+                    text_area.configure(state=tk.DISABLED)
+                self.update_status_bar("Yeniden analiz başarısız")
+
             try:
                 self.update_status_bar("Çalışma alanı yeniden analiz ediliyor...")
                 content = self.workspace_editor.get_current_content()
                 context = f"Bu mühendislik çalışma alanını analiz et ve öneriler sun: {content}"
 
-                new_response = single_chat_request(
-                    self.current_model_url,
-                    self.current_model_name,
-                    context,
-                    timeout=120,
-                )
+                model_url, model_name = self.current_model_url, self.current_model_name
 
-                self._populate_analysis_text(text_area, str(new_response))
-                self.update_status_bar("Yeniden analiz tamamlandı")
+                self._run_in_background(
+                    "Çalışma alanı yeniden analiz ediliyor",
+                    lambda: single_chat_request(model_url, model_name, context, timeout=120),
+                    on_done=on_refreshed,
+                    on_error=on_refresh_error,
+                )
             except Exception as ex:
-                text_area.configure(state=tk.NORMAL)
-                text_area.insert(tk.END, f"\n❌ Yeniden analiz sırasında hata oluştu:\n{str(ex)}", "bold")
-                text_area.configure(state=tk.DISABLED)
-                self.update_status_bar("Yeniden analiz başarısız")
+                on_refresh_error(ex)
 
         # Action Button Frame
         btn_frame = tk.Frame(main_frame, bg="#f8f9fa")
@@ -1601,42 +1779,58 @@ class V3Calculator(ExecuteModeMixin):
                 messagebox.showerror("Hata", f"Dışa aktarma hatası: {str(e)}")
 
     def refresh_model_list(self):
-        """Refresh available models."""
+        """Refresh available models (in the background)."""
         try:
             model_url = self.model_url_entry.get().strip()
             self.current_model_url = model_url
+            self._run_in_background(
+                "Modeller yenileniyor",
+                get_available_models,
+                model_url,
+                on_done=self._apply_model_list,
+                on_error=self._on_model_list_error,
+            )
+        except Exception as e:
+            self._on_model_list_error(e)
 
-            self.ollama_models = get_available_models(model_url)
+    def _apply_model_list(self, models: List[str]) -> None:
+        self.ollama_models = models
+        self._profiler.mark("model_list_ready")
 
-            if self.ollama_models:
-                self.model_selection_combo["values"] = self.ollama_models
-                if not self.current_model_name or self.current_model_name not in self.ollama_models:
-                    self.model_selection_combo.set(self.ollama_models[0])
-                    self.current_model_name = self.ollama_models[0]
-                else:
-                    self.model_selection_combo.set(self.current_model_name)
-                self.update_status_bar(f"Modeller yenilendi: {len(self.ollama_models)} model bulundu")
+        if self.ollama_models:
+            self.model_selection_combo["values"] = self.ollama_models
+            if not self.current_model_name or self.current_model_name not in self.ollama_models:
+                self.model_selection_combo.set(self.ollama_models[0])
+                self.current_model_name = self.ollama_models[0]
             else:
-                # Hata/bağlantı yok durumunda fallback modeller atanmalıdır
-                fallback_models = ["llama3", "gemma2", "mistral"]
-                self.model_selection_combo["values"] = fallback_models
-                self.model_selection_combo.set(fallback_models[0])
-                self.current_model_name = fallback_models[0]
-                self.update_status_bar("Model bağlantısı kurulamadı; varsayılan model listesi (fallback) yüklendi.")
-
-        except Exception as e:
+                self.model_selection_combo.set(self.current_model_name)
+            self.update_status_bar(f"Modeller yenilendi: {len(self.ollama_models)} model bulundu")
+        else:
+            # Hata/bağlantı yok durumunda fallback modeller atanmalıdır
             fallback_models = ["llama3", "gemma2", "mistral"]
             self.model_selection_combo["values"] = fallback_models
             self.model_selection_combo.set(fallback_models[0])
             self.current_model_name = fallback_models[0]
-            messagebox.showerror("Hata", f"Modeller alınırken hata oluştu: {str(e)}")
-            self.update_status_bar("Model yenileme başarısız, varsayılan liste atandı")
+            self.update_status_bar(
+                "Model bağlantısı kurulamadı; varsayılan model listesi (fallback) yüklendi."
+            )
+
+    def _on_model_list_error(self, e: BaseException) -> None:
+        fallback_models = ["llama3", "gemma2", "mistral"]
+        self.model_selection_combo["values"] = fallback_models
+        self.model_selection_combo.set(fallback_models[0])
+        self.current_model_name = fallback_models[0]
+        messagebox.showerror("Hata", f"Modeller alınırken hata oluştu: {str(e)}")
+        self.update_status_bar("Model yenileme başarısız, varsayılan liste atandı")
 
     def test_model_connection(self):
         """Test connection to model with detailed Turkish troubleshooting."""
-        try:
-            model_url = self.model_url_entry.get().strip()
-            if test_connection(model_url):
+        def on_error(e: BaseException) -> None:
+            messagebox.showerror("Hata", f"Bağlantı testi sırasında beklenmeyen hata: {str(e)}")
+            self.update_status_bar("Bağlantı testi başarısız")
+
+        def on_done(connected: bool) -> None:
+            if connected:
                 messagebox.showinfo("Bağlantı Başarılı", "Ollama sunucusuna bağlantı başarılı!")
                 self.update_status_bar("Bağlantı başarılı")
             else:
@@ -1649,14 +1843,73 @@ class V3Calculator(ExecuteModeMixin):
                     "3. Bilgisayarınızın internet/ağ bağlantısını ve güvenlik duvarı ayarlarını kontrol edin."
                 )
                 self.update_status_bar("Bağlantı başarısız")
+
+        try:
+            model_url = self.model_url_entry.get().strip()
+            self._run_in_background(
+                "Bağlantı test ediliyor", test_connection, model_url, on_done=on_done, on_error=on_error
+            )
         except Exception as e:
-            messagebox.showerror("Hata", f"Bağlantı testi sırasında beklenmeyen hata: {str(e)}")
-            self.update_status_bar("Bağlantı testi başarısız")
+            on_error(e)
 
     def update_status_bar(self, message: str):
         """Update status bar message."""
         self.status_var.set(message)
 
+    # ---- Background tasks ----
+
+    def _run_in_background(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        on_done: Callable[[Any], None],
+        on_error: Callable[[BaseException], None],
+        on_progress: Optional[Callable[[Any], None]] = None,
+    ) -> Optional[BackgroundTask]:
+        """Run blocking ``func`` off the Tk thread; callbacks run on the Tk thread.
+
+        Aynı adlı iş zaten sürüyorsa yenisi başlatılmaz. Yürütücü yoksa
+        (ör. Tk döngüsü olmayan testler) iş eşzamanlı çalıştırılır.
+        ``on_progress`` verilirse ``func`` bir ``report=`` argümanı da alır.
+        """
+        runner = self._task_runner
+        if runner is None:
+            try:
+                value = func(*args, **({"report": on_progress} if on_progress is not None else {}))
+            except Exception as e:
+                on_error(e)
+            else:
+                on_done(value)
+            return None
+
+        if runner.is_running(name):
+            self.update_status_bar(f"⏳ {name}... (zaten sürüyor)")
+            return None
+        return runner.submit(name, func, *args, on_done=on_done, on_error=on_error, on_progress=on_progress)
+
+    def _on_background_tasks_changed(self, tasks: List[BackgroundTask]) -> None:
+        """Show progress and the cancel button while tasks run."""
+        if not tasks:
+            self._cancel_button.pack_forget()
+            return
+        runner = self._task_runner
+        if runner:
+            parts = [f"{t.name} ({runner.elapsed(t):.0f} sn)" for t in tasks]
+        else:
+            parts = [t.name for t in tasks]
+        self.update_status_bar("⏳ " + ", ".join(parts) + "...")
+        if not self._cancel_button.winfo_manager():
+            self._cancel_button.pack(side="right", padx=2, pady=2, before=self._status_label)
+
+    def _cancel_background_tasks(self) -> None:
+        if self._task_runner is None:
+            return
+        cancelled = self._task_runner.cancel()
+        self.workspace_editor.clear_streaming_text()
+        if cancelled:
+            self.update_status_bar("İptal edildi: " + ", ".join(t.name for t in cancelled))
+
     def _handle_tab_navigation(self, event):
         """Handle Tab key navigation between widgets."""
         try:
@@ -1694,7 +1947,11 @@ class V3Calculator(ExecuteModeMixin):
         return event
 
     def _get_focusable_widgets(self):
-        """Get list of focusable widgets in order."""
+        """Get list of focusable widgets in order.
+
+        Henüz kurulmamış sekmelerin widget'ları yoktur; yalnızca var olanlar
+        listelenir (Malzeme sekmesi açılınca kütle alanları eklenir).
+        """
         widgets = []
 
         if hasattr(self, "mass_shape"):
@@ -1747,25 +2004,86 @@ class V3Calculator(ExecuteModeMixin):
             # 300ms sonra topmost kilidini kaldır (pencerenin hep en üstte kilitli kalmaması için)
             self.root.after(300, lambda: self.root.attributes("-topmost", False))
 
+            # Bekleyen çizimleri işle: pencerenin ilk kez boyandığı an
+            self.root.update_idletasks()
+            self._profiler.mark("first_paint")
+            self.root.after_idle(self._on_first_idle)
+
         # macOS pencere yöneticisinin hazır olması için 200ms gecikmeyle çağırıyoruz
         self.root.after(200, set_geo)
 
+    def _on_first_idle(self):
+        """Olay döngüsü ilk kez boşta: başlangıç tamamlandı."""
+        self._profiler.mark("first_idle")
+        if self._on_startup_complete is not None:
+            self._on_startup_complete()
+
+
+def _parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="machining-formulas", description="Mühendislik Hesaplayıcı V3")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const=DEFAULT_REPORT_PATH,
+        metavar="PATH",
+        help=f"Başlangıç aşama sürelerini JSON olarak yaz (varsayılan: {DEFAULT_REPORT_PATH})",
+    )
+    parser.add_argument(
+        "--exit-after-startup",
+        action="store_true",
+        help="Başlangıç tamamlanınca (ilk boşta) çık; ölçüm/CI için",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Model yanıtlarını diskteki önbellekten okuma/yazma",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None, profiler: Optional[StartupProfiler] = None) -> None:
+    """Main entry point for V3 GUI.
+
+    ``profiler`` lets the caller include its own import time in the report
+    (see ``machining_formulas.__main__``).
+    """
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    if not args.profile_startup:
+        profiler = DISABLED
+    elif profiler is None:
+        profiler = StartupProfiler()
 
-def main() -> None:
-    """Main entry point for V3 GUI."""
     try:
-        root = tk.Tk()
+        with profiler.phase("tk_init"):
+            root = tk.Tk()
 
         tooltips: Dict[str, str] = {}
-        try:
-            p = asset_path("tooltips.json")
-            if p.exists():
-                with open(p, "r", encoding="utf-8") as f:
-                    tooltips = json.load(f)
-        except Exception:
-            tooltips = {}
+        with profiler.phase("tooltips"):
+            try:
+                p = asset_path("tooltips.json")
+                if p.exists():
+                    with open(p, "r", encoding="utf-8") as f:
+                        tooltips = json.load(f)
+            except Exception:
+                tooltips = {}
+
+        def on_startup_complete() -> None:
+            if args.profile_startup:
+                path = profiler.write(args.profile_startup)
+                first_idle = profiler.marks["first_idle"]
+                print(f"Başlangıç profili yazıldı: {path} (ilk boşta: {first_idle:.0f} ms)")
+            if args.exit_after_startup:
+                root.destroy()
+
+        if not args.no_llm_cache:
+            with profiler.phase("llm_cache"):
+                try:
+                    enable_response_cache()
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Model yanıt önbelleği açılamadı: {e}")
 
-        app = V3Calculator(root, tooltips)
+        with profiler.phase("app_init"):
+            app = V3Calculator(root, tooltips, profiler=profiler, on_startup_complete=on_startup_complete)
         root.mainloop()
 
     except Exception as e:
@@ -0,0 +1,183 @@
+"""Minimal non-blocking HTTP/1.1 JSON client on ``asyncio`` streams.
+
+Used by the async Ollama helpers so an asyncio integration layer can drive
+many chat/tool conversations without blocking the event loop (``requests``
+is synchronous). Stdlib only. Every request has its own timeout, honours
+task cancellation (the connection is closed on the way out) and passes
+through a per-client semaphore that caps concurrent requests.
+
+Example::
+
+    client = AsyncHTTPClient(max_concurrency=16)
+    response = await client.post_json("http://localhost:11434/api/chat", payload, timeout=60)
+    response.status_code, response.json()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 60.0
+
+_MAX_HEADER_LINES = 200
+
+
+@dataclass
+class AsyncResponse:
+    """Just enough of the ``requests.Response`` surface for the chat helpers."""
+
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    content: bytes = b""
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+def _split_url(url: str) -> Tuple[str, int, str, bool]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {url}")
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return parts.hostname or "localhost", port, path, secure
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                await reader.readline()  # son CRLF (trailer yok sayılır)
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def _request_once(
+    method: str,
+    url: str,
+    body: Optional[bytes],
+    headers: Dict[str, str],
+) -> AsyncResponse:
+    host, port, path, secure = _split_url(url)
+    ssl_context = ssl.create_default_context() if secure else None
+    reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+    try:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: close"]
+        send_headers = {"Accept": "application/json", **headers}
+        if body is not None:
+            send_headers["Content-Length"] = str(len(body))
+        lines.extend(f"{name}: {value}" for name, value in send_headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        try:
+            status_code = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise ConnectionError(f"Invalid HTTP status line: {status_line!r}")
+
+        response_headers: Dict[str, str] = {}
+        for _ in range(_MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        content = await _read_body(reader, response_headers)
+        return AsyncResponse(status_code=status_code, headers=response_headers, content=content)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class AsyncHTTPClient:
+    """Concurrency-limited async HTTP client (one connection per request)."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """Send one request; raises ``asyncio.TimeoutError`` after ``timeout`` seconds.
+
+        The timeout covers the whole exchange but not the wait for a free
+        concurrency slot.
+        """
+        async with self._semaphore:
+            return await asyncio.wait_for(
+                _request_once(method, url, body, headers or {}),
+                timeout=self.timeout if timeout is None else timeout,
+            )
+
+    async def get(self, url: str, *, timeout: Optional[float] = None) -> AsyncResponse:
+        return await self.request("GET", url, timeout=timeout)
+
+    async def post_json(
+        self,
+        url: str,
+        payload: Any,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        send_headers = {"Content-Type": "application/json", **(headers or {})}
+        return await self.request("POST", url, body=body, headers=send_headers, timeout=timeout)
+
+
+# Olay döngüsü başına paylaşılan istemci (semafor döngüye bağlıdır)
+_default_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_default_client() -> AsyncHTTPClient:
+    """Process-wide client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _default_clients.get(loop)
+    if client is None:
+        client = _default_clients[loop] = AsyncHTTPClient()
+    return client
+
+
+def set_default_concurrency(max_concurrency: int) -> AsyncHTTPClient:
+    """Replace the running loop's shared client with one capped at ``max_concurrency``."""
+    loop = asyncio.get_running_loop()
+    client = _default_clients[loop] = AsyncHTTPClient(max_concurrency=max_concurrency)
+    return client
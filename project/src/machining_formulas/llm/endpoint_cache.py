@@ -0,0 +1,137 @@
+"""Per-host cache of which Ollama endpoint flavor (``/v1`` or ``/api``) works.
+
+``candidate_chat_urls`` / ``candidate_tags_urls`` list both flavors and the
+callers try them in order. Without memory, a server that only speaks
+``/api/chat`` costs a failed round trip (or a timeout) before every real call.
+This cache reorders the candidates:
+
+* a flavor that recently succeeded for the host goes first (``ttl``),
+* a flavor that recently failed goes last (``negative_ttl``),
+
+so steady-state requests hit the right URL first. Failed flavors are only
+demoted, never dropped, so a server that changes behaviour is still reached.
+Shared by ``ollama_utils_v2``, ``ollama_async`` and ``AdvancedCalculator``.
+
+Example::
+
+    urls = negotiated_chat_urls("http://host:11434")
+    ... try urls in order; on each attempt:
+    get_endpoint_cache().record(url, ok)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from machining_formulas.llm.ollama_utils import candidate_chat_urls, candidate_tags_urls
+
+DEFAULT_TTL = 600.0
+DEFAULT_NEGATIVE_TTL = 60.0
+
+_FLAVORS = ("/v1/", "/api/")
+
+
+def endpoint_kind(url: str) -> Tuple[Tuple[str, str, str], Optional[str]]:
+    """``((scheme, host, kind), flavor)`` for a chat/tags URL; flavor is ``/v1/``, ``/api/`` or None."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") + "/"
+    flavor = next((f for f in _FLAVORS if f in path), None)
+    kind = path.rstrip("/").rsplit("/", 1)[-1]
+    return (parts.scheme.lower(), parts.netloc.lower(), kind), flavor
+
+
+@dataclass
+class _HostState:
+    preferred: Optional[str] = None
+    preferred_until: float = 0.0
+    failed_until: Dict[str, float] = field(default_factory=dict)
+
+
+class EndpointNegotiationCache:
+    """Thread-safe memory of working/failing endpoint flavors per host and endpoint kind."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hosts: Dict[Tuple[str, str, str], _HostState] = {}
+
+    def order(self, candidates: List[str]) -> List[str]:
+        """``candidates`` reordered: preferred flavor first, recently failed flavors last."""
+        if len(candidates) < 2:
+            return list(candidates)
+        now = self._clock()
+
+        def rank(item: Tuple[int, str]) -> Tuple[int, int]:
+            index, url = item
+            key, flavor = endpoint_kind(url)
+            state = self._hosts.get(key)
+            if state is None or flavor is None:
+                return 1, index
+            if state.preferred == flavor and state.preferred_until > now:
+                return 0, index
+            if state.failed_until.get(flavor, 0.0) > now:
+                return 2, index
+            return 1, index
+
+        with self._lock:
+            return [url for _, url in sorted(enumerate(candidates), key=rank)]
+
+    def record(self, url: str, ok: bool) -> None:
+        """Remember the outcome of one request to ``url``."""
+        key, flavor = endpoint_kind(url)
+        if flavor is None:
+            return
+        now = self._clock()
+        with self._lock:
+            state = self._hosts.setdefault(key, _HostState())
+            if ok:
+                state.preferred, state.preferred_until = flavor, now + self.ttl
+                state.failed_until.pop(flavor, None)
+            else:
+                state.failed_until[flavor] = now + self.negative_ttl
+                if state.preferred == flavor:
+                    state.preferred, state.preferred_until = None, 0.0
+
+    def preferred(self, url: str) -> Optional[str]:
+        """Currently preferred flavor for ``url``'s host and endpoint kind, if fresh."""
+        key, _flavor = endpoint_kind(url)
+        with self._lock:
+            state = self._hosts.get(key)
+            if state is not None and state.preferred_until > self._clock():
+                return state.preferred
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+_default_cache = EndpointNegotiationCache()
+
+
+def get_endpoint_cache() -> EndpointNegotiationCache:
+    """Process-wide negotiation cache."""
+    return _default_cache
+
+
+def negotiated_chat_urls(url: Optional[str], *, force_legacy_first: bool = False) -> List[str]:
+    """``candidate_chat_urls`` ordered by the shared cache (an explicit legacy preference wins)."""
+    candidates = candidate_chat_urls(url, force_legacy_first=force_legacy_first)
+    return candidates if force_legacy_first else _default_cache.order(candidates)
+
+
+def negotiated_tags_urls(url: Optional[str]) -> List[str]:
+    """``candidate_tags_urls`` ordered by the shared cache."""
+    return _default_cache.order(candidate_tags_urls(url))
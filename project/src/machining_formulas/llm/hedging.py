@@ -0,0 +1,148 @@
+"""Hedged requests: race alternative attempts to cut tail latency.
+
+The first attempt starts immediately. If it has not answered after
+``delay`` seconds, the next one is fired as well, up to ``max_parallel`` in
+flight. A failing attempt starts the next one at once, without waiting for
+the delay. The first successful result wins and the rest are cancelled.
+
+* :func:`hedged_first` runs attempts on daemon threads (blocking
+  ``requests`` calls). Each attempt receives a ``threading.Event`` that is set
+  once a winner is chosen; attempts must poll it and stop (a streamed request
+  closes its response at the next chunk), since threads cannot be killed.
+* :func:`ahedged_first` runs coroutines; losers are really cancelled.
+
+Example::
+
+    attempts = [lambda cancel: post(url_a, cancel), lambda cancel: post(url_b, cancel)]
+    index, data = hedged_first(attempts, delay=0.5)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_HEDGE_DELAY = 0.75
+DEFAULT_MAX_PARALLEL = 2
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to fire extra attempts and what to race.
+
+    ``extra_hosts`` are other Ollama base/chat URLs, ``extra_models`` other
+    model names; both are raced after the primary candidate URLs.
+    """
+
+    delay: float = DEFAULT_HEDGE_DELAY
+    max_parallel: int = DEFAULT_MAX_PARALLEL
+    extra_hosts: Tuple[str, ...] = ()
+    extra_models: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.delay < 0:
+            raise ValueError("delay must be >= 0")
+        if self.max_parallel < 1:
+            raise ValueError("max_parallel must be >= 1")
+
+
+def _check(attempts: Sequence[object], max_parallel: int) -> None:
+    if not attempts:
+        raise ValueError("At least one attempt is required")
+    if max_parallel < 1:
+        raise ValueError("max_parallel must be >= 1")
+
+
+def hedged_first(
+    attempts: Sequence[Callable[[threading.Event], T]],
+    *,
+    delay: float = DEFAULT_HEDGE_DELAY,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+) -> Tuple[int, T]:
+    """``(index, result)`` of the first attempt that returns; re-raises the last error if all fail.
+
+    Every attempt is called with the same cancel event, set when this returns.
+    """
+    _check(attempts, max_parallel)
+    results: "queue.Queue[Tuple[int, bool, object]]" = queue.Queue()
+    cancel = threading.Event()
+
+    def run(index: int) -> None:
+        try:
+            results.put((index, True, attempts[index](cancel)))
+        except BaseException as exc:  # noqa: BLE001 - çağırana taşınır
+            results.put((index, False, exc))
+
+    next_index = in_flight = 0
+    last_error: Optional[BaseException] = None
+
+    def launch() -> None:
+        nonlocal next_index, in_flight
+        threading.Thread(target=run, args=(next_index,), name=f"mf-hedge-{next_index}", daemon=True).start()
+        next_index += 1
+        in_flight += 1
+
+    try:
+        launch()
+        while True:
+            can_hedge = next_index < len(attempts) and in_flight < max_parallel
+            try:
+                index, ok, value = results.get(timeout=delay if can_hedge else None)
+            except queue.Empty:
+                launch()  # yanıt gecikti: sıradaki adayı da ateşle
+                continue
+            in_flight -= 1
+            if ok:
+                return index, value  # type: ignore[return-value]
+            last_error = value  # type: ignore[assignment]
+            if next_index < len(attempts):
+                launch()
+            elif in_flight == 0:
+                raise last_error  # type: ignore[misc]
+    finally:
+        cancel.set()  # kaybedenler bağlantılarını kapatıp çıksın
+
+
+async def ahedged_first(
+    attempts: Sequence[Callable[[], Awaitable[T]]],
+    *,
+    delay: float = DEFAULT_HEDGE_DELAY,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+) -> Tuple[int, T]:
+    """Async :func:`hedged_first`; losing attempts are cancelled."""
+    _check(attempts, max_parallel)
+    tasks: dict[asyncio.Task, int] = {}
+    next_index = 0
+    last_error: Optional[BaseException] = None
+
+    def launch() -> None:
+        nonlocal next_index
+        tasks[asyncio.ensure_future(attempts[next_index]())] = next_index
+        next_index += 1
+
+    launch()
+    try:
+        while tasks:
+            can_hedge = next_index < len(attempts) and len(tasks) < max_parallel
+            done, _pending = await asyncio.wait(
+                tasks, timeout=delay if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                launch()
+                continue
+            for task in done:
+                index = tasks.pop(task)
+                if task.exception() is None:
+                    return index, task.result()
+                last_error = task.exception()
+            while next_index < len(attempts) and len(tasks) < max_parallel:
+                launch()
+        raise last_error  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            task.cancel()
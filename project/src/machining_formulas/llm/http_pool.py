@@ -0,0 +1,143 @@
+"""Shared keep-alive HTTP connection pool for the synchronous Ollama calls.
+
+One ``requests.Session`` per host (scheme + host + port), each mounted with a
+size-limited ``HTTPAdapter``, so repeated chat/tags requests reuse TCP
+connections instead of opening a new one per call. ``requests`` is imported
+when the first session is created, not at module import.
+
+Example::
+
+    response = get_default_pool().post("http://localhost:11434/api/chat", json=payload, timeout=60)
+    configure_default_pool(pool_maxsize=32)   # e.g. many parallel GUI/server requests
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_HOSTS = 16
+
+
+class HTTPPool:
+    """Per-host pooled ``requests`` sessions with keep-alive."""
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        max_hosts: int = DEFAULT_MAX_HOSTS,
+        max_retries: int = 0,
+    ):
+        if pool_maxsize <= 0 or max_hosts <= 0:
+            raise ValueError("pool_maxsize and max_hosts must be positive")
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_hosts = max_hosts
+        self.max_retries = max_retries
+        self._sessions: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def _host_key(url: str) -> Tuple[str, str]:
+        parts = urlsplit(url)
+        return parts.scheme.lower(), parts.netloc.lower()
+
+    def _new_session(self) -> Any:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # Tek host'a bağlı oturum: pool_connections=1, host başına pool_maxsize bağlantı
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.max_retries,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session_for(self, url: str) -> Any:
+        """The pooled session for ``url``'s host (created on first use)."""
+        key = self._host_key(url)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("HTTP pool is closed")
+            session = self._sessions.get(key)
+            if session is None:
+                if len(self._sessions) >= self.max_hosts:
+                    # En eski host'un oturumunu kapat (sözlük ekleme sırasını korur)
+                    oldest = next(iter(self._sessions))
+                    self._sessions.pop(oldest).close()
+                session = self._sessions[key] = self._new_session()
+            return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self.session_for(url).get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        return self.session_for(url).post(url, **kwargs)
+
+    @property
+    def hosts(self) -> int:
+        return len(self._sessions)
+
+    def close(self) -> None:
+        """Close every session and its idle connections."""
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+            self._closed = True
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "HTTPPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_default_pool: Optional[HTTPPool] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pool() -> HTTPPool:
+    """Process-wide pool used by the Ollama helpers."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = HTTPPool()
+        return _default_pool
+
+
+def configure_default_pool(**options: Any) -> HTTPPool:
+    """Replace the process-wide pool (closing the old one) with ``HTTPPool(**options)``."""
+    global _default_pool
+    pool = HTTPPool(**options)
+    with _default_lock:
+        old, _default_pool = _default_pool, pool
+    if old is not None:
+        old.close()
+    return pool
+
+
+def close_default_pool() -> None:
+    """Close the process-wide pool; the next call creates a fresh one."""
+    global _default_pool
+    with _default_lock:
+        old, _default_pool = _default_pool, None
+    if old is not None:
+        old.close()
+
+
+atexit.register(close_default_pool)
@@ -82,7 +82,7 @@ def prepare_material_mass_arguments(
     user_text = _latest_user_text(messages_history)
     _ensure_radius_argument(args, shape_key, user_text)
 
-    dimension_names = calculator.get_shape_parameters(shape_key)
+    dimension_names = calculator.get_shape_param_names(shape_key)
     dimensions: List[float] = []
     for dim_name in dimension_names:
         if dim_name not in args:
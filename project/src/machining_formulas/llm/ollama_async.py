@@ -0,0 +1,144 @@
+"""Async (asyncio) counterparts of the ``ollama_utils_v2`` helpers.
+
+Same endpoint-candidate fallbacks and return shapes as the synchronous
+functions, but on the non-blocking :mod:`machining_formulas.llm.async_http`
+transport: each request has its own timeout, can be cancelled, and the
+shared client caps how many requests are in flight per event loop.
+
+Example::
+
+    models = await async_get_available_models("http://localhost:11434")
+    reply = await async_chat_with_ollama(url, "llama3", messages, tools, timeout=30)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from machining_formulas.llm.async_http import AsyncHTTPClient, get_default_client
+from machining_formulas.llm.endpoint_cache import (
+    get_endpoint_cache,
+    negotiated_chat_urls,
+    negotiated_tags_urls,
+)
+from machining_formulas.llm.ollama_utils import (
+    extract_chat_content,
+    prepare_legacy_chat_payload,
+)
+
+
+async def async_single_chat_request(
+    model_url: str,
+    model_name: str,
+    prompt: str,
+    timeout: float = 60,
+    *,
+    client: Optional[AsyncHTTPClient] = None,
+) -> str | Dict[str, Any]:
+    """Async ``single_chat_request``."""
+    client = client or get_default_client()
+    last_error = "Uygun endpoint bulunamadı"
+
+    for chat_url in negotiated_chat_urls(model_url):
+        payload: Dict[str, Any] = {
+            "model": model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+        }
+        if "/api/chat" in chat_url:
+            payload = prepare_legacy_chat_payload(payload)
+        try:
+            response = await client.post_json(chat_url, payload, timeout=timeout)
+            get_endpoint_cache().record(chat_url, response.status_code == 200)
+            if response.status_code == 200:
+                return extract_chat_content(response.json())
+            last_error = f"HTTP {response.status_code}: {response.text}"
+        except asyncio.TimeoutError:
+            get_endpoint_cache().record(chat_url, False)
+            last_error = "Request timeout"
+        except Exception as e:
+            get_endpoint_cache().record(chat_url, False)
+            last_error = str(e)
+
+    return {"error": f"Request failed: {last_error}"}
+
+
+async def async_get_available_models(
+    model_url: str,
+    timeout: float = 10,
+    *,
+    client: Optional[AsyncHTTPClient] = None,
+) -> List[str]:
+    """Async ``get_available_models``."""
+    client = client or get_default_client()
+    for tags_url in negotiated_tags_urls(model_url):
+        try:
+            response = await client.get(tags_url, timeout=timeout)
+            get_endpoint_cache().record(tags_url, response.status_code == 200)
+            if response.status_code == 200:
+                models_data = response.json().get("models", [])
+                if models_data:
+                    return [model["name"] for model in models_data]
+        except asyncio.TimeoutError:
+            get_endpoint_cache().record(tags_url, False)
+            print(f"Error getting models from {tags_url}: timeout")
+        except Exception as e:
+            get_endpoint_cache().record(tags_url, False)
+            print(f"Error getting models from {tags_url}: {e}")
+    return []
+
+
+async def async_test_connection(
+    model_url: str,
+    timeout: float = 5,
+    *,
+    client: Optional[AsyncHTTPClient] = None,
+) -> bool:
+    """Async ``test_connection``."""
+    client = client or get_default_client()
+    for tags_url in negotiated_tags_urls(model_url):
+        try:
+            response = await client.get(tags_url, timeout=timeout)
+            get_endpoint_cache().record(tags_url, response.status_code == 200)
+            if response.status_code == 200:
+                return True
+        except Exception:
+            get_endpoint_cache().record(tags_url, False)
+    return False
+
+
+async def async_chat_with_ollama(
+    model_url: str,
+    model_name: str,
+    messages: List[Dict[str, str]],
+    tools: Optional[List[Dict[str, Any]]] = None,
+    timeout: float = 60,
+    *,
+    client: Optional[AsyncHTTPClient] = None,
+) -> Dict[str, Any]:
+    """Async ``chat_with_ollama``."""
+    client = client or get_default_client()
+    last_error = "Uygun endpoint bulunamadı"
+
+    for chat_url in negotiated_chat_urls(model_url):
+        is_legacy = "/api/chat" in chat_url
+        payload: Dict[str, Any] = {"model": model_name, "messages": messages, "stream": False}
+        if tools and not is_legacy:
+            payload["tools"] = tools
+        if is_legacy:
+            payload = prepare_legacy_chat_payload(payload)
+        try:
+            response = await client.post_json(chat_url, payload, timeout=timeout)
+            get_endpoint_cache().record(chat_url, response.status_code == 200)
+            if response.status_code == 200:
+                return response.json()
+            last_error = f"HTTP {response.status_code}: {response.text}"
+        except asyncio.TimeoutError:
+            get_endpoint_cache().record(chat_url, False)
+            last_error = "Request timeout"
+        except Exception as e:
+            get_endpoint_cache().record(chat_url, False)
+            last_error = str(e)
+
+    return {"error": f"Request failed: {last_error}"}
@@ -6,7 +6,7 @@ and dynamic tool schema construction to keep the GUI-focused classes lean.
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+from typing import Any, Dict, Iterable, List
 
 from machining_formulas.core.engineering_calculator import EngineeringCalculator
 
@@ -122,6 +122,22 @@ def prepare_legacy_chat_payload(payload: Dict) -> Dict:
     return {key: value for key, value in payload.items() if key not in blocked_keys}
 
 
+def extract_chat_content(data: Any) -> str:
+    """Pull the assistant text out of a /v1 (OpenAI) or /api (Ollama) chat response."""
+    # 1. Try OpenAI/v1 compatible format
+    if "choices" in data:
+        content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        if content:
+            return content
+    # 2. Try Ollama native format
+    if "message" in data:
+        return data.get("message", {}).get("content", "")
+    # 3. Try standard response field fallback
+    if "response" in data:
+        return data.get("response", "")
+    return str(data)
+
+
 def build_calculator_tools_definition(
     calculator: EngineeringCalculator,
 ) -> List[Dict]:
@@ -129,15 +145,15 @@ def build_calculator_tools_definition(
     tools: List[Dict] = []
 
     for calc_name in calculator.turning_definitions.keys():
-        params_info = calculator.get_calculation_params("turning", calc_name)
+        params_info = calculator.get_param_info("turning", calc_name)
         properties = {
-            param["name"]: {
+            param.name: {
                 "type": "number",
-                "description": f"{param['display_text_turkish']} ({param['unit']})",
+                "description": f"{param.display_text_turkish} ({param.unit})",
             }
             for param in params_info
         }
-        required = [param["name"] for param in params_info]
+        required = [param.name for param in params_info]
         tools.append(
             {
                 "type": "function",
@@ -154,15 +170,15 @@ def build_calculator_tools_definition(
         )
 
     for calc_name in calculator.milling_definitions.keys():
-        params_info = calculator.get_calculation_params("milling", calc_name)
+        params_info = calculator.get_param_info("milling", calc_name)
         properties = {
-            param["name"]: {
+            param.name: {
                 "type": "number",
-                "description": f"{param['display_text_turkish']} ({param['unit']})",
+                "description": f"{param.display_text_turkish} ({param.unit})",
             }
             for param in params_info
         }
-        required = [param["name"] for param in params_info]
+        required = [param.name for param in params_info]
         tools.append(
             {
                 "type": "function",
@@ -180,15 +196,15 @@ def build_calculator_tools_definition(
 
     if hasattr(calculator, 'drilling_definitions'):
         for calc_name in calculator.drilling_definitions.keys():
-            params_info = calculator.get_calculation_params("drilling", calc_name)
+            params_info = calculator.get_param_info("drilling", calc_name)
             properties = {
-                param["name"]: {
+                param.name: {
                     "type": "number",
-                    "description": f"{param['display_text_turkish']} ({param['unit']})",
+                    "description": f"{param.display_text_turkish} ({param.unit})",
                 }
                 for param in params_info
             }
-            required = [param["name"] for param in params_info]
+            required = [param.name for param in params_info]
             tools.append(
                 {
                     "type": "function",
@@ -224,10 +240,13 @@ def build_calculator_tools_definition(
     }
 
     available_shapes = calculator.get_available_shapes()
+    shape_params = {
+        shape_key: calculator.get_shape_param_names(shape_key)
+        for shape_key in available_shapes.keys()
+    }
     all_shape_params: set[str] = set()
-    for shape_key in available_shapes.keys():
-        for param_name in calculator.get_shape_parameters(shape_key):
-            all_shape_params.add(param_name)
+    for names in shape_params.values():
+        all_shape_params.update(names)
 
     for param_name in sorted(all_shape_params):
         display_name = calculator.PARAM_TURKISH_NAMES.get(param_name, param_name)
@@ -235,7 +254,7 @@ def build_calculator_tools_definition(
         # Hangi şekillerde bu boyut parametresinin kullanıldığını saptayalım
         used_in_shapes = []
         for skey, sname in available_shapes.items():
-            if param_name in calculator.get_shape_parameters(skey):
+            if param_name in shape_params[skey]:
                 used_in_shapes.append(f"'{skey}' ({sname})")
         shapes_info = ", ".join(used_in_shapes)
         
@@ -2,18 +2,37 @@
 
 This module provides highly robust, candidate-based fallbacks and payload 
 adaptations for the V3 Tkinter GUI to interact with Ollama servers.
+
+All requests go through the shared keep-alive pool in
+:mod:`machining_formulas.llm.http_pool` (connections are reused per host);
+``requests`` is imported on first call, not at import time. Candidate URLs
+are ordered by the shared endpoint negotiation cache, and every attempt's
+outcome is recorded there.
+
+Pass ``on_token`` to :func:`single_chat_request` / :func:`chat_with_ollama`
+(or use :func:`open_chat_stream`) to receive the answer incrementally
+(``/v1`` SSE or ``/api/chat`` NDJSON, see :mod:`machining_formulas.llm.streaming`).
+:func:`chat_with_ollama` consults the opt-in response cache
+(:mod:`machining_formulas.llm.response_cache`).
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-import requests
+import time
+from typing import Any, Callable, Dict, List, Optional
 
+from machining_formulas.llm.endpoint_cache import (
+    get_endpoint_cache,
+    negotiated_chat_urls,
+    negotiated_tags_urls,
+)
+from machining_formulas.llm.http_pool import get_default_pool
 from machining_formulas.llm.ollama_utils import (
-    candidate_chat_urls,
-    candidate_tags_urls,
+    extract_chat_content,
     prepare_legacy_chat_payload,
 )
+from machining_formulas.llm.response_cache import get_response_cache
+from machining_formulas.llm.streaming import ChatStream
 
 
 def single_chat_request(
@@ -21,10 +40,26 @@ def single_chat_request(
     model_name: str,
     prompt: str,
     timeout: int = 60,
+    on_token: Optional[Callable[[str], None]] = None,
     **kwargs,
 ) -> str | Dict[str, Any]:
-    """Send a single chat request to Ollama API with endpoint fallbacks."""
-    url_candidates = candidate_chat_urls(model_url)
+    """Send a single chat request to Ollama API with endpoint fallbacks.
+
+    With ``on_token`` the answer is streamed and ``on_token`` is called with
+    each text piece as it arrives; the full text is still returned.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if on_token is not None:
+        try:
+            stream = open_chat_stream(model_url, model_name, messages, timeout=timeout)
+            return extract_chat_content(stream.consume(on_token))
+        except Exception as e:
+            return {"error": f"Request failed: {e}"}
+
+    pool = get_default_pool()
+    endpoints = get_endpoint_cache()
+
+    url_candidates = negotiated_chat_urls(model_url)
     last_error = "Uygun endpoint bulunamadı"
 
     for chat_url in url_candidates:
@@ -32,52 +67,91 @@ def single_chat_request(
         try:
             payload = {
                 "model": model_name,
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": messages,
                 "stream": False,
             }
             if is_legacy:
                 payload = prepare_legacy_chat_payload(payload)
 
-            response = requests.post(
+            response = pool.post(
                 chat_url,
                 json=payload,
                 timeout=timeout,
             )
 
+            endpoints.record(chat_url, response.status_code == 200)
             if response.status_code == 200:
-                data = response.json()
-                # 1. Try OpenAI/v1 compatible format
-                if "choices" in data:
-                    content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    if content:
-                        return content
-                # 2. Try Ollama native format
-                if "message" in data:
-                    return data.get("message", {}).get("content", "")
-                # 3. Try standard response field fallback
-                if "response" in data:
-                    return data.get("response", "")
-                return str(data)
+                return extract_chat_content(response.json())
 
             last_error = f"HTTP {response.status_code}: {response.text}"
         except Exception as e:
+            endpoints.record(chat_url, False)
             last_error = str(e)
 
     return {"error": f"Request failed: {last_error}"}
 
 
+def open_chat_stream(
+    model_url: str,
+    model_name: str,
+    messages: List[Dict[str, Any]],
+    tools: Optional[List[Dict[str, Any]]] = None,
+    timeout: int = 60,
+) -> ChatStream:
+    """Start a streamed chat (``"stream": true``) on the first working endpoint.
+
+    ``timeout`` bounds the connection and each wait between chunks, not the
+    whole answer. Raises ``ValueError`` if no candidate accepts the request.
+    """
+    pool = get_default_pool()
+    endpoints = get_endpoint_cache()
+    last_error = "Uygun endpoint bulunamadı"
+
+    for chat_url in negotiated_chat_urls(model_url):
+        is_legacy = "/api/chat" in chat_url
+        payload: Dict[str, Any] = {"model": model_name, "messages": messages, "stream": True}
+        if tools and not is_legacy:
+            payload["tools"] = tools
+        if is_legacy:
+            payload = prepare_legacy_chat_payload(payload)
+        started = time.perf_counter()
+        try:
+            response = pool.post(chat_url, json=payload, timeout=timeout, stream=True)
+        except Exception as e:
+            endpoints.record(chat_url, False)
+            last_error = str(e)
+            continue
+        endpoints.record(chat_url, response.status_code == 200)
+        if response.status_code == 200:
+            return ChatStream(
+                response.iter_lines(decode_unicode=True),
+                started=started,
+                on_close=response.close,
+                url=chat_url,
+            )
+        last_error = f"HTTP {response.status_code}: {response.text}"
+        response.close()
+
+    raise ValueError(f"Request failed: {last_error}")
+
+
 def get_available_models(model_url: str) -> List[str]:
     """Get available models from Ollama API with robust endpoint fallbacks."""
-    url_candidates = candidate_tags_urls(model_url)
+    pool = get_default_pool()
+    endpoints = get_endpoint_cache()
+
+    url_candidates = negotiated_tags_urls(model_url)
 
     for tags_url in url_candidates:
         try:
-            response = requests.get(tags_url, timeout=10)
+            response = pool.get(tags_url, timeout=10)
+            endpoints.record(tags_url, response.status_code == 200)
             if response.status_code == 200:
                 models_data = response.json().get("models", [])
                 if models_data:
                     return [model["name"] for model in models_data]
         except Exception as e:
+            endpoints.record(tags_url, False)
             print(f"Error getting models from {tags_url}: {e}")
 
     # Fallback to empty list
@@ -86,15 +160,19 @@ def get_available_models(model_url: str) -> List[str]:
 
 def test_connection(model_url: str) -> bool:
     """Test connection to Ollama server using robust endpoint fallbacks."""
-    url_candidates = candidate_tags_urls(model_url)
+    pool = get_default_pool()
+    endpoints = get_endpoint_cache()
+
+    url_candidates = negotiated_tags_urls(model_url)
 
     for tags_url in url_candidates:
         try:
-            response = requests.get(tags_url, timeout=5)
+            response = pool.get(tags_url, timeout=5)
+            endpoints.record(tags_url, response.status_code == 200)
             if response.status_code == 200:
                 return True
         except Exception:
-            pass
+            endpoints.record(tags_url, False)
 
     return False
 
@@ -105,9 +183,43 @@ def chat_with_ollama(
     messages: List[Dict[str, str]],
     tools: Optional[List[Dict[str, Any]]] = None,
     timeout: int = 60,
+    on_token: Optional[Callable[[str], None]] = None,
+    bypass_cache: bool = False,
+    refresh_cache: bool = False,
 ) -> Dict[str, Any]:
-    """Send chat request to Ollama with optional tool support and candidate fallbacks."""
-    url_candidates = candidate_chat_urls(model_url)
+    """Send chat request to Ollama with optional tool support and candidate fallbacks.
+
+    With ``on_token`` the answer is streamed; the returned dict has the same
+    shape as the non-streaming response.
+
+    When the response cache is enabled (``enable_response_cache``) identical
+    requests are answered from disk; ``bypass_cache`` skips it entirely,
+    ``refresh_cache`` asks the model again and overwrites the stored answer.
+    """
+    cache = None if bypass_cache else get_response_cache()
+    url_candidates = negotiated_chat_urls(model_url)
+    if cache is not None and not refresh_cache:
+        hit = cache.lookup(model_name, messages, tools, url_candidates)
+        if hit is not None:
+            text = extract_chat_content(hit[0])
+            if on_token is not None and text:
+                on_token(text)
+            return hit[0]
+
+    if on_token is not None:
+        try:
+            stream = open_chat_stream(model_url, model_name, messages, tools, timeout)
+            data = stream.consume(on_token)
+        except Exception as e:
+            return {"error": f"Request failed: {e}"}
+        if cache is not None:
+            cache.store(model_name, messages, tools, stream.url, data)
+        return data
+
+    import requests
+
+    pool = get_default_pool()
+    endpoints = get_endpoint_cache()
     last_error = "Uygun endpoint bulunamadı"
 
     for chat_url in url_candidates:
@@ -125,14 +237,20 @@ def chat_with_ollama(
             if is_legacy:
                 payload = prepare_legacy_chat_payload(payload)
 
-            response = requests.post(chat_url, json=payload, timeout=timeout)
+            response = pool.post(chat_url, json=payload, timeout=timeout)
 
+            endpoints.record(chat_url, response.status_code == 200)
             if response.status_code == 200:
-                return response.json()
+                data = response.json()
+                if cache is not None:
+                    cache.store(model_name, messages, tools, chat_url, data)
+                return data
             last_error = f"HTTP {response.status_code}: {response.text}"
         except requests.exceptions.Timeout:
+            endpoints.record(chat_url, False)
             last_error = "Request timeout"
         except Exception as e:
+            endpoints.record(chat_url, False)
             last_error = str(e)
 
     return {"error": f"Request failed: {last_error}"}
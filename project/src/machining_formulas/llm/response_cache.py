@@ -0,0 +1,298 @@
+"""Persistent (SQLite) cache of Ollama chat responses.
+
+Operators ask the same questions again and again; a cached answer returns in
+milliseconds instead of a multi-second model round trip. Entries are keyed by
+a SHA-256 of the canonical JSON of (model, messages, tools schema, endpoint
+flavor ``/v1/`` or ``/api/``), bounded to ``maxsize`` rows with LRU eviction
+and expire after ``ttl`` seconds. Hit/miss counters use
+:class:`~machining_formulas.core.cache.CacheStats`.
+
+The cache is opt-in: :func:`enable_response_cache` installs the process-wide
+instance used by ``chat_with_ollama`` and ``AdvancedCalculator``; callers can
+skip it per request (``bypass``: neither read nor write) or force a fresh
+answer that replaces the stored one (``refresh``).
+
+The cache fails open: a locked, corrupt or read-only database (or one closed
+by :func:`disable_response_cache` while a request is in flight) is logged and
+treated as a miss, never as a chat error.
+
+Example::
+
+    cache = enable_response_cache(ttl=7 * 24 * 3600)
+    chat_with_ollama(url, "llama3", messages)                  # model round trip, stored
+    chat_with_ollama(url, "llama3", messages)                  # served from disk
+    chat_with_ollama(url, "llama3", messages, refresh_cache=True)
+    cache.stats().hit_rate
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from machining_formulas.core.cache import CacheStats
+from machining_formulas.llm.endpoint_cache import endpoint_kind
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 2000
+DEFAULT_TTL = 7 * 24 * 3600.0
+
+CACHE_DIR_ENV = "MACHINING_FORMULAS_CACHE_DIR"
+CACHE_FILE = "llm_responses.sqlite3"
+
+# Anahtar biçimi değişirse artırın (eski kayıtlar eşleşmez, LRU ile temizlenir)
+KEY_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    flavor TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def default_cache_path() -> Path:
+    """Per-user location of the response database (``$MACHINING_FORMULAS_CACHE_DIR`` overrides)."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override) / CACHE_FILE
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "machining_formulas" / CACHE_FILE
+
+
+def url_flavor(url: str) -> str:
+    """``/v1/`` or ``/api/`` for a chat URL (``""`` if unknown)."""
+    return endpoint_kind(url)[1] or ""
+
+
+def response_cache_key(
+    model: str,
+    messages: Iterable[Any],
+    tools: Optional[Iterable[Any]],
+    flavor: str,
+) -> str:
+    """Canonical hash of one chat request (key order and whitespace do not matter)."""
+    document = {
+        "v": KEY_VERSION,
+        "model": model,
+        "messages": list(messages),
+        "tools": list(tools or []),
+        "flavor": flavor,
+    }
+    raw = json.dumps(document, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Thread-safe, size-bounded LRU/TTL store of chat responses in SQLite."""
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: Optional[float] = DEFAULT_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Kayıtlar süreçler arası kalıcı: monoton değil, duvar saati
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._closed = False
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ---- key/value ----
+
+    def _fetch(self, key: str, now: float) -> Optional[str]:
+        # Kilit altında çağrılır; sayaçları yalnızca süresi dolanlar için günceller
+        row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        response, created = row
+        if self.ttl is not None and now - created >= self.ttl:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._expirations += 1
+            return None
+        self._conn.execute("UPDATE responses SET accessed = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        return response
+
+    def get(self, key: str) -> Optional[Any]:
+        """Stored response for ``key`` (refreshing its LRU position), or None."""
+        return self._get_first([key])[0]
+
+    def _get_first(self, keys: List[str]) -> Tuple[Optional[Any], int]:
+        """First stored response among ``keys`` and its index; one hit or miss in total."""
+        now = self._clock()
+        with self._lock:
+            try:
+                for index, key in enumerate(keys):
+                    response = None if self._closed else self._fetch(key, now)
+                    if response is not None:
+                        self._hits += 1
+                        return json.loads(response), index
+            except (sqlite3.Error, ValueError) as exc:
+                _log.warning("LLM response cache read failed (%s): %s", self.path, exc)
+            self._misses += 1
+        return None, -1
+
+    def put(self, key: str, response: Any, *, model: str = "", flavor: str = "") -> None:
+        now = self._clock()
+        body = json.dumps(response, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, flavor, response, created, accessed, hits)"
+                    " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, model, flavor, body, now, now),
+                )
+                excess = self._count() - self.maxsize
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key IN"
+                        " (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                        (excess,),
+                    )
+                    self._evictions += excess
+            except sqlite3.Error as exc:
+                _log.warning("LLM response cache write skipped (%s): %s", self.path, exc)
+
+    # ---- chat requests ----
+
+    def lookup(
+        self,
+        model: str,
+        messages: Iterable[Any],
+        tools: Optional[Iterable[Any]],
+        urls: List[str],
+    ) -> Optional[Tuple[Any, str]]:
+        """``(response, url)`` cached for the first candidate URL whose flavor has an entry."""
+        messages, tools = list(messages), list(tools or [])
+        by_flavor = {}
+        for url in urls:
+            by_flavor.setdefault(url_flavor(url), url)
+        keys = [response_cache_key(model, messages, tools, flavor) for flavor in by_flavor]
+        response, index = self._get_first(keys)
+        if response is None:
+            return None
+        return response, list(by_flavor.values())[index]
+
+    def store(
+        self,
+        model: str,
+        messages: Iterable[Any],
+        tools: Optional[Iterable[Any]],
+        url: str,
+        response: Any,
+    ) -> None:
+        flavor = url_flavor(url)
+        self.put(response_cache_key(model, messages, tools, flavor), response, model=model, flavor=flavor)
+
+    # ---- maintenance ----
+
+    def _count(self) -> int:
+        if self._closed:
+            return 0
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            try:
+                size = self._count()
+            except sqlite3.Error:
+                size = 0
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=size,
+                maxsize=self.maxsize,
+            )
+
+    def clear(self) -> int:
+        """Delete every stored response; returns the count."""
+        with self._lock:
+            if self._closed:
+                return 0
+            try:
+                removed = self._count()
+                self._conn.execute("DELETE FROM responses")
+            except sqlite3.Error as exc:
+                _log.warning("LLM response cache clear failed (%s): %s", self.path, exc)
+                return 0
+            return removed
+
+    def close(self) -> None:
+        # Kilit altında: devam eden lookup/store bitince kapanır, sonrakiler ıska sayılır
+        with self._lock:
+            self._closed = True
+            self._conn.close()
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """The process-wide response cache, or None while caching is disabled."""
+    return _default_cache
+
+
+def enable_response_cache(path: Optional[str | Path] = None, **options: Any) -> LLMResponseCache:
+    """Install (replacing any previous one) the process-wide cache ``LLMResponseCache(path, **options)``."""
+    global _default_cache
+    cache = LLMResponseCache(path, **options)
+    with _default_lock:
+        old, _default_cache = _default_cache, cache
+    if old is not None:
+        old.close()
+    return cache
+
+
+def disable_response_cache() -> None:
+    global _default_cache
+    with _default_lock:
+        old, _default_cache = _default_cache, None
+    if old is not None:
+        old.close()
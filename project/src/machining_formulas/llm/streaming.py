@@ -0,0 +1,210 @@
+"""Incremental (streaming) chat responses from Ollama.
+
+With ``"stream": true`` Ollama sends the answer piece by piece:
+
+* ``/v1/chat/completions``: Server-Sent Events, ``data: {...}`` lines with
+  OpenAI ``choices[0].delta`` chunks, terminated by ``data: [DONE]``;
+* ``/api/chat``: NDJSON, one ``{"message": {...}, "done": false}`` per line,
+  the last one with ``"done": true``.
+
+:class:`ChatStream` accepts either kind of line iterator, yields text tokens as
+they arrive, measures time-to-first-token separately from total time, and
+rebuilds the equivalent non-streaming response (including tool calls) so
+existing response parsers keep working.
+
+Example::
+
+    stream = ChatStream(response.iter_lines(decode_unicode=True))
+    for token in stream:
+        print(token, end="", flush=True)
+    stream.stats.ttft_ms, stream.response()
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+_DONE = object()
+
+
+def parse_stream_line(line: Union[str, bytes]) -> Any:
+    """Decode one SSE or NDJSON line: a chunk dict, ``None`` (skip) or the end marker."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    line = line.strip()
+    if not line or line.startswith(":"):
+        return None  # boş satır / SSE yorumu (keep-alive)
+    if line.startswith("data:"):
+        line = line[5:].strip()
+        if line == "[DONE]":
+            return _DONE
+    elif line.startswith(("event:", "id:", "retry:")):
+        return None
+    try:
+        chunk = json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"Invalid stream chunk: {line[:80]!r}") from exc
+    if isinstance(chunk, dict) and chunk.get("error"):
+        raise ValueError(f"Stream error: {chunk['error']}")
+    return chunk
+
+
+@dataclass
+class StreamStats:
+    """Timings of one streamed response (``perf_counter`` seconds)."""
+
+    started: float
+    first_token: Optional[float] = None
+    finished: Optional[float] = None
+    chunks: int = 0
+    tokens: int = 0
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        """Time to first token, or None if no text arrived."""
+        if self.first_token is None:
+            return None
+        return (self.first_token - self.started) * 1000.0
+
+    @property
+    def total_ms(self) -> Optional[float]:
+        if self.finished is None:
+            return None
+        return (self.finished - self.started) * 1000.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ttft_ms": self.ttft_ms,
+            "total_ms": self.total_ms,
+            "chunks": self.chunks,
+            "tokens": self.tokens,
+        }
+
+
+class ChatStream:
+    """Iterator of text tokens over a streamed chat response."""
+
+    def __init__(
+        self,
+        lines: Iterable[Union[str, bytes]],
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+        started: Optional[float] = None,
+        on_close: Optional[Callable[[], None]] = None,
+        url: str = "",
+        cancel: Optional[threading.Event] = None,
+    ):
+        self.url = url
+        # Ayarlanınca okuma bir sonraki satırda durur ve yanıt kapatılır (bkz. hedging)
+        self._cancel = cancel
+        self.cancelled = False
+        self._lines = lines
+        self._clock = clock
+        self._on_close = on_close
+        self.stats = StreamStats(started=clock() if started is None else started)
+        self._openai = False
+        self._parts: List[str] = []
+        self._role = "assistant"
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+        self._finish_reason: Optional[str] = None
+        self._final: Dict[str, Any] = {}
+        self._consumed = False
+
+    # ---- iteration ----
+
+    def __iter__(self) -> Iterator[str]:
+        if self._consumed:
+            return
+        self._consumed = True
+        try:
+            for line in self._lines:
+                if self._cancel is not None and self._cancel.is_set():
+                    self.cancelled = True
+                    break
+                chunk = parse_stream_line(line)
+                if chunk is None:
+                    continue
+                if chunk is _DONE:
+                    break
+                self.stats.chunks += 1
+                token, done = self._feed(chunk)
+                if token:
+                    if self.stats.first_token is None:
+                        self.stats.first_token = self._clock()
+                    self.stats.tokens += 1
+                    self._parts.append(token)
+                    yield token
+                if done:
+                    break
+        finally:
+            self.stats.finished = self._clock()
+            if self._on_close is not None:
+                self._on_close()
+
+    def consume(self, on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Read the stream to the end (calling ``on_token`` per token); returns :meth:`response`."""
+        for token in self:
+            if on_token is not None:
+                on_token(token)
+        return self.response()
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self._parts)
+
+    # ---- chunk handling ----
+
+    def _feed(self, chunk: Dict[str, Any]) -> Tuple[str, bool]:
+        choices = chunk.get("choices")
+        if isinstance(choices, list):
+            # OpenAI uyumlu /v1 SSE parçası
+            self._openai = True
+            if not choices:
+                return "", False
+            choice = choices[0] or {}
+            delta = choice.get("delta") or {}
+            self._role = delta.get("role") or self._role
+            for call in delta.get("tool_calls") or []:
+                self._merge_tool_call(call)
+            if choice.get("finish_reason"):
+                self._finish_reason = choice["finish_reason"]
+            return str(delta.get("content") or ""), False
+
+        # Ollama /api/chat NDJSON parçası
+        message = chunk.get("message") or {}
+        self._role = message.get("role") or self._role
+        for call in message.get("tool_calls") or []:
+            self._tool_calls[len(self._tool_calls)] = call
+        done = bool(chunk.get("done"))
+        if done:
+            self._final = {k: v for k, v in chunk.items() if k != "message"}
+        return str(message.get("content") or ""), done
+
+    def _merge_tool_call(self, fragment: Dict[str, Any]) -> None:
+        """Join OpenAI tool-call deltas: same ``index`` -> append ``arguments`` text."""
+        index = int(fragment.get("index", len(self._tool_calls)))
+        call = self._tool_calls.setdefault(
+            index, {"type": "function", "function": {"name": "", "arguments": ""}}
+        )
+        if fragment.get("id"):
+            call["id"] = fragment["id"]
+        function = fragment.get("function") or {}
+        if function.get("name"):
+            call["function"]["name"] += function["name"]
+        if function.get("arguments"):
+            call["function"]["arguments"] += function["arguments"]
+
+    def response(self) -> Dict[str, Any]:
+        """The equivalent ``"stream": false`` response body."""
+        message: Dict[str, Any] = {"role": self._role, "content": self.text}
+        if self._tool_calls:
+            message["tool_calls"] = [self._tool_calls[i] for i in sorted(self._tool_calls)]
+        if self._openai:
+            finish = self._finish_reason or ("tool_calls" if self._tool_calls else "stop")
+            return {"choices": [{"index": 0, "message": message, "finish_reason": finish}]}
+        return {**self._final, "message": message, "done": True}
@@ -0,0 +1,298 @@
+"""Headless execution of calculator tool calls.
+
+Turns an LLM tool call (``calculate_turning_cutting_speed`` +
+``{"Dm": 50, "n": 1000}``) into a calculator result. Stdlib only: importing
+this module does not load tkinter, PIL or requests, so servers and batch
+jobs can run tool calls without GUI or network startup costs.
+``AdvancedCalculator`` delegates to the same functions.
+
+A model response often carries 10–30 tool calls at once;
+:func:`run_tool_calls` runs identical calls only once and returns the outcomes
+in the original call order, so tool messages and history stay deterministic.
+Calls run one after another on the calling thread: each is a microsecond-scale,
+GIL-bound calculation, so a thread pool only adds overhead
+(``benchmarks/bench_tool_calls.py``).
+
+Example::
+
+    executor = ToolExecutor()
+    executor.execute("calculate_turning_cutting_speed", {"Dm": 50, "n": 1000}).content  # "157.08 m/min"
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+from machining_formulas.llm.material_utils import prepare_material_mass_arguments
+
+_CATEGORY_PREFIXES: Tuple[Tuple[str, str], ...] = (
+    ("calculate_turning_", "turning"),
+    ("calculate_milling_", "milling"),
+    ("calculate_drilling_", "drilling"),
+)
+
+
+def slugify(text: str) -> str:
+    """Convert a calculation key like 'Cutting speed' -> 'cutting_speed'."""
+    lowered = text.strip().lower()
+    lowered = re.sub(r"[^a-z0-9]+", "_", lowered)
+    lowered = re.sub(r"_+", "_", lowered).strip("_")
+    return lowered
+
+
+@dataclass(slots=True)
+class ToolRunResult:
+    tool_name: str
+    value: Optional[float]
+    unit: str
+    content: str
+
+
+def parse_tool_arguments(raw_args: Any) -> Dict[str, Any]:
+    if isinstance(raw_args, dict):
+        return raw_args
+    if isinstance(raw_args, str):
+        raw_args = raw_args.strip()
+        if not raw_args:
+            return {}
+        return json.loads(raw_args)
+    return {}
+
+
+def resolve_method_key(method_keys: Iterable[str], slug: str) -> str:
+    lookup = {slugify(k): k for k in method_keys}
+    if slug not in lookup:
+        raise ValueError(f"Geçersiz hesap anahtarı: {slug}")
+    return lookup[slug]
+
+
+def format_value_with_unit(value: float, unit: str) -> str:
+    # Testler 2 ondalık bekliyor (ör: 157.08)
+    unit = unit.strip()
+    if unit:
+        return f"{value:.2f} {unit}"
+    return f"{value:.2f}"
+
+
+def run_calc_with_metadata(
+    calc: EngineeringCalculator,
+    category: str,
+    method_key: str,
+    arguments: Dict[str, Any],
+) -> Tuple[float, str]:
+    param_meta = calc.get_param_info(category, method_key)
+    args: List[float] = []
+
+    for p in param_meta:
+        name = p.name
+        if name not in arguments:
+            raise ValueError(f"'{name}' parametresi eksik")
+        try:
+            args.append(float(arguments[name]))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"'{name}' sayısal olmalıdır") from exc
+
+    if category == "turning":
+        result = calc.calculate_turning(method_key, *args)
+    elif category == "milling":
+        result = calc.calculate_milling(method_key, *args)
+    elif category == "drilling":
+        result = calc.calculate_drilling(method_key, *args)
+    else:
+        raise ValueError(f"Desteklenmeyen kategori: {category}")
+
+    return float(result["value"]), str(result.get("units", ""))
+
+
+def execute_tool(
+    calc: EngineeringCalculator,
+    tool_name: Optional[str],
+    arguments: Dict[str, Any],
+    messages_history: Optional[Iterable[Dict[str, Any]]] = None,
+) -> ToolRunResult:
+    """Run one tool call against ``calc``."""
+    if not tool_name:
+        raise ValueError("Tool adı boş")
+
+    if tool_name == "calculate_material_mass":
+        params = prepare_material_mass_arguments(calc, arguments, messages_history)
+        mass_g = calc.calculate_material_mass(
+            params.shape_key,
+            params.density,
+            *(params.dimensions + [params.length]),
+        )
+        return ToolRunResult(
+            tool_name=tool_name,
+            value=float(mass_g),
+            unit="g",
+            content=f"{mass_g:.2f} g",
+        )
+
+    for prefix, category in _CATEGORY_PREFIXES:
+        if tool_name.startswith(prefix):
+            method_key = resolve_method_key(
+                calc.formulas[category].keys(),
+                tool_name.removeprefix(prefix),
+            )
+            value, unit = run_calc_with_metadata(calc, category, method_key, arguments)
+            return ToolRunResult(
+                tool_name=tool_name,
+                value=value,
+                unit=unit,
+                content=format_value_with_unit(value, unit),
+            )
+
+    raise ValueError(f"Bilinmeyen tool: {tool_name}")
+
+
+@dataclass(slots=True)
+class ToolCallOutcome:
+    """Result (or error message) of one entry in a model's ``tool_calls``."""
+
+    tool_call_id: Optional[str]
+    result: Optional[ToolRunResult] = None
+    error: Optional[str] = None
+
+    @property
+    def content(self) -> str:
+        """Text for the ``role: tool`` message."""
+        if self.result is not None:
+            return self.result.content
+        return f"HATA: {self.error}"
+
+
+def _call_key(call: Dict[str, Any]) -> Tuple[Optional[str], Any]:
+    function = call.get("function") or {}
+    raw_args = function.get("arguments", {})
+    if isinstance(raw_args, dict):
+        # Düz (skaler) argümanlar: json.dumps'tan çok daha ucuz bir anahtar
+        try:
+            key = frozenset(raw_args.items())
+        except TypeError:
+            return function.get("name"), json.dumps(raw_args, sort_keys=True, default=str)
+        return function.get("name"), key
+    if not isinstance(raw_args, str):
+        raw_args = json.dumps(raw_args, sort_keys=True, default=str)
+    return function.get("name"), raw_args
+
+
+def run_tool_calls(
+    tool_calls: Sequence[Dict[str, Any]],
+    run: Callable[[Optional[str], Any], ToolRunResult],
+) -> List[ToolCallOutcome]:
+    """Run ``run(name, raw_arguments)`` for every call; outcomes keep the order of ``tool_calls``.
+
+    Identical calls (same name and arguments) are executed once, in order of
+    first appearance, on the calling thread.
+    """
+    done: Dict[Tuple[Optional[str], Any], Tuple[Optional[ToolRunResult], Optional[str]]] = {}
+    outcomes: List[ToolCallOutcome] = []
+    for call in tool_calls:
+        key = _call_key(call)
+        output = done.get(key)
+        if output is None:
+            function = call.get("function") or {}
+            try:
+                output = run(function.get("name"), function.get("arguments", {})), None
+            except Exception as exc:  # noqa: BLE001 - tool execution should be resilient
+                output = None, str(exc)
+            done[key] = output
+        outcomes.append(ToolCallOutcome(call.get("id"), *output))
+    return outcomes
+
+
+def collect_missing_params(errors: List[str]) -> List[str]:
+    missing: List[str] = []
+    for e in errors:
+        for pattern in (
+            r"'([^']+)' parametresi eksik",
+            r"'([^']+)'\s*\(mm\)\s*parametresi eksik",
+        ):
+            for match in re.finditer(pattern, e):
+                missing.append(match.group(1))
+    # unique preserving order
+    seen = set()
+    out: List[str] = []
+    for m in missing:
+        if m in seen:
+            continue
+        seen.add(m)
+        out.append(m)
+    return out
+
+
+def build_silent_model_summary(results: List[ToolRunResult], errors: List[str]) -> str:
+    if errors:
+        missing = collect_missing_params(errors)
+        missing_text = ", ".join(missing) if missing else "(bilinmiyor)"
+        return (
+            "Model yanıt vermedi. Araç çağrısında hata oluştu; "
+            f"eksik parametreleri kontrol edin: {missing_text}."
+        )
+
+    # Başarılı: özellikle kütle aracında g ve kg birlikte göster
+    lines: List[str] = ["Araç sonuçları başarıyla alındı:"]
+    for r in results:
+        if r.unit == "g" and r.value is not None:
+            kg = r.value / 1000.0
+            lines.append(f"- {r.content} ({kg:.3f} kg)")
+        else:
+            lines.append(f"- {r.content}")
+    return "\n".join(lines)
+
+
+def build_partial_answer(
+    results: List[ToolRunResult],
+    errors: List[str],
+    reason: str,
+    model_text: str = "",
+) -> str:
+    """Best answer available when the tool loop stops early (round limit or time budget)."""
+    lines: List[str] = [f"⏱ {reason}; model nihai yanıtı tamamlayamadı."]
+    if model_text.strip():
+        lines.append(model_text.strip())
+    if results:
+        lines.append("Şu ana kadarki araç sonuçları:")
+        for r in results:
+            if r.unit == "g" and r.value is not None:
+                lines.append(f"- {r.tool_name}: {r.content} ({r.value / 1000.0:.3f} kg)")
+            else:
+                lines.append(f"- {r.tool_name}: {r.content}")
+    if errors:
+        lines.append("Hatalı araç çağrıları:")
+        lines.extend(f"- {e}" for e in errors)
+    if not results and not errors:
+        lines.append("Henüz araç sonucu yok.")
+    return "\n".join(lines)
+
+
+class ToolExecutor:
+    """Tool-call runner bound to one (cached) calculator."""
+
+    def __init__(self, calculator: Optional[EngineeringCalculator] = None):
+        if calculator is None:
+            calculator = EngineeringCalculator()
+            calculator.enable_cache()
+        self.calculator = calculator
+
+    def execute(
+        self,
+        tool_name: Optional[str],
+        arguments: Any,
+        messages_history: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> ToolRunResult:
+        """Run a tool call; ``arguments`` may be a dict or a JSON string."""
+        return execute_tool(self.calculator, tool_name, parse_tool_arguments(arguments), messages_history)
+
+    def execute_many(
+        self,
+        tool_calls: Sequence[Dict[str, Any]],
+        messages_history: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> List[ToolCallOutcome]:
+        """Run a model's ``tool_calls``, identical calls once (see :func:`run_tool_calls`)."""
+        history = list(messages_history or [])
+        return run_tool_calls(tool_calls, lambda name, raw_args: self.execute(name, raw_args, history))
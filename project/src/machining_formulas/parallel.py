@@ -0,0 +1,289 @@
+"""Multi-process batch runner for very large job files.
+
+The input file is cut into byte ranges, each shard is evaluated by a worker
+process (one ``EngineeringCalculator`` per process) into a temporary result
+file, and shard outputs are appended to the final output strictly in input
+order as soon as every earlier shard is done. Workers only share the input
+path, so throughput scales with the number of cores until the disk saturates.
+
+A line belongs to the shard its first byte falls into: a worker starting
+mid-line skips to the next newline and reads past its end offset to finish its
+last line. Default job ids match the sequential reader (JSONL: physical line
+numbers; CSV: data-row numbers, empty lines skipped as ``csv.DictReader``
+does). The input is read once: each worker numbers its lines from 1 and
+reports how many it numbered, and the merge step shifts those shard-local
+ids by the line count of all earlier shards. CSV fields must therefore not
+contain embedded newlines (the job files are numeric).
+
+Example::
+
+    report = run_parallel_batch("ops.csv", "results.jsonl", workers=32, progress=print_progress)
+    report.rows_per_second, report.worker_rows_per_second
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from machining_formulas.cli import _INPUT_ENCODING
+
+_READ_CHUNK = 1 << 20
+
+# Çekirdek başına shard sayısı: yük dengesi ve ilerleme raporu sıklığı için
+SHARDS_PER_WORKER = 4
+
+
+class _LineId(int):
+    """Shard-local default job id; shifted to the file line number when merging."""
+
+
+@dataclass(frozen=True)
+class ShardResult:
+    index: int
+    rows: int
+    failures: int
+    seconds: float
+    worker: int
+    path: str
+    # Numaralanan satır sayısı ve varsayılan kimlikli çıktı satırları
+    # ([başlangıç, bitiş) aralıkları)
+    lines: int = 0
+    local_ids: Tuple[Tuple[int, int], ...] = ()
+
+
+@dataclass
+class BatchProgress:
+    """Snapshot passed to the ``progress`` callback after each finished shard."""
+
+    shards_done: int
+    shards_total: int
+    rows: int
+    failures: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class ParallelBatchReport:
+    rows: int
+    failures: int
+    elapsed: float
+    workers: int
+    shards: int
+    worker_rows_per_second: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _data_start(path: str, fmt: str) -> Tuple[int, Optional[List[str]]]:
+    """Byte offset of the first job line and the CSV header (if any)."""
+    if fmt != "csv":
+        return 0, None
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        offset = handle.tell()
+    fieldnames = next(csv.reader([header.decode(_INPUT_ENCODING)]), [])
+    return offset, [name.strip() for name in fieldnames]
+
+
+def shard_boundaries(start: int, size: int, shards: int) -> List[int]:
+    """``shards + 1`` increasing byte offsets covering ``[start, size)``."""
+    span = max(size - start, 0)
+    shards = max(1, min(shards, span or 1))
+    return [start + (span * i) // shards for i in range(shards)] + [size]
+
+
+def _shard_lines(path: str, start: int, end: int, data_start: int) -> Iterator[bytes]:
+    """Raw lines whose first byte lies in ``[start, end)``."""
+    with open(path, "rb") as handle:
+        if start > data_start:
+            handle.seek(start - 1)
+            handle.readline()  # önceki shard'a ait (yarım) satırı atla
+        else:
+            handle.seek(start)
+        position = handle.tell()
+        while position < end:
+            line = handle.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+def _iter_shard_lines(path: str, start: int, end: int, data_start: int) -> Iterator[str]:
+    """Decoded lines whose first byte lies in ``[start, end)``."""
+    for number, line in enumerate(_shard_lines(path, start, end, data_start)):
+        # BOM yalnızca dosyanın ilk satırında olabilir
+        yield line.decode(_INPUT_ENCODING if start == 0 and number == 0 else "utf-8")
+
+
+def _run_shard(
+    index: int,
+    path: str,
+    start: int,
+    end: int,
+    data_start: int,
+    fmt: str,
+    fieldnames: Optional[Sequence[str]],
+    out_fmt: str,
+    tmp_dir: str,
+) -> ShardResult:
+    from machining_formulas.cli import _read_csv, _read_jsonl, _write_results, iter_results
+    from machining_formulas.core.engineering_calculator import EngineeringCalculator
+
+    began = time.perf_counter()
+    numbered = rows = 0
+    local_ids: List[List[int]] = []
+
+    def numbered_lines() -> Iterator[str]:
+        nonlocal numbered
+        for line in _iter_shard_lines(path, start, end, data_start):
+            # Okuyucunun numaraladığı satırlar (CSV boş satırları atlar)
+            if fmt != "csv" or line.strip("\r\n"):
+                numbered += 1
+            yield line
+
+    if fmt == "csv":
+        jobs = _read_csv(numbered_lines(), fieldnames, line_id=_LineId)
+    else:
+        jobs = _read_jsonl(numbered_lines(), line_id=_LineId)
+
+    def counted() -> Iterator[dict]:
+        nonlocal rows
+        for job in jobs:
+            if isinstance(job.get("id"), _LineId):
+                if local_ids and local_ids[-1][1] == rows:
+                    local_ids[-1][1] += 1
+                else:
+                    local_ids.append([rows, rows + 1])
+            rows += 1
+            yield job
+
+    out_path = os.path.join(tmp_dir, f"shard-{index:06d}")
+    with open(out_path, "w", encoding="utf-8", newline="") as sink:
+        results = iter_results(EngineeringCalculator(), counted())
+        failures = _write_results(results, sink, out_fmt, header=False)
+    return ShardResult(
+        index,
+        rows,
+        failures,
+        time.perf_counter() - began,
+        os.getpid(),
+        out_path,
+        lines=numbered,
+        local_ids=tuple((lo, hi) for lo, hi in local_ids),
+    )
+
+
+def _local_flags(result: ShardResult) -> Iterator[bool]:
+    """Per output row of ``result``: does it carry a shard-local default id?"""
+    row = 0
+    for lo, hi in result.local_ids:
+        for row in range(row, hi):
+            yield row >= lo
+        row = hi
+    while True:
+        yield False
+
+
+def _append_shard(result: ShardResult, out: TextIO, out_fmt: str, offset: int) -> None:
+    """Copy a shard's output to ``out``, shifting its default ids by ``offset`` lines."""
+    with open(result.path, encoding="utf-8", newline="") as shard_out:
+        if offset == 0 or not result.local_ids:
+            shutil.copyfileobj(shard_out, out, _READ_CHUNK)
+            return
+        flags = _local_flags(result)
+        if out_fmt == "csv":
+            writer = csv.writer(out)
+            for row in csv.reader(shard_out):
+                if next(flags):
+                    row[0] = str(int(row[0]) + offset)
+                writer.writerow(row)
+            return
+        prefix = '{"id": '
+        for line in shard_out:
+            if next(flags):
+                number, _, rest = line[len(prefix):].partition(",")
+                line = f"{prefix}{int(number) + offset},{rest}"
+            out.write(line)
+
+
+def run_parallel_batch(
+    path: str,
+    out: TextIO,
+    *,
+    fmt: str = "jsonl",
+    out_fmt: str = "jsonl",
+    workers: Optional[int] = None,
+    shards: Optional[int] = None,
+    progress: Optional[Callable[[BatchProgress], None]] = None,
+    tmp_dir: Optional[str] = None,
+) -> ParallelBatchReport:
+    """Evaluate the job file ``path`` on ``workers`` processes, writing results to ``out`` in order."""
+    workers = workers or os.cpu_count() or 1
+    data_start, fieldnames = _data_start(path, fmt)
+    size = os.path.getsize(path)
+    bounds = shard_boundaries(data_start, size, shards or workers * SHARDS_PER_WORKER)
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+
+    if out_fmt == "csv":
+        from machining_formulas.cli import _OUTPUT_FIELDS
+
+        csv.DictWriter(out, fieldnames=_OUTPUT_FIELDS).writeheader()
+
+    began = time.perf_counter()
+    rows = failures = 0
+    per_worker: Dict[int, List[float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="mf-batch-", dir=tmp_dir) as scratch, ProcessPoolExecutor(
+        max_workers=workers
+    ) as pool:
+        # Tek geçiş: çıktı girdi sırasıyla birleştirilir, kimlikler birleştirirken kaydırılır
+        pending = {
+            pool.submit(_run_shard, i, path, lo, hi, data_start, fmt, fieldnames, out_fmt, scratch)
+            for i, (lo, hi) in enumerate(ranges)
+        }
+        finished: Dict[int, ShardResult] = {}
+        next_index = shards_done = lines_before = 0
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                finished[result.index] = result
+                shards_done += 1
+                rows += result.rows
+                failures += result.failures
+                stats = per_worker.setdefault(result.worker, [0.0, 0.0])
+                stats[0] += result.rows
+                stats[1] += result.seconds
+                if progress is not None:
+                    elapsed = time.perf_counter() - began
+                    progress(BatchProgress(shards_done, len(ranges), rows, failures, elapsed))
+
+            while next_index in finished:
+                merged = finished.pop(next_index)
+                _append_shard(merged, out, out_fmt, lines_before)
+                lines_before += merged.lines
+                os.remove(merged.path)
+                next_index += 1
+
+    return ParallelBatchReport(
+        rows=rows,
+        failures=failures,
+        elapsed=time.perf_counter() - began,
+        workers=workers,
+        shards=len(ranges),
+        worker_rows_per_second={pid: r / s if s > 0 else 0.0 for pid, (r, s) in per_worker.items()},
+    )
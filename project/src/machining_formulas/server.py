@@ -0,0 +1,281 @@
+"""Local HTTP/JSON calculation server (stdlib only).
+
+Serves the calculator registry to MES systems and shop-floor terminals:
+
+    python -m machining_formulas serve --port 8765 --workers 16
+
+Endpoints::
+
+    GET  /health              -> {"status": "ok"}
+    GET  /registry            -> categories, methods, parameters and result units
+    POST /calculate           -> one job  (same fields as the CLI batch jobs)
+    POST /batch               -> {"jobs": [...]} or a JSON list -> {"results": [...]}
+    GET  /metrics             -> request counts, status codes and latency percentiles
+
+Connections are HTTP/1.1 keep-alive and are served by a bounded thread pool:
+at most ``workers`` connections are handled at once, further connections
+wait in the listen backlog/pool queue instead of spawning unbounded threads.
+Idle keep-alive connections are closed after ``KEEP_ALIVE_TIMEOUT`` seconds
+so they cannot pin pool workers.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from machining_formulas.cli import iter_results, run_job
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 16
+MAX_BODY_BYTES = 16 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 5.0
+
+# Yüzdelikler için uç nokta başına tutulan son gecikme örnekleri
+LATENCY_WINDOW = 4096
+
+_PERCENTILES = (50, 90, 99)
+
+
+class ServerMetrics:
+    """Thread-safe request counters and rolling latency windows per endpoint."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._started = time.monotonic()
+        self._requests: Dict[str, int] = {}
+        self._statuses: Dict[int, int] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._in_flight = 0
+
+    def begin(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def record(self, endpoint: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+            window = self._latencies.get(endpoint)
+            if window is None:
+                window = self._latencies[endpoint] = deque(maxlen=self._window)
+            window.append(seconds)
+
+    @staticmethod
+    def _percentiles(samples: List[float]) -> Dict[str, float]:
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        summary = {f"p{p}": ordered[round(last * p / 100)] * 1000.0 for p in _PERCENTILES}
+        summary["max"] = ordered[-1] * 1000.0
+        return summary
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = dict(self._requests)
+            statuses = {str(code): count for code, count in sorted(self._statuses.items())}
+            windows = {name: list(samples) for name, samples in self._latencies.items()}
+            in_flight = self._in_flight
+        uptime = time.monotonic() - self._started
+        return {
+            "uptime_s": uptime,
+            "in_flight": in_flight,
+            "requests_total": sum(requests.values()),
+            "requests": requests,
+            "statuses": statuses,
+            "latency_ms": {name: self._percentiles(samples) for name, samples in windows.items() if samples},
+        }
+
+
+def registry_document(ec: EngineeringCalculator) -> Dict[str, Any]:
+    """JSON-ready description of every calculation and its parameters."""
+    document: Dict[str, Any] = {}
+    for category, formulas in ec.formulas.items():
+        document[category] = {
+            key: {
+                "params": [{"name": n, "unit": u.split(" ")[0]} for n, u in zip(f.params, f.param_units)],
+                "result_unit": f.result_unit,
+            }
+            for key, f in formulas.items()
+        }
+    document["materials"] = dict(ec.material_density)
+    return document
+
+
+class CalculationRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    # Boştaki keep-alive bağlantıları havuz işçisini sonsuza dek tutmasın
+    timeout = KEEP_ALIVE_TIMEOUT
+    server_version = "MachiningFormulas/1.0"
+    server: "CalculationServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            # rfile.read(-n) soket zaman aşımına kadar bloklar; gövde sınırı belirsiz
+            self.close_connection = True
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid Content-Length: {length}")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True  # okunmamış gövde bağlantıda kalır
+            raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        return self.rfile.read(length) if length else b""
+
+    def _read_json(self) -> Any:
+        raw = self._read_body()
+        try:
+            return json.loads(raw or b"null")
+        except ValueError as exc:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {exc}")
+
+    def _dispatch(self, method: str) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        endpoint = f"{method} {path}"
+        metrics = self.server.metrics
+        metrics.begin()
+        started = time.perf_counter()
+        status = HTTPStatus.OK
+        try:
+            route = self.server.routes.get((method, path))
+            if route is None:
+                if method == "POST":  # gövdeyi ayrıştırmadan tüket, bağlantı yeniden kullanılabilsin
+                    self._read_body()
+                endpoint = "unknown"
+                raise _HTTPError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {method} {path}")
+            payload = route(self)
+        except _HTTPError as exc:
+            status, payload = exc.status, {"error": exc.message}
+        except (ValueError, TypeError, ArithmeticError) as exc:
+            # iter_results ile aynı: hatalı iş istemci hatasıdır
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        except Exception as exc:  # pragma: no cover - beklenmeyen hata
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+        try:
+            self._send_json(status, payload)
+        finally:
+            metrics.record(endpoint, int(status), time.perf_counter() - started)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    # ---- Routes ----
+
+    def route_health(self) -> Any:
+        return {"status": "ok"}
+
+    def route_registry(self) -> Any:
+        return self.server.registry
+
+    def route_metrics(self) -> Any:
+        return self.server.metrics.snapshot()
+
+    def route_calculate(self) -> Any:
+        job = self._read_json()
+        if not isinstance(job, dict):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Job must be a JSON object")
+        return run_job(self.server.calculator, job)
+
+    def route_batch(self) -> Any:
+        body = self._read_json()
+        jobs = body.get("jobs") if isinstance(body, dict) else body
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Expected a list of job objects")
+        indexed = [{"id": i, **job} if "id" not in job else job for i, job in enumerate(jobs)]
+        return {"results": list(iter_results(self.server.calculator, indexed))}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class CalculationServer(HTTPServer):
+    """``HTTPServer`` whose connections run on a bounded ``ThreadPoolExecutor``."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    routes = {
+        ("GET", "/health"): CalculationRequestHandler.route_health,
+        ("GET", "/registry"): CalculationRequestHandler.route_registry,
+        ("GET", "/metrics"): CalculationRequestHandler.route_metrics,
+        ("POST", "/calculate"): CalculationRequestHandler.route_calculate,
+        ("POST", "/batch"): CalculationRequestHandler.route_batch,
+    }
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        *,
+        workers: int = DEFAULT_WORKERS,
+        calculator: Optional[EngineeringCalculator] = None,
+        verbose: bool = False,
+    ):
+        super().__init__(address, CalculationRequestHandler)
+        if calculator is None:
+            calculator = EngineeringCalculator()
+            calculator.enable_cache()
+        self.calculator = calculator
+        self.registry = registry_document(calculator)
+        self.metrics = ServerMetrics()
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mf-http")
+
+    def process_request(self, request: socket.socket, client_address: Any) -> None:
+        self._pool.submit(self._handle_connection, request, client_address)
+
+    def _handle_connection(self, request: socket.socket, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    verbose: bool = False,
+) -> None:
+    """Run the server until interrupted."""
+    server = CalculationServer((host, port), workers=workers, verbose=verbose)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -167,6 +167,17 @@ class WorkspaceEditor(ttk.Frame):
         close_btn = ttk.Button(header_frame, text="✕", command=self._hide_suggestions, width=3)
         close_btn.pack(side="right")
 
+        # Akış sırasında gelen model metni (yanıt tamamlanınca gizlenir)
+        self.streaming_text = tk.Text(
+            self.suggestions_frame,
+            height=6,
+            wrap=tk.WORD,
+            font=("Consolas", 9),
+            background="#fff3cd",
+            state="disabled",
+        )
+        self._streamed = ""
+
         self.suggestions_listbox = tk.Listbox(
             self.suggestions_frame,
             height=6,
@@ -327,6 +338,34 @@ class WorkspaceEditor(ttk.Frame):
         self._refresh_suggestions()
         self.suggestions_frame.pack(fill="x", padx=5, pady=5)
 
+    def show_streaming_text(self, text: str):
+        """Show partial model output while a suggestion is being streamed."""
+        if not self.suggestions_frame.winfo_manager():
+            self.suggestions_frame.pack(fill="x", padx=5, pady=5)
+        if not self.streaming_text.winfo_manager():
+            self.streaming_text.pack(fill="x", padx=5, pady=(0, 5), before=self.suggestions_listbox)
+
+        self.streaming_text.config(state="normal")
+        if text.startswith(self._streamed):
+            # Yalnızca yeni gelen kısmı ekle
+            self.streaming_text.insert(tk.END, text[len(self._streamed):])
+        else:
+            self.streaming_text.delete("1.0", tk.END)
+            self.streaming_text.insert("1.0", text)
+        self.streaming_text.see(tk.END)
+        self.streaming_text.config(state="disabled")
+        self._streamed = text
+        self.status_label.config(text=f"Model yazıyor... ({len(text)} karakter)")
+
+    def clear_streaming_text(self):
+        """Hide the streaming preview (answer complete, failed or cancelled)."""
+        self._streamed = ""
+        self.streaming_text.config(state="normal")
+        self.streaming_text.delete("1.0", tk.END)
+        self.streaming_text.config(state="disabled")
+        self.streaming_text.pack_forget()
+        self._update_status()
+
     def _hide_suggestions(self):
         """Hide suggestions panel."""
         self.suggestions_frame.pack_forget()
@@ -9,7 +9,18 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 
 SRC_PATH = (Path(__file__).resolve().parents[1] / "src").as_posix()
 if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_endpoint_cache():
+    """Uç nokta pazarlık önbelleği süreç genelindedir; testler birbirini etkilemesin."""
+    from machining_formulas.llm.endpoint_cache import get_endpoint_cache
+
+    get_endpoint_cache().clear()
+    yield
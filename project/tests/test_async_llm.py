@@ -0,0 +1,150 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from machining_formulas.gui.advanced_calculator import AdvancedCalculator
+from machining_formulas.llm.async_http import AsyncHTTPClient
+from machining_formulas.llm.ollama_async import (
+    async_chat_with_ollama,
+    async_get_available_models,
+    async_test_connection,
+)
+
+
+class FakeOllama(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = 0.0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.chat_payloads = []
+
+    def handle_error(self, request, client_address):
+        pass  # zaman aşımına uğrayan istemciler bağlantıyı erken kapatır
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._reply(200, {"models": [{"name": "llama3"}, {"name": "gemma2"}]})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        srv = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with srv.lock:
+            srv.active += 1
+            srv.peak = max(srv.peak, srv.active)
+            srv.chat_payloads.append(payload)
+        try:
+            time.sleep(srv.delay)
+            if self.path != "/v1/chat":
+                self._reply(404, {"error": "not found"})
+            elif payload.get("tools") and payload["messages"][-1].get("role") != "tool":
+                # Araç sonuçlarını gören model metinle yanıtlar
+                call = {
+                    "id": "c1",
+                    "function": {
+                        "name": "calculate_turning_cutting_speed",
+                        "arguments": {"Dm": 50, "n": 1000},
+                    },
+                }
+                self._reply(200, {"message": {"role": "assistant", "content": "", "tool_calls": [call]}})
+            else:
+                self._reply(200, {"message": {"role": "assistant", "content": "Kesme hızı 157.08 m/min"}})
+        finally:
+            with srv.lock:
+                srv.active -= 1
+
+
+@pytest.fixture()
+def ollama():
+    srv = FakeOllama()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_async_tags_chat_and_connection(ollama):
+    async def scenario():
+        models = await async_get_available_models(ollama.base_url)
+        reply = await async_chat_with_ollama(
+            f"{ollama.base_url}/v1/chat", "llama3", [{"role": "user", "content": "hi"}]
+        )
+        ok = await async_test_connection(ollama.base_url)
+        return models, reply, ok
+
+    models, reply, ok = asyncio.run(scenario())
+    assert models == ["llama3", "gemma2"]
+    assert reply["message"]["content"].startswith("Kesme")
+    assert ok
+
+
+def test_achat_with_tools_runs_tool_loop_concurrently_with_limit(ollama):
+    ollama.delay = 0.05
+    client = AsyncHTTPClient(max_concurrency=3)
+
+    async def conversation(i):
+        calc = AdvancedCalculator()
+        calc.async_client = client
+        return await calc.achat_with_tools(
+            f"{ollama.base_url}/v1/chat",
+            "llama3",
+            [{"role": "user", "content": f"soru {i}"}],
+            [{"type": "function"}],
+        )
+
+    async def scenario():
+        return await asyncio.gather(*(conversation(i) for i in range(9)))
+
+    results = asyncio.run(scenario())
+    for message, history in results:
+        assert message["content"] == "Kesme hızı 157.08 m/min"
+        assert [m["role"] for m in history] == ["user", "assistant", "tool", "assistant"]
+        assert history[2]["content"].startswith("157.08")
+    assert 1 < ollama.peak <= 3
+
+
+def test_async_timeout_and_cancellation(ollama):
+    ollama.delay = 0.5
+
+    async def timed_out():
+        calc = AdvancedCalculator()
+        with pytest.raises(ValueError, match="Zaman aşımı"):
+            await calc.achat_with_tools(f"{ollama.base_url}/v1/chat", "llama3", [], [], timeout=0.1)
+        return await async_chat_with_ollama(f"{ollama.base_url}/v1/chat", "llama3", [], timeout=0.1)
+
+    assert "timeout" in asyncio.run(timed_out())["error"]
+
+    async def cancelled():
+        task = asyncio.create_task(async_chat_with_ollama(f"{ollama.base_url}/v1/chat", "llama3", []))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled())
@@ -0,0 +1,100 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+
+
+def test_turning_batch_matches_scalar_path():
+    ec = EngineeringCalculator()
+    vc = np.array([100.0, 150.0, 200.0])
+    ap = np.array([1.0, 2.0, 3.0])
+    fn = np.array([0.1, 0.2, 0.3])
+
+    values, unit = ec.calculate_turning_batch("Metal removal rate", vc, ap, fn)
+
+    assert unit == "cm³/min"
+    expected = [
+        ec.calculate_turning("Metal removal rate", a, b, c)["value"]
+        for a, b, c in zip(vc, ap, fn)
+    ]
+    assert values == pytest.approx(expected)
+
+
+def test_batch_accepts_column_mapping_and_broadcasts_scalars():
+    ec = EngineeringCalculator()
+    columns = {"fz": np.array([0.1, 0.2]), "n": 1000, "ZEFF": 4}
+
+    values, unit = ec.calculate_milling_batch("Table feed", columns)
+
+    assert unit == "mm/min"
+    assert values.shape == (2,)
+    assert values == pytest.approx([400.0, 800.0])
+
+    kw_values, _ = ec.calculate_drilling_batch("Feed rate", fn=[0.1, 0.2], n=500)
+    assert kw_values == pytest.approx([50.0, 100.0])
+
+
+def test_batch_error_handling():
+    ec = EngineeringCalculator()
+
+    with pytest.raises(ValueError, match="Invalid turning calculation"):
+        ec.calculate_turning_batch("InvalidMethod", [1.0], [2.0])
+
+    with pytest.raises(ValueError, match="missing column"):
+        ec.calculate_turning_batch("Cutting speed", {"Dm": [50.0]})
+
+    with pytest.raises(ValueError, match="Incorrect arguments"):
+        ec.calculate_turning_batch("Cutting speed", [1.0, 2.0], [1.0, 2.0, 3.0])
+
+
+def test_batch_division_by_zero_yields_inf_per_row():
+    ec = EngineeringCalculator()
+    values, _ = ec.calculate_drilling_batch("Machining time", [10.0, 10.0], [0.0, 5.0])
+    assert np.isinf(values[0])
+    assert values[1] == pytest.approx(2.0)
+
+
+def test_material_mass_batch_matches_scalar_and_totals():
+    ec = EngineeringCalculator()
+    shapes = ["circle", "rectangle", "tube", "sphere", "circle"]
+    materials = ["Çelik", "Alüminyum", "Çelik", "Bakır", "Alüminyum"]
+    nan = np.nan
+    columns = {
+        "radius": [10, nan, nan, 5, 20],
+        "width": [nan, 30, nan, nan, nan],
+        "height": [nan, 10, nan, nan, nan],
+        "outer_radius": [nan, nan, 25, nan, nan],
+        "inner_radius": [nan, nan, 20, nan, nan],
+        "length": [100, 200, 300, nan, 50],
+    }
+
+    result = ec.calculate_material_mass_batch(shapes, columns, materials=materials)
+
+    expected = [
+        ec.calculate_material_mass("circle", 7.85, 10, 100),
+        ec.calculate_material_mass("rectangle", 2.70, 30, 10, 200),
+        ec.calculate_material_mass("tube", 7.85, 25, 20, 300),
+        ec.calculate_material_mass("sphere", 8.96, 5),
+        ec.calculate_material_mass("circle", 2.70, 20, 50),
+    ]
+    assert result.mass == pytest.approx(expected)
+    assert result.totals["Çelik"] == pytest.approx(expected[0] + expected[2])
+    assert result.totals["Alüminyum"] == pytest.approx(expected[1] + expected[4])
+
+    # Satır bazında yoğunluk verilirse malzeme tablosu gerekmez
+    custom = ec.calculate_material_mass_batch(["square"] * 2, densities=[1.0, 2.0], width=10, length=[10, 10])
+    assert custom.mass == pytest.approx([1.0, 2.0])
+    assert custom.totals == {}
+
+
+def test_material_mass_batch_errors():
+    ec = EngineeringCalculator()
+    with pytest.raises(ValueError, match="Invalid shape"):
+        ec.calculate_material_mass_batch(["blob"], materials=["Çelik"], width=[1])
+    with pytest.raises(ValueError, match="missing column"):
+        ec.calculate_material_mass_batch(["circle"], materials=["Çelik"], radius=[1])
+    with pytest.raises(ValueError, match="Unknown material"):
+        ec.calculate_material_mass_batch(["circle"], materials=["Unobtanium"], radius=[1], length=[1])
+    with pytest.raises(ValueError, match="materials or densities"):
+        ec.calculate_material_mass_batch(["circle"], radius=[1], length=[1])
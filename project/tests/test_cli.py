@@ -0,0 +1,106 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from machining_formulas.cli import main
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _run(argv, stdin_text=None, monkeypatch=None):
+    if stdin_text is not None:
+        monkeypatch.setattr(sys, "stdin", io.StringIO(stdin_text))
+    out = io.StringIO()
+    code = main(argv, out=out)
+    return code, out.getvalue()
+
+
+def test_calc_and_mass_commands():
+    code, text = _run(["calc", "turning", "Cutting speed", "100", "500"])
+    assert code == 0
+    result = json.loads(text)
+    assert result["value"] == pytest.approx(157.0796, rel=1e-4)
+    assert result["units"] == "m/min"
+
+    code, text = _run(["mass", "circle", "--density", "7.85", "10", "100"])
+    assert code == 0
+    assert json.loads(text)["value"] == pytest.approx(246.6150, rel=1e-4)
+
+
+def test_calc_reports_zero_division_as_error(capsys):
+    code, text = _run(["calc", "turning", "Spindle speed", "100", "0"])
+    assert code == 1
+    assert text == ""
+    assert capsys.readouterr().err.startswith("error: ")
+
+
+def test_batch_reports_overflow_per_job_and_continues(monkeypatch):
+    valid = json.dumps({"category": "turning", "method": "Cutting speed", "Dm": 100, "n": 500})
+    overflow = json.dumps({"category": "drilling", "method": "Metal removal rate", "args": [1e200, 5]})
+    code, text = _run(["batch"], stdin_text="\n".join([valid, overflow, valid]), monkeypatch=monkeypatch)
+
+    records = [json.loads(line) for line in text.splitlines()]
+    assert code == 1
+    assert [r["id"] for r in records] == [1, 2, 3]
+    assert "error" in records[1] and "value" not in records[1]
+    assert records[0]["value"] == records[2]["value"] == pytest.approx(157.0796, rel=1e-4)
+
+
+def test_batch_jsonl_streams_results_and_reports_errors(monkeypatch):
+    jobs = "\n".join(
+        [
+            json.dumps({"category": "turning", "method": "Cutting speed", "Dm": 100, "n": 500}),
+            json.dumps({"id": "b", "category": "milling", "method": "Table feed", "args": [0.1, 1000, 4]}),
+            json.dumps(
+                {"category": "shapes", "method": "circle", "material": "Çelik", "radius": 10, "length": 100}
+            ),
+            json.dumps({"category": "turning", "method": "Bogus", "args": [1]}),
+            "not json",
+        ]
+    )
+    code, text = _run(["batch"], stdin_text=jobs, monkeypatch=monkeypatch)
+
+    records = [json.loads(line) for line in text.splitlines()]
+    assert code == 1
+    assert [r["id"] for r in records] == [1, "b", 3, 4, 5]
+    assert records[0]["value"] == pytest.approx(157.0796, rel=1e-4)
+    assert records[1]["value"] == pytest.approx(400.0)
+    assert records[2]["units"] == "g"
+    assert "Invalid turning calculation" in records[3]["error"]
+    assert "Invalid JSON" in records[4]["error"]
+
+
+def test_batch_csv_file_to_csv_output(tmp_path):
+    source = tmp_path / "jobs.csv"
+    source.write_text(
+        "id,category,method,Dm,n,fz,ZEFF\n"
+        "a,turning,Cutting speed,100,500,,\n"
+        "b,milling,Table feed,,1000,0.1,4\n",
+        encoding="utf-8",
+    )
+    target = tmp_path / "out.csv"
+
+    code, _ = _run(["batch", str(source), "-o", str(target)])
+
+    assert code == 0
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "id,value,units,error"
+    assert lines[1].startswith("a,157.07")
+    assert lines[2] == "b,400.0,mm/min,"
+
+
+def test_cli_does_not_import_gui_or_llm_modules():
+    code = (
+        "import sys, machining_formulas.cli;"
+        "bad = [m for m in sys.modules if m.split('.')[0] in ('tkinter', 'PIL', 'requests')"
+        " or m.startswith(('machining_formulas.gui', 'machining_formulas.llm'))];"
+        "print(bad)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env={"PYTHONPATH": str(SRC)}
+    )
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,100 @@
+from machining_formulas.llm.endpoint_cache import EndpointNegotiationCache, endpoint_kind, negotiated_chat_urls
+from machining_formulas.llm.ollama_utils_v2 import get_available_models, single_chat_request
+
+V1 = "http://host:11434/v1/chat"
+API = "http://host:11434/api/chat"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_kind_splits_host_kind_and_flavor():
+    assert endpoint_kind(V1) == (("http", "host:11434", "chat"), "/v1/")
+    assert endpoint_kind("http://HOST:11434/api/tags/") == (("http", "host:11434", "tags"), "/api/")
+    assert endpoint_kind("http://host:11434/chat")[1] is None
+
+
+def test_success_promotes_flavor_until_ttl_expires():
+    clock = FakeClock()
+    cache = EndpointNegotiationCache(ttl=10, negative_ttl=5, clock=clock)
+    assert cache.order([V1, API]) == [V1, API]
+
+    cache.record(API, True)
+    assert cache.order([V1, API]) == [API, V1]
+    assert cache.preferred(V1) == "/api/"
+    # tags uç noktası ayrı tutulur
+    assert cache.order(["http://host:11434/v1/tags", "http://host:11434/api/tags"])[0].endswith("/v1/tags")
+
+    clock.now = 11
+    assert cache.order([V1, API]) == [V1, API]
+
+
+def test_failure_demotes_flavor_until_negative_ttl_expires():
+    clock = FakeClock()
+    cache = EndpointNegotiationCache(ttl=10, negative_ttl=5, clock=clock)
+    cache.record(V1, True)
+    cache.record(V1, False)  # tercih edilen tür başarısız olursa tercih düşer
+    assert cache.order([V1, API]) == [API, V1]
+
+    clock.now = 6
+    assert cache.order([V1, API]) == [V1, API]
+
+
+def test_steady_state_requests_go_straight_to_working_endpoint(monkeypatch):
+    calls = []
+
+    class Response:
+        def __init__(self, status_code, data=None):
+            self.status_code = status_code
+            self.text = ""
+            self._data = data
+
+        def json(self):
+            return self._data
+
+    def post(self, url, **kwargs):
+        calls.append(url)
+        if "/v1/" in url:
+            return Response(404)
+        return Response(200, {"message": {"content": "ok"}})
+
+    monkeypatch.setattr("requests.Session.post", post)
+
+    assert single_chat_request("http://host:11434", "llama3", "hi") == "ok"
+    assert calls == [V1, API]
+
+    calls.clear()
+    assert single_chat_request("http://host:11434", "llama3", "hi") == "ok"
+    assert calls == [API]
+    assert negotiated_chat_urls("http://host:11434") == [API, V1]
+    # Açık eski-uç-nokta tercihi önbellekten bağımsız korunur
+    assert negotiated_chat_urls("http://host:11434", force_legacy_first=True)[0] == API
+
+
+def test_tags_failures_are_negatively_cached(monkeypatch):
+    calls = []
+
+    class Response:
+        status_code = 200
+        text = ""
+
+        def json(self):
+            return {"models": [{"name": "llama3"}]}
+
+    def get(self, url, **kwargs):
+        calls.append(url)
+        if "/v1/" in url:
+            raise ConnectionError("refused")
+        return Response()
+
+    monkeypatch.setattr("requests.Session.get", get)
+
+    assert get_available_models("http://host:11434") == ["llama3"]
+    calls.clear()
+    assert get_available_models("http://host:11434") == ["llama3"]
+    assert calls == ["http://host:11434/api/tags"]
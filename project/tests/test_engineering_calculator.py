@@ -54,3 +54,85 @@ def test_error_handling():
     # Incorrect arguments for shape
     with pytest.raises(ValueError, match="Incorrect arguments for shape"):
         ec.calculate_material_mass("circle", 7.85, 10, 20, 30)  # circle only takes radius and length (2 args)
+
+
+def test_formula_registry_is_shared_and_read_only():
+    first = EngineeringCalculator()
+    second = EngineeringCalculator()
+
+    assert first.turning_definitions is second.turning_definitions
+    assert first.formulas["milling"]["Torque"] is second.formulas["milling"]["Torque"]
+
+    formula = first.formulas["turning"]["Net power"]
+    assert formula.params == ("Vc", "ap", "fn", "kc")
+    assert formula.result_unit == "kW"
+    assert first.turning_definitions["Net power"]["units"]["result"] == "kW"
+
+    with pytest.raises(TypeError):
+        first.turning_definitions["Custom"] = {}  # type: ignore[index]
+
+    # Yoğunluk tablosu örnek başına kopyadır
+    first.material_density["Özel"] = 1.0
+    assert "Özel" not in second.material_density
+
+
+def test_param_metadata_is_cached_and_hashable():
+    ec = EngineeringCalculator()
+
+    info = ec.get_param_info("milling", "Torque")
+    assert info is ec.get_param_info("milling", "Torque")
+    assert hash(info)
+    assert [p.name for p in info] == ["Pc", "n"]
+    assert info[0].unit == "kW"
+    assert info[0].display_text_turkish == "Net Güç (Pc)"
+
+    assert ec.get_calculation_params("milling", "Torque") == [p.as_dict() for p in info]
+    assert ec.get_shape_param_names("tube") == ("outer_radius", "inner_radius")
+    assert ec.get_shape_parameters("sphere") == ["radius"]
+
+    with pytest.raises(ValueError, match="Invalid calculation category key"):
+        ec.get_param_info("grinding", "Torque")
+    with pytest.raises(ValueError, match="Invalid calculation method key"):
+        ec.get_param_info("turning", "Torque")
+    with pytest.raises(ValueError, match="Invalid shape key"):
+        ec.get_shape_parameters("blob")
+
+
+def test_result_cache_is_opt_in_bounded_and_invalidatable():
+    ec = EngineeringCalculator()
+    assert ec.cache_stats() is None
+
+    ec.enable_cache(maxsize=2)
+    first = ec.calculate_turning("Cutting speed", 100, 500)
+    first["value"] = -1  # dönen sözlük önbelleği bozmamalı
+    assert ec.calculate_turning("Cutting speed", 100, 500)["value"] == pytest.approx(157.0796, rel=1e-4)
+    # 2 ve 2.0 aynı hash'e sahip ama farklı anahtar olmalı
+    assert isinstance(ec.calculate_milling("Table feed", 1, 2, 3)["value"], int)
+    assert isinstance(ec.calculate_milling("Table feed", 1, 2.0, 3)["value"], float)
+
+    stats = ec.cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 3, 1, 2)
+
+    mass = ec.calculate_material_mass("circle", 7.85, 10, 100)
+    assert ec.calculate_material_mass("circle", 7.85, 10, 100) == mass
+    assert ec.calculate_material_mass("circle", 2.7, 10, 100) != mass
+    assert ec.invalidate_cache("shapes") == 2
+    assert ec.invalidate_cache() == 0
+
+    with pytest.raises(ValueError, match="Invalid turning calculation"):
+        ec.calculate_turning("Bogus", 1)
+
+
+def test_result_cache_ttl_expiry():
+    from machining_formulas.core.cache import ResultCache
+
+    now = [0.0]
+    cache = ResultCache(maxsize=4, ttl=10, clock=lambda: now[0])
+    assert cache.get_or_compute("k", lambda: 1) == 1
+    now[0] = 5.0
+    assert cache.get_or_compute("k", lambda: 2) == 1
+    now[0] = 11.0
+    assert cache.get_or_compute("k", lambda: 3) == 3
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+    assert stats.hit_rate == pytest.approx(1 / 3)
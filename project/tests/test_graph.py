@@ -0,0 +1,45 @@
+import math
+
+import pytest
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+from machining_formulas.core.graph import FormulaGraph, evaluate_chain
+
+
+def test_milling_chain_shares_intermediates():
+    ec = EngineeringCalculator()
+    result = evaluate_chain("milling", Vc=200, DCap=20, fz=0.1, ZEFF=4, ap=2, ae=10, kc=2000)
+
+    n = ec.calculate_milling("Spindle speed", 200, 20)["value"]
+    vf = ec.calculate_milling("Table feed", 0.1, n, 4)["value"]
+    pc = ec.calculate_milling("Net power", 10, 2, vf, 2000)["value"]
+    torque = ec.calculate_milling("Torque", pc, n)["value"]
+
+    assert result.values["n"] == pytest.approx(n)
+    assert result.values["Vf"] == pytest.approx(vf)
+    assert result.values["Mc"] == pytest.approx(torque)
+    assert result.units["Mc"] == "Nm"
+    assert result.units["Q"] == "cm³/min"
+    assert result.steps.index("n") < result.steps.index("Vf") < result.steps.index("Pc")
+    # Bilinen girdiler yeniden hesaplanmaz
+    assert "fz" not in result.steps
+
+
+def test_targets_prune_plan_and_report_underivable():
+    graph = FormulaGraph.for_category("turning")
+
+    plan = graph.plan({"Vc", "Dm", "fn", "lm"}, targets={"Tc"})
+    assert [f.key for f in plan] == ["Spindle speed", "Machining time"]
+
+    with pytest.raises(ValueError, match="Cannot derive Pc"):
+        graph.plan({"Vc", "ap", "fn"}, targets={"Pc"})
+
+    with pytest.raises(ValueError, match="Unknown quantity"):
+        evaluate_chain("turning", foo=1)
+
+
+def test_chain_works_on_arrays():
+    np = pytest.importorskip("numpy")
+    result = evaluate_chain("turning", Dm=np.array([50.0, 100.0]), n=1000, ap=2, fn=0.2)
+    assert result.values["Vc"] == pytest.approx([50 * math.pi, 100 * math.pi])
+    assert result.values["Q"].shape == (2,)
@@ -350,3 +350,143 @@ def test_handle_tool_calls_drilling_success():
     assert "31.42" in calculator.history[0]["content"]
 
 
+
+
+def test_many_tool_calls_run_once_each_in_deterministic_order():
+    import threading
+
+    calculator = _build_calculator_stub()
+
+    def fake_post_chat(urls, payload, headers, timeout=60):
+        return DummyResponse({"message": {"role": "assistant", "content": "tamam"}}), urls[0], False
+
+    calculator._post_chat_with_legacy_support = fake_post_chat  # type: ignore[assignment]
+    threads = set()
+    executed = []
+    original = AdvancedCalculator._execute_tool
+
+    def tracking_execute(self, tool_name, arguments, messages_history):
+        threads.add(threading.current_thread().name)
+        executed.append((tool_name, arguments.get("Dm")))
+        return original(self, tool_name, arguments, messages_history)
+
+    calculator._execute_tool = tracking_execute.__get__(calculator)  # type: ignore[assignment]
+
+    tool_calls = [
+        {
+            "id": f"call-{i}",
+            "type": "function",
+            "function": {
+                "name": "calculate_turning_cutting_speed",
+                "arguments": {"Dm": 10 + (i % 12), "n": 1000},
+            },
+        }
+        for i in range(24)
+    ]
+    tool_calls.insert(5, {"id": "bad", "type": "function", "function": {"name": "nope", "arguments": "{}"}})
+
+    _msg, history = calculator.handle_tool_calls("http://x/v1/chat", "m", [], tool_calls, [])
+
+    tool_msgs = [m for m in history if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_msgs] == [c["id"] for c in tool_calls]
+    assert tool_msgs[5]["content"].startswith("HATA: Bilinmeyen tool")
+    assert tool_msgs[0]["content"] == "31.42 m/min" and tool_msgs[13]["content"] == tool_msgs[0]["content"]
+    assert calculator.history == tool_msgs
+
+    details = calculator._last_tool_run_details
+    expected = [m["content"] for m in tool_msgs if m["tool_call_id"] != "bad"]
+    assert [r["content"] for r in details["results"]] == expected
+    assert details["errors"] == ["Bilinmeyen tool: nope"]
+    # 25 çağrıdan 13'ü farklı (12 benzersiz + hatalı); hepsi çağıran iş parçacığında
+    assert len(executed) == 13 and len(set(executed)) == 13
+    assert threads == {threading.current_thread().name}
+
+
+def _speed_call(call_id, dm):
+    return {
+        "id": call_id,
+        "function": {"name": "calculate_turning_cutting_speed", "arguments": {"Dm": dm, "n": 1000}},
+    }
+
+
+def test_follow_up_tool_calls_run_further_rounds():
+    calculator = _build_calculator_stub()
+    replies = [
+        {"message": {"role": "assistant", "content": "", "tool_calls": [_speed_call("call-2", 100)]}},
+        {"message": {"role": "assistant", "content": "İki hız hesaplandı."}},
+    ]
+    payloads = []
+
+    def fake_post_chat(url_candidates, payload, headers, timeout=60):
+        payloads.append(payload)
+        return DummyResponse(replies[len(payloads) - 1]), url_candidates[0], False
+
+    calculator._post_chat_with_legacy_support = fake_post_chat  # type: ignore[assignment]
+    tools_def = [{"type": "function", "function": {"name": "calculate_turning_cutting_speed"}}]
+
+    message, history = calculator.handle_tool_calls(
+        "http://x/v1/chat", "m", [], [_speed_call("call-1", 50)], tools_def
+    )
+
+    assert message["content"] == "İki hız hesaplandı."
+    assert [m["role"] for m in history] == ["assistant", "tool", "assistant", "tool", "assistant"]
+    assert [m["content"] for m in calculator.history] == ["157.08 m/min", "314.16 m/min"]
+    assert payloads[0]["tools"] == tools_def and payloads[1]["messages"][-1]["tool_call_id"] == "call-2"
+
+    details = calculator._last_tool_run_details
+    assert details["stopped"] == "completed" and len(details["results"]) == 2
+    assert [r["round"] for r in details["rounds"]] == [1, 2]
+    assert all(r["model_ms"] >= 0 and r["tools_ms"] >= 0 for r in details["rounds"])
+
+
+def test_round_limit_returns_partial_answer_without_offering_tools_last():
+    calculator = _build_calculator_stub()
+    calculator._tool_loop_limit = 2
+    payloads = []
+
+    def fake_post_chat(url_candidates, payload, headers, timeout=60):
+        payloads.append(payload)
+        reply = {"role": "assistant", "content": "devam", "tool_calls": [_speed_call(f"c{len(payloads)}", 10)]}
+        return DummyResponse({"message": reply}), url_candidates[0], False
+
+    calculator._post_chat_with_legacy_support = fake_post_chat  # type: ignore[assignment]
+    message, _history = calculator.handle_tool_calls(
+        "http://x/v1/chat", "m", [], [_speed_call("c0", 50)], [{"type": "function"}]
+    )
+
+    assert len(payloads) == 2 and "tools" in payloads[0] and "tools" not in payloads[1]
+    assert calculator._last_tool_run_details["stopped"] == "round_limit"
+    assert "Araç turu sınırına (2)" in message["content"]
+    assert "157.08 m/min" in message["content"] and "31.42 m/min" in message["content"]
+
+
+def test_time_budget_caps_request_timeout_and_returns_partial_answer():
+    import time
+
+    calculator = _build_calculator_stub()
+    calculator.tool_time_budget = 0.2
+    timeouts = []
+
+    def slow_post_chat(url_candidates, payload, headers, timeout=60):
+        timeouts.append(timeout)
+        time.sleep(timeout)
+        raise ValueError("Ollama isteği başarısız: Zaman aşımı")
+
+    calculator._post_chat_with_legacy_support = slow_post_chat  # type: ignore[assignment]
+    message, history = calculator.handle_tool_calls(
+        "http://x/v1/chat", "m", [], [_speed_call("c1", 50)], [], timeout=60
+    )
+
+    assert timeouts[0] <= 0.2
+    assert message["content"].startswith("⏱ Zaman bütçesi doldu")
+    assert "157.08 m/min" in message["content"] and history[-1] == message
+    assert calculator._last_tool_run_details["stopped"] == "time_budget"
+
+    # Bütçe dolmadan gelen hatalar olduğu gibi yükselir
+    calculator.tool_time_budget = None
+    try:
+        calculator.handle_tool_calls("http://x/v1/chat", "m", [], [_speed_call("c1", 50)], [], timeout=0)
+    except ValueError as exc:
+        assert "Zaman aşımı" in str(exc)
+    else:
+        raise AssertionError("error was swallowed")
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from machining_formulas.gui.advanced_calculator import AdvancedCalculator
+from machining_formulas.llm.endpoint_cache import get_endpoint_cache
+from machining_formulas.llm.hedging import HedgePolicy, ahedged_first, hedged_first
+from machining_formulas.llm.response_cache import LLMResponseCache
+from machining_formulas.llm.streaming import ChatStream, StreamStats
+
+V1 = "http://shop:11434/v1/chat"
+API = "http://shop:11434/api/chat"
+
+
+def test_slow_first_attempt_is_hedged_after_delay_and_told_to_stop():
+    stopped = threading.Event()
+
+    def slow(cancel):
+        if cancel.wait(5):
+            stopped.set()
+        return "slow"
+
+    started = time.monotonic()
+    index, value = hedged_first([slow, lambda cancel: "fast"], delay=0.05)
+    assert (index, value) == (1, "fast")
+    assert stopped.wait(1) and time.monotonic() - started < 1
+
+
+def test_failure_fires_next_attempt_without_waiting_for_delay():
+    def broken(cancel):
+        raise ValueError("HTTP 404")
+
+    started = time.monotonic()
+    assert hedged_first([broken, lambda cancel: "ok"], delay=10) == (1, "ok")
+    assert time.monotonic() - started < 1
+
+
+def test_all_failures_raise_last_error_and_respect_max_parallel():
+    running = []
+
+    def failing(n):
+        def run(cancel):
+            running.append(n)
+            time.sleep(0.02)
+            raise ValueError(f"fail {n}")
+
+        return run
+
+    with pytest.raises(ValueError, match="fail 2"):
+        hedged_first([failing(0), failing(1), failing(2)], delay=0, max_parallel=1)
+    assert running == [0, 1, 2]
+    with pytest.raises(ValueError):
+        hedged_first([], delay=0)
+    with pytest.raises(ValueError):
+        HedgePolicy(max_parallel=0)
+
+
+def test_async_hedge_cancels_losers():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def fast():
+        return "fast"
+
+    async def scenario():
+        result = await ahedged_first([slow, fast], delay=0.02)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == (1, "fast")
+    assert cancelled == ["slow"]
+
+
+def _calculator(policy, replies):
+    calc = AdvancedCalculator()
+    calc.hedge = policy
+    calls = []
+
+    def fake_post(url, payload, headers, timeout, **kwargs):
+        calls.append((url, payload["model"]))
+        reply = replies[(url, payload["model"])]
+        if isinstance(reply, float):
+            time.sleep(reply)
+            return {"from": url, "model": payload["model"]}
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    calc._post_chat_once = fake_post
+    return calc, calls
+
+
+def test_calculator_races_extra_host_and_records_winner():
+    other = "http://backup:11434/v1/chat"
+    policy = HedgePolicy(delay=0.05, extra_hosts=("http://backup:11434",))
+    calc, calls = _calculator(policy, {(V1, "m"): 2.0, (API, "m"): 2.0, (other, "m"): {"ok": True}})
+
+    data, url, legacy = calc._post_chat_with_legacy_support([V1, API], {"model": "m"}, {}, timeout=5)
+    assert (data, url, legacy) == ({"ok": True}, other, False)
+    assert calc.last_hedge_winner == {"attempt": 1, "url": other, "model": "m"}
+    assert get_endpoint_cache().preferred(other) == "/v1/"
+
+
+def test_calculator_races_extra_model_and_wraps_total_failure():
+    policy = HedgePolicy(delay=0.02, max_parallel=3, extra_models=("small",))
+    calc, calls = _calculator(
+        policy,
+        {(V1, "big"): 1.0, (API, "big"): ValueError("HTTP 404: yok"), (V1, "small"): {"ok": "small"}},
+    )
+    data, url, _legacy = calc._post_chat_with_legacy_support([V1, API], {"model": "big"}, {}, timeout=5)
+    assert data == {"ok": "small"} and calc.last_hedge_winner["model"] == "small"
+
+    calc, _calls = _calculator(HedgePolicy(delay=0), {(V1, "m"): ValueError("HTTP 500: x")})
+    with pytest.raises(ValueError, match="Ollama isteği başarısız: HTTP 500"):
+        calc._post_chat_with_legacy_support([V1], {"model": "m"}, {}, timeout=5)
+
+
+def test_without_policy_candidates_are_tried_in_order():
+    calc, calls = _calculator(None, {(V1, "m"): ValueError("HTTP 404: x"), (API, "m"): {"ok": 1}})
+    assert calc._post_chat_with_legacy_support([V1, API], {"model": "m"}, {}) == ({"ok": 1}, API, True)
+    assert calls == [(V1, "m"), (API, "m")]
+    assert calc.last_hedge_winner is None
+
+
+def test_extra_model_reply_is_cached_under_the_model_that_answered(tmp_path):
+    policy = HedgePolicy(delay=0.02, max_parallel=3, extra_models=("small",))
+    answer = {"message": {"role": "assistant", "content": "küçük model"}}
+    replies = {(V1, "big"): 1.0, (API, "big"): 1.0, (V1, "small"): answer, (API, "small"): answer}
+    calc, calls = _calculator(policy, replies)
+    calc.response_cache = LLMResponseCache(tmp_path / "c.sqlite3")
+    question = [{"role": "user", "content": "x"}]
+
+    calc.chat_with_tools(V1, "big", question, [], timeout=5)
+    assert calc.last_hedge_winner["model"] == "small"
+
+    assert calc.response_cache.lookup("big", question, [], [V1, API]) is None
+    assert calc.response_cache.lookup("small", question, [], [V1, API])[0] == answer
+
+
+def test_losing_attempt_is_cancelled_and_only_winner_stats_are_published():
+    winner_stats, loser_stats = StreamStats(started=1.0), StreamStats(started=2.0)
+    loser_cancelled = threading.Event()
+    calc = AdvancedCalculator()
+    calc.hedge = HedgePolicy(delay=0.02)
+
+    def fake_post(url, payload, headers, timeout, on_token=None, *, cancel=None, on_stats=None):
+        if url == V1:
+            if cancel.wait(5):
+                loser_cancelled.set()
+            on_stats(loser_stats)  # kaybeden geç biter; yayımlanmamalı
+            raise ValueError("İstek iptal edildi")
+        on_stats(winner_stats)
+        return {"ok": True}
+
+    calc._post_chat_once = fake_post
+    assert calc._post_chat_with_legacy_support([V1, API], {"model": "m"}, {}, timeout=5)[0] == {"ok": True}
+    assert loser_cancelled.wait(1)
+    time.sleep(0.05)
+    assert calc.last_stream_stats is winner_stats
+
+
+def test_chat_stream_stops_reading_once_cancelled():
+    cancel = threading.Event()
+    closed = []
+
+    def lines():
+        yield json.dumps({"message": {"content": "Mer"}, "done": False})
+        cancel.set()
+        yield json.dumps({"message": {"content": "haba"}, "done": False})
+        raise AssertionError("iptalden sonra okunmamalı")
+
+    stream = ChatStream(lines(), cancel=cancel, on_close=lambda: closed.append(True))
+    assert stream.consume()["message"]["content"] == "Mer"
+    assert stream.cancelled and closed == [True]
@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from machining_formulas.gui.advanced_calculator import AdvancedCalculator
+from machining_formulas.llm import http_pool
+from machining_formulas.llm.http_pool import HTTPPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def do_GET(self):  # noqa: N802
+        self.server.peers.add(self.client_address)
+        body = json.dumps({"models": [{"name": "llama3"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    httpd.daemon_threads = True
+    httpd.peers = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connections_are_reused_per_host(server):
+    url = f"http://127.0.0.1:{server.server_port}/api/tags"
+    with HTTPPool() as pool:
+        for _ in range(5):
+            assert pool.get(url, timeout=5).json()["models"][0]["name"] == "llama3"
+        assert pool.hosts == 1
+    assert len(server.peers) == 1  # tek TCP bağlantısı
+
+
+def test_host_limit_evicts_oldest_session_and_close_is_final():
+    pool = HTTPPool(max_hosts=2)
+    first = pool.session_for("http://a:1/x")
+    assert pool.session_for("http://A:1/y") is first
+    pool.session_for("http://b:1/")
+    pool.session_for("http://c:1/")
+    assert pool.hosts == 2 and pool.session_for("http://a:1/") is not first
+
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.session_for("http://a:1/")
+    with pytest.raises(ValueError):
+        HTTPPool(pool_maxsize=0)
+
+
+def test_configure_default_pool_replaces_and_closes_old():
+    old = http_pool.get_default_pool()
+    new = http_pool.configure_default_pool(pool_maxsize=4)
+    try:
+        assert http_pool.get_default_pool() is new and new.pool_maxsize == 4
+        with pytest.raises(RuntimeError):
+            old.session_for("http://x/")
+    finally:
+        http_pool.close_default_pool()
+
+
+def test_chat_response_body_is_parsed_once(monkeypatch):
+    parses = []
+
+    class CountingResponse:
+        status_code = 200
+        text = ""
+
+        def json(self):
+            parses.append(1)
+            return {"message": {"role": "assistant", "content": "ok"}}
+
+    monkeypatch.setattr("requests.Session.post", lambda *args, **kwargs: CountingResponse())
+
+    message, _history = AdvancedCalculator().chat_with_tools("http://localhost:11434", "llama3", [], [])
+    assert message["content"] == "ok"
+    assert len(parses) == 1
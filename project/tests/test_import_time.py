@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from machining_formulas.llm.tool_executor import ToolExecutor
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "machining_formulas.core.engineering_calculator",
+        "machining_formulas.llm.tool_executor",
+        "machining_formulas.gui.advanced_calculator",
+    ],
+)
+def test_headless_modules_do_not_load_gui_or_http(module):
+    code = (
+        f"import json, sys; import {module}; "
+        "heavy = ('tkinter', 'PIL', 'requests', 'numpy'); "
+        "print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in heavy)))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env={"PYTHONPATH": str(SRC)}
+    )
+    assert json.loads(out.stdout) == []
+
+
+def test_tool_executor_runs_without_gui():
+    code = (
+        "import json, sys; from machining_formulas.llm.tool_executor import ToolExecutor; "
+        "r = ToolExecutor().execute('calculate_turning_cutting_speed', '{\"Dm\": 50, \"n\": 1000}'); "
+        "gui = sorted(m for m in sys.modules if m.startswith('machining_formulas.gui')); "
+        "print(json.dumps([r.content, gui]))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env={"PYTHONPATH": str(SRC)}
+    )
+    assert json.loads(out.stdout) == ["157.08 m/min", []]
+
+
+def test_tool_executor_errors_match_gui_messages():
+    executor = ToolExecutor()
+    with pytest.raises(ValueError, match="'n' parametresi eksik"):
+        executor.execute("calculate_turning_cutting_speed", {"Dm": 50})
+    with pytest.raises(ValueError, match="Geçersiz hesap anahtarı"):
+        executor.execute("calculate_turning_nope", {})
+    with pytest.raises(ValueError, match="Bilinmeyen tool"):
+        executor.execute("calculate_welding_speed", {})
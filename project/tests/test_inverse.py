@@ -0,0 +1,63 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+from machining_formulas.core.inverse import solve, solve_chain, solve_for
+
+
+def test_solve_for_feed_from_machining_time_in_bulk():
+    ec = EngineeringCalculator()
+    targets = np.linspace(0.5, 5.0, 1000)
+
+    fn, unit = solve_for("turning", "Machining time", "fn", targets, lm=120, n=800)
+
+    assert unit == "mm/rev"
+    assert fn.shape == (1000,)
+    for t, f in zip(targets[::97], fn[::97]):
+        assert ec.calculate_turning("Machining time", 120, f, 800)["value"] == pytest.approx(t)
+
+
+def test_solve_chain_spindle_speed_for_power_target():
+    ec = EngineeringCalculator()
+    n, unit = solve_chain("milling", "Pc", "n", [2.0, 5.0], fz=0.1, ZEFF=4, ap=2, ae=10, kc=2000)
+
+    assert unit == "rpm"
+    assert n == pytest.approx([7500.0, 18750.0])
+    for target, speed in zip([2.0, 5.0], n):
+        vf = ec.calculate_milling("Table feed", 0.1, speed, 4)["value"]
+        assert ec.calculate_milling("Net power", 10, 2, vf, 2000)["value"] == pytest.approx(target)
+
+
+def test_solve_chain_unreachable_target_is_nan():
+    # Pc > 0 her n için; negatif güç hedefine ulaşılamaz
+    n, _ = solve_chain("milling", "Pc", "n", [-1.0, 5.0], fz=0.1, ZEFF=4, ap=2, ae=10, kc=2000)
+
+    assert np.isnan(n[0])
+    assert n[1] == pytest.approx(18750.0)
+
+
+def test_non_power_law_falls_back_to_bracketing():
+    ec = EngineeringCalculator()
+    # Boru hacmi iç yarıçapta güç yasası değildir -> bisection
+    volume = ec.shape_definitions["tube"](30.0, 12.0, 100.0)
+
+    inner, unit = solve_for("shapes", "tube", "inner_radius", volume, outer_radius=30.0, length=100.0,
+                            bracket=(0.0, 30.0))
+
+    assert unit == "mm"
+    assert inner == pytest.approx(12.0, rel=1e-9)
+
+
+def test_solve_methods_agree_and_validate():
+    analytic = solve(lambda x: 3.0 * x**2, [12.0, 48.0], method="analytic")
+    numeric = solve(lambda x: 3.0 * x**2, [12.0, 48.0], method="numeric")
+    assert analytic == pytest.approx([2.0, 4.0])
+    assert numeric == pytest.approx([2.0, 4.0])
+
+    with pytest.raises(ValueError, match="not a parameter"):
+        solve_for("turning", "Cutting speed", "fn", 100, Dm=50)
+    with pytest.raises(ValueError, match="Missing parameter"):
+        solve_for("turning", "Net power", "fn", 5, Vc=100)
+    with pytest.raises(ValueError, match="Cannot derive"):
+        solve_chain("turning", "Pc", "n", 5, ap=2)
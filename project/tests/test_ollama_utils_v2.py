@@ -27,7 +27,7 @@ def test_single_chat_request_openai_format(monkeypatch):
                 }
             ]
         })
-    monkeypatch.setattr("requests.post", mock_post)
+    monkeypatch.setattr("requests.Session.post", mock_post)
 
     result = single_chat_request("http://localhost:11434", "llama3", "Hello")
     assert result == "Test OpenAI Response"
@@ -41,7 +41,7 @@ def test_single_chat_request_ollama_format(monkeypatch):
                 "content": "Test Ollama Response"
             }
         })
-    monkeypatch.setattr("requests.post", mock_post)
+    monkeypatch.setattr("requests.Session.post", mock_post)
 
     result = single_chat_request("http://localhost:11434", "llama3", "Hello")
     assert result == "Test Ollama Response"
@@ -56,7 +56,7 @@ def test_get_available_models_success(monkeypatch):
                 {"name": "gemma2"}
             ]
         })
-    monkeypatch.setattr("requests.get", mock_get)
+    monkeypatch.setattr("requests.Session.get", mock_get)
 
     models = get_available_models("http://localhost:11434")
     assert models == ["llama3:latest", "gemma2"]
@@ -66,7 +66,7 @@ def test_test_connection_success(monkeypatch):
     """Test test_connection returns True when server responds 200."""
     def mock_get(*args, **kwargs):
         return DummyResponse({}, status_code=200)
-    monkeypatch.setattr("requests.get", mock_get)
+    monkeypatch.setattr("requests.Session.get", mock_get)
 
     assert ollama_test_connection("http://localhost:11434") is True
 
@@ -75,6 +75,6 @@ def test_test_connection_failure(monkeypatch):
     """Test test_connection returns False when server fails."""
     def mock_get(*args, **kwargs):
         raise Exception("Connection Refused")
-    monkeypatch.setattr("requests.get", mock_get)
+    monkeypatch.setattr("requests.Session.get", mock_get)
 
     assert ollama_test_connection("http://localhost:11434") is False
@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+from machining_formulas.core.optimize import MachineLimits, optimize
+
+
+def test_turning_mrr_is_capped_by_spindle_power():
+    result = optimize(
+        "turning",
+        "Metal removal rate",
+        cutting_speed=(80, 320),
+        feed=(0.05, 0.5),
+        fixed={"Dm": 60, "ap": 3, "kc": 2100},
+        limits=MachineLimits(max_rpm=4000, max_power=5.0),
+    )
+
+    # Pc = Q * kc / 60000  ->  Q_max = Pmax * 60000 / kc
+    assert result.feasible
+    assert result.unit == "cm³/min"
+    assert result.value == pytest.approx(5.0 * 60000 / 2100, rel=1e-3)
+    assert result.values["Pc"] <= 5.0
+    assert "Pc" in result.binding
+
+
+def test_turning_machining_time_respects_rpm_limit():
+    ec = EngineeringCalculator()
+    result = optimize(
+        "turning",
+        "Machining time",
+        cutting_speed=(100, 400),
+        feed=(0.1, 0.3),
+        fixed={"Dm": 50, "lm": 200},
+        limits=MachineLimits(max_rpm=1500),
+    )
+
+    assert result.inputs["fn"] == pytest.approx(0.3)
+    assert result.values["n"] <= 1500
+    assert result.values["n"] == pytest.approx(1500, rel=1e-3)
+    expected = ec.calculate_turning("Machining time", 200, 0.3, result.values["n"])["value"]
+    assert result.value == pytest.approx(expected)
+
+
+def test_milling_torque_limit_and_infeasible_case():
+    fixed = {"DCap": 20, "ZEFF": 4, "ap": 4, "ae": 10, "kc": 2000}
+    result = optimize(
+        "milling",
+        cutting_speed=(100, 300),
+        feed=(0.05, 0.2),
+        fixed=fixed,
+        limits=MachineLimits(max_rpm=6000, max_torque=15),
+    )
+    assert result.feasible
+    assert result.values["Mc"] <= 15
+    assert result.values["n"] == pytest.approx(result.inputs["Vc"] * 1000 / (math.pi * 20))
+
+    impossible = optimize(
+        "milling",
+        cutting_speed=(100, 300),
+        feed=(0.05, 0.2),
+        fixed=fixed,
+        limits=MachineLimits(max_rpm=100),
+    )
+    assert not impossible.feasible
+    assert math.isnan(impossible.value)
+
+
+def test_optimize_validates_inputs():
+    with pytest.raises(ValueError, match="Invalid optimization category"):
+        optimize("drilling", cutting_speed=(1, 2), feed=(1, 2), fixed={})
+    with pytest.raises(ValueError, match="Invalid turning calculation"):
+        optimize("turning", "Torque", cutting_speed=(1, 2), feed=(1, 2), fixed={})
+    with pytest.raises(ValueError, match="Cannot derive"):
+        optimize("turning", cutting_speed=(100, 200), feed=(0.1, 0.2), fixed={"Dm": 50},
+                 limits=MachineLimits(max_power=5))
@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+
+from machining_formulas.cli import main
+from machining_formulas.parallel import run_parallel_batch, shard_boundaries
+
+
+def _jobs(rows):
+    lines = []
+    for i in range(rows):
+        if i % 7 == 3:
+            job = {"category": "turning", "method": "Bogus", "args": [1]}
+        elif i % 2:
+            job = {"category": "milling", "method": "Table feed", "fz": 0.1, "n": 100 + i, "ZEFF": 4}
+        else:
+            job = {"category": "turning", "method": "Cutting speed", "Dm": 10 + i, "n": 500}
+        lines.append(json.dumps(job))
+    return "\n".join(lines) + "\n"
+
+
+def test_shard_boundaries_cover_range():
+    assert shard_boundaries(10, 110, 4) == [10, 35, 60, 85, 110]
+    assert shard_boundaries(0, 3, 8) == [0, 1, 2, 3]
+    assert shard_boundaries(5, 5, 4) == [5, 5]
+
+
+@pytest.mark.parametrize("shards", [1, 3, 17, 200])
+def test_parallel_jsonl_matches_sequential_order_and_ids(tmp_path, shards):
+    source = tmp_path / "jobs.jsonl"
+    source.write_text(_jobs(60), encoding="utf-8")
+    expected = io.StringIO()
+    main(["batch", str(source), "-q"], out=expected)
+
+    out = io.StringIO()
+    seen = []
+    report = run_parallel_batch(str(source), out, workers=2, shards=shards, progress=seen.append)
+
+    assert out.getvalue() == expected.getvalue()
+    assert report.rows == 60
+    assert report.failures == sum(1 for i in range(60) if i % 7 == 3)
+    assert seen[-1].shards_done == seen[-1].shards_total == report.shards
+    assert report.worker_rows_per_second
+
+
+def test_parallel_csv_via_cli(tmp_path):
+    source = tmp_path / "jobs.csv"
+    rows = ["category,method,Dm,n"] + [f"turning,Cutting speed,{10 + i},500" for i in range(25)]
+    source.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    sequential, parallel = tmp_path / "seq.csv", tmp_path / "par.csv"
+
+    assert main(["batch", str(source), "-o", str(sequential), "-q"]) == 0
+    assert main(["batch", str(source), "-o", str(parallel), "-j", "2", "-q"]) == 0
+
+    assert parallel.read_text(encoding="utf-8") == sequential.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("shards", [1, 4, 40])
+def test_parallel_csv_with_bom_and_blank_lines_matches_sequential(tmp_path, shards):
+    source = tmp_path / "jobs.csv"
+    rows = ["id,category,method,Dm,n"]
+    for i in range(30):
+        rows.append(f",turning,Cutting speed,{10 + i},500")
+        if i % 4 == 1:
+            rows.append("")
+    source.write_text("\n".join(rows) + "\n", encoding="utf-8-sig")
+    expected = io.StringIO()
+    main(["batch", str(source), "-q"], out=expected)
+
+    out = io.StringIO()
+    report = run_parallel_batch(str(source), out, fmt="csv", workers=2, shards=shards)
+
+    assert out.getvalue() == expected.getvalue()
+    records = [json.loads(line) for line in expected.getvalue().splitlines()]
+    assert [r["id"] for r in records] == list(range(1, 31))
+    assert report.rows == 30 and report.failures == 0
+
+
+def test_parallel_jsonl_with_bom_matches_sequential(tmp_path):
+    source = tmp_path / "jobs.jsonl"
+    source.write_text(_jobs(12), encoding="utf-8-sig")
+    expected = io.StringIO()
+    main(["batch", str(source), "-q"], out=expected)
+
+    out = io.StringIO()
+    run_parallel_batch(str(source), out, workers=2, shards=3)
+
+    assert out.getvalue() == expected.getvalue()
+    assert "Invalid JSON" not in out.getvalue()
+
+
+@pytest.mark.parametrize("shards", [1, 5, 40])
+def test_parallel_overflow_and_explicit_ids_match_sequential(tmp_path, shards):
+    valid = {"category": "turning", "method": "Cutting speed", "Dm": 100, "n": 500}
+    overflow = {"category": "drilling", "method": "Metal removal rate", "args": [1e200, 5]}
+    lines = []
+    for i in range(40):
+        job = dict(overflow if i == 17 else valid)
+        if i % 6 == 2:
+            job["id"] = f"op-{i}"
+        lines.append(json.dumps(job))
+        if i % 9 == 4:
+            lines.append("")
+    source = tmp_path / "jobs.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    for out_fmt in ("jsonl", "csv"):
+        sequential = io.StringIO()
+        main(["batch", str(source), "-q", "--output-format", out_fmt], out=sequential)
+        out = io.StringIO()
+        report = run_parallel_batch(str(source), out, out_fmt=out_fmt, workers=2, shards=shards)
+        assert out.getvalue() == sequential.getvalue()
+        assert report.rows == 40 and report.failures == 1
@@ -0,0 +1,166 @@
+import logging
+import sqlite3
+
+import pytest
+
+from machining_formulas.gui.advanced_calculator import AdvancedCalculator
+from machining_formulas.llm import response_cache
+from machining_formulas.llm.ollama_utils_v2 import chat_with_ollama
+from machining_formulas.llm.response_cache import LLMResponseCache, response_cache_key
+
+V1 = "http://shop:11434/v1/chat"
+API = "http://shop:11434/api/chat"
+QUESTION = [{"role": "user", "content": "Ø50 mm, 1200 rpm kesme hızı?"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def enabled_cache(tmp_path):
+    cache = response_cache.enable_response_cache(tmp_path / "responses.sqlite3")
+    yield cache
+    response_cache.disable_response_cache()
+
+
+def test_key_is_canonical_and_includes_flavor():
+    tools = [{"type": "function", "function": {"name": "calc", "parameters": {"a": 1, "b": 2}}}]
+    reordered = [{"function": {"parameters": {"b": 2, "a": 1}, "name": "calc"}, "type": "function"}]
+    key = response_cache_key("m", QUESTION, tools, "/v1/")
+    assert key == response_cache_key("m", QUESTION, reordered, "/v1/")
+    assert key != response_cache_key("m", QUESTION, tools, "/api/")
+    assert response_cache_key("m", QUESTION, None, "/v1/") != response_cache_key(
+        "other", QUESTION, None, "/v1/"
+    )
+
+
+def test_lru_eviction_ttl_stats_and_persistence(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(path, maxsize=2, ttl=60, clock=clock)
+    cache.put("a", {"n": 1})
+    clock.now += 1
+    cache.put("b", {"n": 2})
+    clock.now += 1
+    assert cache.get("a") == {"n": 1}  # "a" artık en yeni
+    clock.now += 1
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None and cache.get("c") == {"n": 3}
+
+    clock.now += 61
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations, stats.size) == (2, 2, 1, 1, 1)
+    assert stats.hit_rate == 0.5
+    cache.close()
+
+    reopened = LLMResponseCache(path, maxsize=2, ttl=60, clock=clock)
+    assert reopened.get("c") is None and len(reopened) == 0  # süresi doldu
+    reopened.put("d", {"n": 4})
+    reopened.close()
+    assert LLMResponseCache(path, clock=clock).get("d") == {"n": 4}
+
+
+def test_lookup_prefers_candidate_order_and_counts_one_miss(tmp_path):
+    cache = LLMResponseCache(tmp_path / "c.sqlite3")
+    assert cache.lookup("m", QUESTION, None, [V1, API]) is None
+    cache.store("m", QUESTION, None, API, {"message": {"content": "legacy"}})
+    assert cache.lookup("m", QUESTION, None, [V1, API]) == ({"message": {"content": "legacy"}}, API)
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+
+def test_broken_or_closed_database_fails_open(tmp_path, caplog):
+    path = tmp_path / "c.sqlite3"
+    cache = LLMResponseCache(path)
+    cache.store("m", QUESTION, None, V1, {"message": {"content": "eski"}})
+    with sqlite3.connect(str(path)) as other:
+        other.execute("DROP TABLE responses")  # bozuk/uyumsuz veritabanı
+
+    with caplog.at_level(logging.WARNING, logger="machining_formulas.llm.response_cache"):
+        assert cache.lookup("m", QUESTION, None, [V1]) is None
+        cache.store("m", QUESTION, None, V1, {"message": {"content": "yeni"}})
+        assert cache.clear() == 0
+    assert "read failed" in caplog.text and "write skipped" in caplog.text and "clear failed" in caplog.text
+    assert cache.stats().misses == 1 and cache.stats().size == 0
+
+    calc = AdvancedCalculator()
+    calc.response_cache = cache
+
+    def live_post(urls, payload, headers, timeout=60):
+        return {"message": {"role": "assistant", "content": "canlı"}}, urls[0], False
+
+    calc._post_chat_with_legacy_support = live_post  # type: ignore[assignment]
+    assert calc.chat_with_tools(V1, "m", QUESTION, [])[0]["content"] == "canlı"
+
+    cache.close()
+    assert cache.lookup("m", QUESTION, None, [V1]) is None
+    cache.store("m", QUESTION, None, V1, {"message": {"content": "kapalı"}})
+    assert cache.clear() == 0
+    assert len(cache) == 0
+
+
+def test_chat_with_ollama_uses_cache_with_bypass_and_refresh(monkeypatch, enabled_cache):
+    calls = []
+
+    class Response:
+        status_code = 200
+        text = ""
+
+        def __init__(self, n):
+            self.n = n
+
+        def json(self):
+            return {"choices": [{"message": {"content": f"yanıt {self.n}"}}]}
+
+    def fake_post(session, url, **kwargs):
+        calls.append(url)
+        return Response(len(calls))
+
+    monkeypatch.setattr("requests.Session.post", fake_post)
+    url = "http://shop:11434"
+
+    def answer(**options):
+        return chat_with_ollama(url, "llama3", QUESTION, **options)["choices"][0]["message"]["content"]
+
+    assert answer() == "yanıt 1"
+    assert answer() == "yanıt 1"
+    assert len(calls) == 1
+
+    assert answer(bypass_cache=True) == "yanıt 2"
+    assert answer() == "yanıt 1"
+    assert answer(refresh_cache=True) == "yanıt 3"
+    assert answer() == "yanıt 3"
+    assert len(calls) == 3
+
+    tokens = []
+    chat_with_ollama(url, "llama3", QUESTION, on_token=tokens.append)
+    assert tokens == ["yanıt 3"] and len(calls) == 3
+    assert enabled_cache.stats().hits == 4
+
+
+def test_chat_with_tools_is_served_from_cache(enabled_cache):
+    calc = AdvancedCalculator()
+    posts = []
+
+    def fake_post_chat(url_candidates, payload, headers, timeout=60):
+        posts.append(payload)
+        return {"message": {"role": "assistant", "content": "157.08 m/min"}}, url_candidates[0], False
+
+    calc._post_chat_with_legacy_support = fake_post_chat  # type: ignore[assignment]
+    streamed = []
+    calc.stream_callback = streamed.append
+
+    first, _ = calc.chat_with_tools(V1, "llama3", QUESTION, [])
+    assert not calc.last_response_cached
+    second, history = calc.chat_with_tools(V1, "llama3", QUESTION, [])
+    assert second == first and calc.last_response_cached and len(posts) == 1
+    assert streamed == ["157.08 m/min"] and history[-1] == first
+
+    calc.refresh_response_cache = True
+    calc.chat_with_tools(V1, "llama3", QUESTION, [])
+    assert len(posts) == 2 and not calc.last_response_cached
@@ -0,0 +1,99 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from machining_formulas.server import CalculationServer
+
+
+@pytest.fixture()
+def server():
+    srv = CalculationServer(("127.0.0.1", 0), workers=4)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _request(conn, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_calculate_batch_and_registry_over_one_keep_alive_connection(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    job = {"category": "turning", "method": "Cutting speed", "Dm": 100, "n": 500}
+    status, result = _request(conn, "POST", "/calculate", job)
+    assert status == 200
+    assert result["value"] == pytest.approx(157.0796, rel=1e-4)
+    sock = conn.sock
+
+    status, batch = _request(
+        conn,
+        "POST",
+        "/batch",
+        {"jobs": [
+            {"category": "milling", "method": "Table feed", "args": [0.1, 1000, 4]},
+            {"category": "shapes", "method": "circle", "density": 7.85, "args": [10, 100]},
+            {"category": "turning", "method": "Bogus", "args": [1]},
+        ]},
+    )
+    assert status == 200
+    assert [r["id"] for r in batch["results"]] == [0, 1, 2]
+    assert batch["results"][0]["value"] == pytest.approx(400.0)
+    assert "error" in batch["results"][2]
+
+    status, registry = _request(conn, "GET", "/registry")
+    assert registry["milling"]["Torque"]["params"] == [
+        {"name": "Pc", "unit": "kW"},
+        {"name": "n", "unit": "rpm"},
+    ]
+    assert conn.sock is sock  # aynı TCP bağlantısı yeniden kullanıldı
+    conn.close()
+
+
+def test_errors_and_metrics(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    assert _request(conn, "POST", "/calculate", {"category": "turning", "method": "Bogus"})[0] == 400
+    assert _request(conn, "GET", "/nope")[0] == 404
+    conn.request("POST", "/calculate", body=b"{not json", headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    assert response.status == 400 and "Invalid JSON" in json.loads(response.read())["error"]
+    zero_divisor = {"category": "turning", "method": "Spindle speed", "args": [100, 0]}
+    status, payload = _request(conn, "POST", "/calculate", zero_divisor)
+    assert status == 400 and "division by zero" in payload["error"]
+    conn.request("POST", "/nope", body=b"{not json", headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    assert response.status == 404 and "Unknown endpoint" in json.loads(response.read())["error"]
+
+    overflow = {"category": "drilling", "method": "Metal removal rate", "args": [1e200, 5]}
+    status, payload = _request(conn, "POST", "/calculate", overflow)
+    assert status == 400 and "error" in payload
+    valid = {"category": "turning", "method": "Cutting speed", "Dm": 100, "n": 500}
+    status, payload = _request(conn, "POST", "/batch", {"jobs": [valid, overflow, valid]})
+    assert status == 200
+    assert ["error" in r for r in payload["results"]] == [False, True, False]
+
+    status, metrics = _request(conn, "GET", "/metrics")
+    assert status == 200
+    assert metrics["requests"]["POST /calculate"] == 4
+    assert metrics["statuses"]["400"] == 4
+    assert set(metrics["latency_ms"]["POST /calculate"]) == {"p50", "p90", "p99", "max"}
+    conn.close()
+
+
+def test_negative_content_length_is_rejected(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.putrequest("POST", "/calculate")
+    conn.putheader("Content-Length", "-5")
+    conn.endheaders()
+    response = conn.getresponse()
+    assert response.status == 400 and "Content-Length" in json.loads(response.read())["error"]
+    conn.close()
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from machining_formulas.gui.startup_profile import DISABLED, StartupProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000.0
+
+
+def test_nested_phases_and_marks_are_relative_to_origin(tmp_path):
+    clock = FakeClock()
+    profiler = StartupProfiler(clock=clock)
+
+    with profiler.phase("setup_ui"):
+        clock.advance(5)
+        with profiler.phase("_create_turning_tab"):
+            with profiler.phase("image_decode:turning.png"):
+                clock.advance(20)
+            clock.advance(10)
+    profiler.record("imports", 0.050, start=clock.now - 0.050)
+    profiler.mark("first_paint")
+    clock.advance(3)
+    profiler.mark("first_idle")
+    profiler.mark("first_paint")  # yalnızca ilk kayıt sayılır
+
+    phases = {p.name: p for p in profiler.phases}
+    assert [p.name for p in profiler.phases][:3] == [
+        "setup_ui",
+        "_create_turning_tab",
+        "image_decode:turning.png",
+    ]
+    assert phases["setup_ui"].duration_ms == pytest.approx(35)
+    assert phases["_create_turning_tab"].start_ms == pytest.approx(5)
+    assert phases["image_decode:turning.png"].depth == 2
+    assert phases["image_decode:turning.png"].parent == "_create_turning_tab"
+    assert profiler.marks == {"first_paint": pytest.approx(35), "first_idle": pytest.approx(38)}
+
+    report = json.loads(profiler.write(tmp_path / "profile.json").read_text(encoding="utf-8"))
+    assert report["total_ms"] == pytest.approx(38)
+    assert report["top_level_ms"] == pytest.approx(85)
+    assert report["marks"]["first_idle"] == pytest.approx(38)
+
+
+def test_phase_records_duration_when_block_raises():
+    clock = FakeClock()
+    profiler = StartupProfiler(clock=clock)
+    with pytest.raises(RuntimeError):
+        with profiler.phase("styles"):
+            clock.advance(2)
+            raise RuntimeError("boom")
+    assert profiler.phases[0].duration_ms == pytest.approx(2)
+    with profiler.phase("next"):
+        pass
+    assert profiler.phases[1].depth == 0
+
+
+def test_disabled_profiler_records_nothing():
+    with DISABLED.phase("styles"):
+        DISABLED.mark("first_paint")
+    DISABLED.record("imports", 1.0)
+    assert DISABLED.phases == [] and DISABLED.marks == {}
+
+
+def test_module_entrypoint_profiles_gui_imports(monkeypatch):
+    import machining_formulas.__main__ as entry
+    from machining_formulas.gui import v3_gui
+
+    calls = []
+    monkeypatch.setattr(v3_gui, "main", lambda argv, profiler=None: calls.append((argv, profiler)))
+
+    assert entry.main(["--profile-startup", "out.json", "--exit-after-startup"]) == 0
+    argv, profiler = calls[0]
+    assert argv == ["--profile-startup", "out.json", "--exit-after-startup"]
+    assert [p.name for p in profiler.phases] == ["imports"]
+
+    args = v3_gui._parse_args(argv)
+    assert args.profile_startup == "out.json" and args.exit_after_startup
+    assert v3_gui._parse_args(["--profile-startup"]).profile_startup == "startup_profile.json"
+
+    assert entry.main([]) == 0
+    assert calls[1] == ([], DISABLED)
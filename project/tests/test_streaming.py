@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from machining_formulas.gui.advanced_calculator import AdvancedCalculator
+from machining_formulas.llm.ollama_utils_v2 import chat_with_ollama, single_chat_request
+from machining_formulas.llm.streaming import ChatStream, parse_stream_line
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.1
+        return self.now
+
+
+def _sse(chunk):
+    return "data: " + json.dumps(chunk)
+
+
+def test_sse_stream_yields_tokens_and_rebuilds_tool_calls():
+    first_fragment = {"name": "calc", "arguments": '{"D":'}
+    second_fragment = {"index": 0, "function": {"arguments": " 50}"}}
+    lines = [
+        ": keep-alive",
+        _sse({"choices": [{"delta": {"role": "assistant", "content": "Vc "}}]}),
+        "",
+        _sse({"choices": [{"delta": {"content": "= 150"}}]}),
+        _sse({"choices": [{"delta": {"tool_calls": [{"index": 0, "id": "c1", "function": first_fragment}]}}]}),
+        _sse({"choices": [{"delta": {"tool_calls": [second_fragment]}, "finish_reason": "tool_calls"}]}),
+        "data: [DONE]",
+        _sse({"choices": [{"delta": {"content": "ignored"}}]}),
+    ]
+    stream = ChatStream(lines, clock=FakeClock())
+    assert list(stream) == ["Vc ", "= 150"]
+
+    message = stream.response()["choices"][0]["message"]
+    assert message["content"] == "Vc = 150"
+    assert message["tool_calls"] == [
+        {"type": "function", "id": "c1", "function": {"name": "calc", "arguments": '{"D": 50}'}}
+    ]
+    assert stream.stats.ttft_ms == pytest.approx(100) and stream.stats.total_ms == pytest.approx(200)
+    assert stream.stats.tokens == 2 and stream.stats.chunks == 4
+
+
+def test_ndjson_stream_and_errors():
+    lines = [
+        json.dumps({"message": {"role": "assistant", "content": "Mer"}, "done": False}).encode(),
+        json.dumps({"message": {"content": "haba"}, "done": False}),
+        json.dumps({"message": {"content": ""}, "done": True, "eval_count": 2}),
+    ]
+    tokens = []
+    body = ChatStream(lines).consume(tokens.append)
+    assert tokens == ["Mer", "haba"]
+    assert body == {"done": True, "eval_count": 2, "message": {"role": "assistant", "content": "Merhaba"}}
+
+    with pytest.raises(ValueError, match="Stream error: model not found"):
+        parse_stream_line('{"error": "model not found"}')
+    with pytest.raises(ValueError, match="Invalid stream chunk"):
+        list(ChatStream(["data: {broken"]))
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def do_POST(self):  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append((self.path, payload))
+        if self.path.startswith("/v1/"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for piece in ("Kesme ", "hızı ", "uygun."):
+            chunk = {"message": {"role": "assistant", "content": piece}, "done": False}
+            self.wfile.write((json.dumps(chunk) + "\n").encode())
+            self.wfile.flush()
+            time.sleep(0.05)
+        self.wfile.write((json.dumps({"message": {"content": ""}, "done": True}) + "\n").encode())
+
+
+@pytest.fixture
+def server():
+    pytest.importorskip("requests")
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+    httpd.daemon_threads = True
+    httpd.payloads = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_single_chat_request_and_chat_with_ollama_stream(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    tokens = []
+    reply = single_chat_request(url, "llama3", "Merhaba", timeout=5, on_token=tokens.append)
+    assert reply == "Kesme hızı uygun."
+    assert tokens == ["Kesme ", "hızı ", "uygun."]
+    assert server.payloads[-1][1]["stream"] is True
+
+    reply = chat_with_ollama(
+        url, "llama3", [{"role": "user", "content": "x"}], timeout=5, on_token=lambda t: None
+    )
+    assert reply["message"]["content"] == "Kesme hızı uygun."
+
+
+def test_advanced_calculator_streams_and_tracks_first_token(server):
+    calc = AdvancedCalculator()
+    seen = []
+    calc.stream_callback = seen.append
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    msg, _history = calc.chat_with_tools(base, "llama3", [{"role": "user", "content": "x"}], [], timeout=5)
+    assert msg["content"] == "Kesme hızı uygun." and seen == ["Kesme ", "hızı ", "uygun."]
+    stats = calc.last_stream_stats
+    assert stats.ttft_ms < stats.total_ms and stats.total_ms >= 100
+
+
+def test_forked_assistants_stream_concurrently_without_mixing(server):
+    shared = AdvancedCalculator()
+    shared.tool_time_budget = 30.0
+    base = f"http://127.0.0.1:{server.server_port}"
+    forks = [shared.fork(), shared.fork()]
+    seen = {0: [], 1: []}
+
+    def ask(i):
+        forks[i].stream_callback = seen[i].append
+        forks[i].chat_with_tools(base, "llama3", [{"role": "user", "content": str(i)}], [], timeout=5)
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in seen]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert seen[0] == seen[1] == ["Kesme ", "hızı ", "uygun."]
+    assert all(f.last_stream_stats is not None for f in forks) and shared.last_stream_stats is None
+    assert forks[0].tool_time_budget == 30.0 and forks[0]._get_calculator() is shared._get_calculator()
+
+
+def test_cancelled_request_closes_stream_and_keeps_no_stats(server):
+    calc = AdvancedCalculator()
+    cancel = threading.Event()
+    seen, stats = [], []
+    url = f"http://127.0.0.1:{server.server_port}/api/chat"
+
+    def on_token(token):
+        seen.append(token)
+        cancel.set()  # ilk parçadan sonra yarışı başka aday kazandı
+
+    with pytest.raises(ValueError, match="iptal"):
+        calc._post_chat_once(
+            url, {"model": "llama3", "messages": []}, {}, 5, on_token, cancel=cancel, on_stats=stats.append
+        )
+    assert seen == ["Kesme "] and stats == []
@@ -0,0 +1,71 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from machining_formulas.core.engineering_calculator import EngineeringCalculator
+from machining_formulas.core.sweep import iter_sweep, sweep
+
+
+def test_sweep_matches_scalar_formulas_on_grid():
+    ec = EngineeringCalculator()
+    vc = np.array([100.0, 200.0])
+    fn = np.array([0.1, 0.2, 0.3])
+    ap = np.array([1.0, 2.0])
+
+    result = sweep(
+        "turning",
+        ["Metal removal rate", "Net power"],
+        {"Vc": vc, "fn": fn, "ap": ap},
+        fixed={"kc": 2000},
+        chunk_size=5,  # parçalara bölünmüş değerlendirme
+    )
+
+    assert result.shape == (2, 3, 2)
+    assert result.units["Net power"] == "kW"
+    for i, a in enumerate(vc):
+        for j, b in enumerate(fn):
+            for k, c in enumerate(ap):
+                expected = ec.calculate_turning("Net power", a, c, b, 2000)["value"]
+                assert result.outputs["Net power"][i, j, k] == pytest.approx(expected)
+                mrr = ec.calculate_turning("Metal removal rate", a, c, b)["value"]
+                assert result.outputs["Metal removal rate"][i, j, k] == pytest.approx(mrr)
+
+
+def test_iter_sweep_chunks_cover_grid_in_order():
+    chunks = list(
+        iter_sweep(
+            "milling",
+            ["Table feed"],
+            {"fz": np.linspace(0.05, 0.2, 4), "n": [1000, 2000, 3000]},
+            fixed={"ZEFF": 4},
+            chunk_size=5,
+            dtype=np.float32,
+        )
+    )
+
+    assert [(c.start, c.stop) for c in chunks] == [(0, 5), (5, 10), (10, 12)]
+    assert all(c.outputs["Table feed"].dtype == np.float32 for c in chunks)
+    flat = np.concatenate([c.outputs["Table feed"] for c in chunks])
+    assert flat[0] == pytest.approx(0.05 * 1000 * 4)
+    assert flat[-1] == pytest.approx(0.2 * 3000 * 4)
+
+
+def test_sweep_validates_inputs():
+    with pytest.raises(ValueError, match="Cannot derive kc"):
+        sweep("turning", ["Net power"], {"Vc": [100], "ap": [1], "fn": [0.1]})
+    with pytest.raises(ValueError, match="Invalid turning calculation"):
+        sweep("turning", ["Torque"], {"Pc": [1], "n": [1]})
+    with pytest.raises(ValueError, match="both as axis and fixed"):
+        sweep("turning", ["Cutting speed"], {"Dm": [50], "n": [100]}, fixed={"n": 100})
+
+
+def test_sweep_derives_missing_inputs_through_graph():
+    # Machining time needs n; it is derived from the Vc axis and fixed Dm.
+    result = sweep(
+        "turning",
+        ["Machining time"],
+        {"Vc": [100.0, 200.0], "fn": [0.1, 0.2]},
+        fixed={"Dm": 50, "lm": 100},
+    )
+    n = 100.0 * 1000 / (np.pi * 50)
+    assert result.outputs["Machining time"][0, 0] == pytest.approx(100 / (0.1 * n))
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from machining_formulas.gui.task_runner import TaskRunner
+
+
+class FakeRoot:
+    """Collects ``after`` callbacks; the test drives the Tk loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, []
+        for callback in pending:
+            callback()
+
+
+def _wait_for_result(runner):
+    # Sonuç kuyruğa düşene kadar bekle (iş parçacığı hızlı biter)
+    for _ in range(200):
+        if not runner._results.empty():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("worker did not finish")
+
+
+def test_results_are_delivered_on_poll_not_on_worker_thread():
+    root = FakeRoot()
+    changes = []
+    runner = TaskRunner(root, on_change=lambda tasks: changes.append([t.name for t in tasks]))
+    delivered = []
+
+    runner.submit(
+        "models", lambda url: [url, threading.current_thread().name], "http://x", on_done=delivered.append
+    )
+    assert runner.is_running("models") and changes[-1] == ["models"]
+
+    _wait_for_result(runner)
+    assert delivered == []  # Tk döngüsü yoklayana kadar teslim edilmez
+    root.run_pending()
+
+    assert delivered[0][0] == "http://x" and delivered[0][1].startswith("mf-task-")
+    assert runner.active == [] and changes[-1] == []
+    assert root.scheduled == []  # iş kalmadıysa yoklama durur
+
+
+def test_errors_go_to_on_error():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    errors = []
+
+    def boom():
+        raise ConnectionError("down")
+
+    runner.submit("chat", boom, on_done=pytest.fail, on_error=errors.append)
+    _wait_for_result(runner)
+    root.run_pending()
+    assert isinstance(errors[0], ConnectionError)
+
+
+def test_cancelled_task_result_is_discarded():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    release = threading.Event()
+    delivered = []
+
+    task = runner.submit("analysis", release.wait, 5, on_done=delivered.append)
+    assert runner.cancel() == [task] and task.cancelled
+    assert runner.active == []
+
+    release.set()
+    _wait_for_result(runner)
+    root.run_pending()
+    assert delivered == []
+
+
+def test_polling_continues_while_tasks_run():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    release = threading.Event()
+    delivered = []
+
+    runner.submit("slow", lambda: release.wait(5) and "done", on_done=delivered.append)
+    root.run_pending()
+    assert len(root.scheduled) == 1 and delivered == []
+
+    release.set()
+    _wait_for_result(runner)
+    root.run_pending()
+    assert delivered == ["done"]
+
+
+def test_progress_is_coalesced_and_delivered_before_result():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    progress, delivered = [], []
+
+    def stream(report):
+        for text in ("Mer", "Merha", "Merhaba"):
+            report(text)
+        return "Merhaba!"
+
+    runner.submit("stream", stream, on_done=delivered.append, on_progress=progress.append)
+    _wait_for_result(runner)
+    root.run_pending()
+    assert progress == ["Merhaba"]  # yalnızca en son değer
+    assert delivered == ["Merhaba!"]
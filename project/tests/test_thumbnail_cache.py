@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from machining_formulas.gui import thumbnail_cache
+from machining_formulas.gui.thumbnail_cache import ThumbnailCache, default_cache_dir, target_size
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def png(tmp_path):
+    path = tmp_path / "turning.png"
+    Image.new("RGB", (600, 300), "steelblue").save(path)
+    return path
+
+
+def test_target_size_keeps_aspect_ratio():
+    assert target_size(600, 300, fit_height=120) == (240, 120)
+    assert target_size(600, 300, box=480) == (480, 240)
+    assert target_size(100, 200, box=480) == (240, 480)
+    with pytest.raises(ValueError):
+        target_size(10, 10)
+
+
+def test_default_cache_dir_env_override(monkeypatch, tmp_path):
+    monkeypatch.setenv("MACHINING_FORMULAS_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == tmp_path
+
+
+def test_thumbnails_are_rendered_once_and_reused_across_instances(png, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = ThumbnailCache(cache_dir)
+    header = first.thumbnail(png, height=120)
+    popup = first.thumbnail(png, box=480)
+    assert first.renders == 2
+    assert Image.open(header).size == (240, 120)
+    assert Image.open(popup).size == (480, 240)
+
+    second = ThumbnailCache(cache_dir)  # sonraki açılış
+    assert second.thumbnail(png, height=120) == header
+    assert second.renders == 0
+
+
+def test_changed_source_is_rerendered_and_stale_file_removed(png, tmp_path):
+    cache = ThumbnailCache(tmp_path / "cache")
+    old = cache.thumbnail(png, height=120)
+
+    Image.new("RGB", (300, 300), "red").save(png)
+    stat = png.stat()
+    os.utime(png, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    new = cache.thumbnail(png, height=120)
+
+    assert new != old and not old.exists()
+    assert Image.open(new).size == (120, 120)
+    assert cache.renders == 2
+
+
+def test_photo_images_are_cached_in_memory(png, tmp_path, monkeypatch):
+    loaded = []
+
+    class FakePhotoImage:
+        def __init__(self, file):
+            loaded.append(file)
+
+    monkeypatch.setattr(thumbnail_cache.tk, "PhotoImage", FakePhotoImage)
+    cache = ThumbnailCache(tmp_path / "cache")
+
+    first = cache.photo(png, box=480)
+    assert cache.photo(png, box=480) is first
+    assert cache.photo(png, height=120) is not first
+    assert len(loaded) == 2 and cache.renders == 2
@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+
+from machining_formulas.gui.startup_profile import StartupProfiler
+from machining_formulas.gui.v3_gui import V3Calculator
+
+
+class HeadlessTabs(V3Calculator):
+    """Only the lazy-tab bookkeeping; Tk widgets are mocks."""
+
+    def __init__(self):
+        self._profiler = StartupProfiler()
+        self.built = []
+        self.calc_notebook = MagicMock()
+        self.calc_notebook.nametowidget.side_effect = lambda name: f"frame:{name}"
+        self._pending_tab_builders = {
+            ".nb.turning": self._create_turning_tab,
+            ".nb.material": self._create_material_tab,
+        }
+
+    def _create_turning_tab(self, frame):
+        self.built.append(frame)
+
+    def _create_material_tab(self, frame):
+        self.built.append(frame)
+        self.mass_shape = "shape"
+        self.mass_density = "density"
+        self.mass_param_widgets = {"radius": "radius"}
+
+
+def test_tabs_are_built_once_on_first_selection():
+    gui = HeadlessTabs()
+
+    gui.calc_notebook.select.return_value = ".nb.turning"
+    gui._on_calc_tab_changed()
+    gui._on_calc_tab_changed()
+    assert gui.built == ["frame:.nb.turning"]
+    assert [p.name for p in gui._profiler.phases] == ["_create_turning_tab"]
+
+    assert gui._ensure_calc_tab_built(".nb.material") is True
+    assert gui._ensure_calc_tab_built(".nb.material") is False
+    assert gui.built == ["frame:.nb.turning", "frame:.nb.material"]
+
+
+def test_focusable_widgets_skip_unbuilt_tabs():
+    gui = HeadlessTabs()
+    gui.model_url_entry = "url"
+
+    assert gui._get_focusable_widgets() == ["url"]
+
+    gui._ensure_calc_tab_built(".nb.material")
+    assert gui._get_focusable_widgets() == ["shape", "density", "radius", "url"]